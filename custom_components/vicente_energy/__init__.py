@@ -1,16 +1,19 @@
 
 """Home Assistant entrypoint for the Vicente Energy integration."""
 
+import importlib
 import logging
 from datetime import timedelta
+from functools import partial
+from types import ModuleType
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .services import ServiceType
+from .services import ServiceType, async_import_service_classes
 from .const import (
+    BUDGET_FIELDS,
     CONF_LOCATION_NAME,
     CONF_SESSION_LEARNING_ALPHA,
     CONF_SOLAR_FORECAST_ENTITIES,
@@ -19,17 +22,64 @@ from .const import (
     CONF_HOUSE_LOAD_ENTITY,
     CONF_EVCHARGER_POWER_ENTITY,
     CONF_EVCHARGER_STATE_ENTITY,
-    DOMAIN
+    CONF_BIAS_BY_MONTH,
+    CONF_DEPARTURE_HOUR,
+    CONF_DEPARTURE_TARGET_KWH,
+    CONF_FRANKLIN_EMAIL,
+    CONF_FRANKLIN_GATEWAY_ID,
+    CONF_FRANKLIN_PASSWORD,
+    CONF_FRANKLIN_POLL_SECONDS,
+    CONF_FRANKLIN_URL,
+    CONF_HISTORY_CAPACITY,
+    CONF_POWERWALL_HOST,
+    CONF_POWERWALL_PASSWORD,
+    CONF_POWERWALL_POLL_SECONDS,
+    CONF_SOLAREDGE_HOST,
+    CONF_SOLAREDGE_POLL_SECONDS,
+    CONF_SOLAREDGE_PORT,
+    CONF_SOLAREDGE_UNIT_ID,
+    CONF_SAVE_DELAY_SECONDS,
+    CONF_STATE_DELTA_LOG,
+    CONF_TARIFF_PRICES,
+    DEFAULT_DEPARTURE_HOUR,
+    DEFAULT_FRANKLIN_POLL_SECONDS,
+    DEFAULT_FRANKLIN_URL,
+    DEFAULT_HISTORY_CAPACITY,
+    DEFAULT_POWERWALL_POLL_SECONDS,
+    DEFAULT_SOLAREDGE_POLL_SECONDS,
+    DEFAULT_SOLAREDGE_PORT,
+    DEFAULT_SOLAREDGE_UNIT_ID,
+    DEFAULT_SAVE_DELAY_SECONDS,
+    DEFAULT_TARIFF_PRICE,
+    DOMAIN,
+    GATEWAY_CLIENT_KEYS,
 )
 from .state_manager import StateManager
+from .services.dispatcher import async_get_dispatcher
+from .services.numeric import async_get_parser
 from .services.service_manager import ServiceManager
 from .solar_adapter import SolarForecastAdapter
 from .charge_estimator import ChargeEstimator
+from .charge_planner import PLAN_HORIZON_HOURS
+from .forecast_accuracy_tracker import ForecastAccuracyTracker
 from .input_collector import InputCollector
+from .hourly_energy import HourlyEnergyMeter
+from .load_forecaster import LoadForecaster
+from .models import Forecasts
+from .power_controller import PowerController
+from .scheduler import Scheduler, TickSnapshot
 from .session_manager import SessionManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Client module of each direct device, by the option that configures it.
+# They are imported only for configured devices; the HTTP clients pull in aiohttp.
+GATEWAY_CLIENT_MODULES = {
+    CONF_POWERWALL_HOST: ".services.powerwall_client",
+    CONF_SOLAREDGE_HOST: ".services.sunspec_modbus",
+    CONF_FRANKLIN_GATEWAY_ID: ".services.franklin_client",
+}
+
 
 async def dummy_service(call):
     """Placeholder service handler."""
@@ -48,20 +98,27 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Vicente Energy from a config entry."""
-    state = StateManager(hass, entry.entry_id)
+    state = StateManager(
+        hass,
+        entry.entry_id,
+        entry.options.get(CONF_HISTORY_CAPACITY, entry.data.get(CONF_HISTORY_CAPACITY, DEFAULT_HISTORY_CAPACITY)),
+        save_delay=entry.options.get(CONF_SAVE_DELAY_SECONDS, entry.data.get(CONF_SAVE_DELAY_SECONDS, DEFAULT_SAVE_DELAY_SECONDS)),
+        delta_log=entry.options.get(CONF_STATE_DELTA_LOG, entry.data.get(CONF_STATE_DELTA_LOG, False)),
+        bias_by_month=entry.options.get(CONF_BIAS_BY_MONTH, entry.data.get(CONF_BIAS_BY_MONTH, False)),
+    )
     await state.async_load()
     state.data[CONF_SESSION_LEARNING_ALPHA] = entry.options.get(CONF_SESSION_LEARNING_ALPHA, entry.data.get(CONF_SESSION_LEARNING_ALPHA, 0.1))
 
-    service_ids: dict[ServiceType, str] = {}
-    service_ids.append(ServiceType.EV_CHARGER_SERVICE, entry.options.get(ServiceType.EV_CHARGER_SERVICE, entry.data.get(ServiceType.EV_CHARGER_SERVICE, "default")))
-    service_ids.append(ServiceType.BATTERY_SERVICE, entry.options.get(ServiceType.BATTERY_SERVICE, entry.data.get(ServiceType.BATTERY_SERVICE, "default")))
-    service_ids.append(ServiceType.SOLAR_SERVICE, entry.options.get(ServiceType.SOLAR_SERVICE, entry.data.get(ServiceType.SOLAR_SERVICE, "default")))
-    service_ids.append(ServiceType.FORECAST_SERVICE, entry.options.get(ServiceType.FORECAST_SERVICE, entry.data.get(ServiceType.FORECAST_SERVICE, "default")))
-    service_ids.append(ServiceType.GRID_SERVICE, entry.options.get(ServiceType.GRID_SERVICE, entry.data.get(ServiceType.GRID_SERVICE, "default")))
-    location_name = entry.options.get(CONF_LOCATION_NAME, entry.data.get(CONF_LOCATION_NAME, ""))
+    service_ids = _service_ids(entry)
 
+    await _async_setup_gateway_clients(hass, entry)
+    # Only the selected vendors' modules are loaded, and not on the event loop
+    await async_import_service_classes(hass, service_ids)
     service_manager = ServiceManager(hass, service_ids)
-    hass.loop.create_task(service_manager.connect_services())
+    # Connects concurrently and keeps retrying services that are not up yet
+    service_manager.async_start()
+    # Registered first so the retry tasks stop even if setup fails below
+    entry.async_on_unload(service_manager.async_stop)
 
     merged_conf = dict(entry.data)
     _LOGGER.debug("Merged config: %s", merged_conf)
@@ -69,86 +126,243 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     solar_adapter = SolarForecastAdapter(hass, merged_conf.get(CONF_SOLAR_FORECAST_ENTITIES, []), state, service_manager)
     estimator = ChargeEstimator(merged_conf, state)
+    load_forecaster = LoadForecaster(hass, merged_conf, state)
+    await load_forecaster.async_load_history()
+    accuracy_tracker = ForecastAccuracyTracker(state, state.data[CONF_SESSION_LEARNING_ALPHA])
 
     collector = InputCollector(
         hass,
-        merged_conf.get(CONF_SOLAR_POWER_ENTITY, ""),
-        merged_conf.get(CONF_SOLAR_FORECAST_ENTITIES, []),
-        merged_conf.get(CONF_BATTERY_SOC_ENTITY, ""),
-        merged_conf.get(CONF_HOUSE_LOAD_ENTITY, ""),
-        merged_conf.get(CONF_EVCHARGER_POWER_ENTITY, ""),
+        solar_power_entity=merged_conf.get(CONF_SOLAR_POWER_ENTITY, ""),
+        solar_forecast_entities=merged_conf.get(CONF_SOLAR_FORECAST_ENTITIES, []),
+        battery_soc_entity=merged_conf.get(CONF_BATTERY_SOC_ENTITY, ""),
+        house_load_entity=merged_conf.get(CONF_HOUSE_LOAD_ENTITY, ""),
+        wallbox_power_entity=merged_conf.get(CONF_EVCHARGER_POWER_ENTITY, ""),
         wallbox_state_entity=merged_conf.get(CONF_EVCHARGER_STATE_ENTITY, ""),
         service_manager=service_manager
     )
+    collector.async_start()
+    entry.async_on_unload(collector.async_stop)
+    energy_meter = HourlyEnergyMeter(collector)
+    energy_meter.async_start()
+    entry.async_on_unload(energy_meter.async_stop)
     hass.services.async_register(DOMAIN, "set_power_level", dummy_service)
     hass.services.async_register(DOMAIN, "reset_history", dummy_service)
 
-    async def hourly_update_method():
-        raw = await solar_adapter.get_corrected_forecast()
-        signals = collector.get_signals()
-        return estimator.estimate(raw, signals)
-
-    async def minute_update_method():
-        signals = await collector.get_signals()
-        return estimator.get_power_level(signals)
-
-    hourly_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_hourly",
-        update_interval=timedelta(hours=1),
-        update_method=hourly_update_method,
-    )
-
-    minute_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_minute",
-        update_interval=timedelta(minutes=1),
-        update_method=minute_update_method,
-    )
+    scheduler = Scheduler(hass, DOMAIN, collector.get_signals)
+
+    async def refresh_forecasts(snapshot: TickSnapshot) -> Forecasts:
+        now = snapshot.now
+        raw_solar = await solar_adapter.get_forecast_array()
+
+        # Score the forecasts made an hour ago against the energy measured
+        # since, then hold this hour's forecasts for the next run
+        measured = energy_meter.take_hour(now)
+        accuracy_tracker.score_hour(measured)
+        expected = {"load": load_forecaster.get_raw_forecast(now)[0]}
+        if now.hour < len(raw_solar):
+            expected["solar"] = float(raw_solar[now.hour])
+        accuracy_tracker.expect_hour(expected, now.hour, now.month)
+        if measured is not None:
+            # Energy over the hour is its mean load, filed under that hour
+            load_forecaster.update_history(measured["load"], now - timedelta(hours=1))
+
+        # Forecast arrays start at midnight today and may span several days.
+        # The budget nets the next 24 h of solar against the 24 h load
+        # forecast; only the planner looks further ahead.
+        day = slice(now.hour, now.hour + 24)
+        horizon = slice(now.hour, now.hour + PLAN_HORIZON_HOURS)
+        solar = solar_adapter.apply_correction(raw_solar, now.month)
+        quantiles = await solar_adapter.get_quantile_array()
+        p10 = p90 = None
+        if quantiles.size:
+            p10 = solar_adapter.apply_correction(quantiles[0], now.month)[day]
+            p90 = solar_adapter.apply_correction(quantiles[2], now.month)[day]
+        return Forecasts(
+            solar_24h_kwh=solar[day],
+            load_24h_kwh=load_forecaster.get_corrected_forecast(),
+            solar_p10_kwh=p10,
+            solar_p90_kwh=p90,
+            solar_horizon_kwh=solar[horizon],
+        )
 
-    internal_sensors = {
-        CONF_SOLAR_POWER_ENTITY: "sensor.calculated_solar_power",
-        CONF_BATTERY_SOC_ENTITY: "sensor.calculated_battery_soc",
-        CONF_HOUSE_LOAD_ENTITY: "sensor.calculated_house_load",
-        CONF_EVCHARGER_POWER_ENTITY: "sensor.calculated_charger_power",
-        CONF_EVCHARGER_STATE_ENTITY: "sensor.calculated_wallbox_state",
-    }
-    coordinator = VicenteEnergyCoordinator(
+    async def compute_budget(snapshot: TickSnapshot) -> dict:
+        forecasts, signals = snapshot.forecasts, snapshot.signals
+        budget = estimator.estimate(forecasts, signals)
+        plan = estimator.compute_plan(forecasts, signals)
+        data = {
+            "budget_24h_kwh": budget,
+            "charge_schedule_kw": plan.charge_kw,
+            **accuracy_tracker.accuracy(),
+            **solar_adapter.cache.stats,
+            "dispatcher_events": async_get_dispatcher(hass).diagnostics,
+            "state_parsing": async_get_parser(hass).diagnostics,
+            "service_lifecycle": service_manager.diagnostics,
+            "scheduler": scheduler.diagnostics,
+        }
+        for key in GATEWAY_CLIENT_KEYS:
+            if (client := hass.data.get(key)) is not None:
+                data.update(client.diagnostics)
+        if estimator.distribution is not None:
+            distribution = estimator.distribution
+            data.update({
+                "budget_p10_kwh": distribution.p10_kwh,
+                "budget_p50_kwh": distribution.p50_kwh,
+                "budget_p90_kwh": distribution.p90_kwh,
+                "budget_confidence": distribution.confidence,
+                "budget_sample_ms": distribution.sample_ms,
+            })
+
+        target_kwh = merged_conf.get(CONF_DEPARTURE_TARGET_KWH, 0.0)
+        if target_kwh:
+            hour = snapshot.now.hour
+            # The LP solve takes tens of milliseconds; keep it off the event loop
+            schedule = await hass.async_add_executor_job(partial(
+                estimator.compute_optimal_schedule,
+                forecasts,
+                signals,
+                _hourly_tariff(merged_conf, hour),
+                departure_hours=(merged_conf.get(CONF_DEPARTURE_HOUR, DEFAULT_DEPARTURE_HOUR)
+                                 - hour) % 24 or 24,
+                target_kwh=target_kwh,
+                capacity_kwh=await _async_battery_capacity(service_manager),
+            ))
+            data["optimized_schedule_kw"] = schedule.charge_kw
+            data["optimized_cost"] = schedule.cost
+            data["optimizer_solve_ms"] = schedule.solve_ms
+            data["optimizer_gap"] = schedule.optimality_gap
+
+        # A new budget changes the power level even if no input moved
+        collector.mark_dirty()
+        return data
+
+    async def control_power(snapshot: TickSnapshot) -> dict:
+        # Periodic safety net; the controller reacts to input changes itself.
+        # Skip the computation entirely when no input moved since last tick.
+        if not collector.has_changes and power_coordinator.data is not None:
+            return power_coordinator.data
+        return await controller.async_run(publish=False, signals=snapshot.signals)
+
+    async def persist_state(snapshot: TickSnapshot) -> dict:
+        # Bounds what a crash can lose to one interval, whatever the save delay
+        await state.async_persist()
+        return state.persistence_stats
+
+    # Forecasts are refreshed first so the budget on the same tick uses them.
+    # Coordinator names keep the sensors' unique IDs from the former
+    # hourly and minute coordinators. Diagnostics ride along in the payloads,
+    # but only the budget and power level notify the sensors.
+    scheduler.add_job("forecast_refresh", timedelta(hours=1), refresh_forecasts,
+                      provides="forecasts")
+    scheduler.add_job("budget", timedelta(hours=1), compute_budget,
+                      coordinator_name=f"{DOMAIN}_hourly", compare_keys=BUDGET_FIELDS)
+    power_coordinator = scheduler.add_job("power_control", timedelta(minutes=1), control_power,
+                                          coordinator_name=f"{DOMAIN}_minute",
+                                          compare_keys=("power_level_kw",))
+    scheduler.add_job("persistence", timedelta(minutes=15), persist_state)
+    entry.async_on_unload(scheduler.async_stop)
+
+    controller = PowerController(
         hass,
-        internal_sensors,
-        location_name,
-        solar_forecast,
-        ev_charger
+        collector,
+        estimator,
+        service_manager,
+        merged_conf,
+        on_update=lambda data: scheduler.async_publish("power_control", data),
     )
-    await coordinator.async_config_entry_first_refresh()
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    controller.async_start()
+    entry.async_on_unload(controller.async_stop)
 
-    session = SessionManager(hass, state)
+    session = SessionManager(hass, state, entry.entry_id, service_manager)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "state_manager": state,
         "service_manager": service_manager,
-        "hourly_coordinator": hourly_coordinator,
-        "minute_coordinator": minute_coordinator,
+        "scheduler": scheduler,
         "collector": collector,
+        "controller": controller,
         "solar_adapter": solar_adapter,
         "estimator": estimator,
+        "load_forecaster": load_forecaster,
         "session": session,
     }
 
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    await hourly_coordinator.async_config_entry_first_refresh()
-    await minute_coordinator.async_config_entry_first_refresh()
+    # Give the services a bounded chance to connect before the first
+    # computation; any still retrying report their defaults until they do
+    if not await service_manager.async_wait_ready():
+        _LOGGER.warning("Starting before all services connected: %s", service_manager.diagnostics)
+    await scheduler.async_first_run()
     await hass.config_entries.async_forward_entry_setup(entry, "sensor")
     await async_register_services(hass, DOMAIN, session, state)
     return True
 
 
+def _import_gateway_modules(conf: dict) -> dict[str, ModuleType]:
+    """Import the client module of every configured device."""
+    return {
+        key: importlib.import_module(module, __name__)
+        for key, module in GATEWAY_CLIENT_MODULES.items() if conf.get(key)
+    }
+
+
+async def _async_setup_gateway_clients(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Create or reconfigure the direct device clients the services share."""
+    conf = {**entry.data, **entry.options}
+    modules = await hass.async_add_import_executor_job(_import_gateway_modules, conf)
+    if powerwall_client := modules.get(CONF_POWERWALL_HOST):
+        powerwall_client.async_setup_powerwall_client(
+            hass,
+            conf[CONF_POWERWALL_HOST],
+            conf.get(CONF_POWERWALL_PASSWORD, ""),
+            conf.get(CONF_POWERWALL_POLL_SECONDS, DEFAULT_POWERWALL_POLL_SECONDS),
+        )
+    if sunspec_modbus := modules.get(CONF_SOLAREDGE_HOST):
+        sunspec_modbus.async_setup_sunspec_client(
+            hass,
+            conf[CONF_SOLAREDGE_HOST],
+            conf.get(CONF_SOLAREDGE_PORT, DEFAULT_SOLAREDGE_PORT),
+            conf.get(CONF_SOLAREDGE_UNIT_ID, DEFAULT_SOLAREDGE_UNIT_ID),
+            conf.get(CONF_SOLAREDGE_POLL_SECONDS, DEFAULT_SOLAREDGE_POLL_SECONDS),
+        )
+    if franklin_client := modules.get(CONF_FRANKLIN_GATEWAY_ID):
+        franklin_client.async_setup_franklin_client(
+            hass,
+            franklin_client.FranklinApiTransport(
+                hass,
+                conf.get(CONF_FRANKLIN_EMAIL, ""),
+                conf.get(CONF_FRANKLIN_PASSWORD, ""),
+                conf[CONF_FRANKLIN_GATEWAY_ID],
+                conf.get(CONF_FRANKLIN_URL, DEFAULT_FRANKLIN_URL),
+            ),
+            conf.get(CONF_FRANKLIN_POLL_SECONDS, DEFAULT_FRANKLIN_POLL_SECONDS),
+        )
+
+
+def _service_ids(entry: ConfigEntry) -> dict[ServiceType, str]:
+    """Return the configured service name for every service type."""
+    return {
+        service_type: entry.options.get(service_type, entry.data.get(service_type, "default"))
+        for service_type in ServiceType
+    }
+
+
+def _hourly_tariff(conf: dict, start_hour: int) -> list[float]:
+    """Return 24 hourly import prices starting at start_hour."""
+    prices = list(conf.get(CONF_TARIFF_PRICES) or [DEFAULT_TARIFF_PRICE] * 24)
+    prices = (prices * 24)[:24]
+    return prices[start_hour:] + prices[:start_hour]
+
+
+async def _async_battery_capacity(service_manager: ServiceManager) -> float | None:
+    """Return the battery capacity reported by the battery service, if any."""
+    try:
+        battery = service_manager.get_service(ServiceType.BATTERY_SERVICE)
+    except ValueError:
+        return None
+    return await battery.get_storage_capacity_kwh()
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
     """Handle option updates for Vicente Energy entry."""
     _LOGGER.info("Reconfiguring Vicente Energy due to updated options...")
@@ -157,10 +371,17 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
         return
 
     sm: ServiceManager = data["service_manager"]
-    sm.update_services(
-        entry.options.get(ServiceType.FORECAST_SERVICE, entry.data.get(ServiceType.FORECAST_SERVICE, "none")),
-        entry.options.get(ServiceType.EV_CHARGER_SERVICE, entry.data.get(ServiceType.EV_CHARGER_SERVICE, "none"))
-    )
+    await _async_setup_gateway_clients(hass, entry)
+    # Only services whose selection changed are torn down; the controller
+    # keeps running against the others
+    service_ids = _service_ids(entry)
+    await async_import_service_classes(hass, service_ids)
+    try:
+        replaced = await sm.async_update_services(service_ids)
+    except ValueError as err:
+        _LOGGER.error("Keeping current services: %s", err)
+    else:
+        _LOGGER.debug("Services replaced by the options update: %s", replaced)
 
     collector: InputCollector = data.get("collector")
     if collector:
@@ -172,48 +393,14 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
         location_entity.set_location_name(new_name)
         location_entity.async_write_ha_state()
 
-    await data["hourly_coordinator"].async_request_refresh()
-    await data["minute_coordinator"].async_request_refresh()
+    await data["scheduler"].async_run_jobs()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a Vicente Energy config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
     if unload_ok and DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # Write any coalesced state that is still waiting for its save window
+        await entry_data["state_manager"].async_flush()
     return unload_ok
-
-class VicenteEnergyCoordinator(DataUpdateCoordinator):
-    """Coordinator to publish calculated Vicente Energy values."""
-
-    def __init__(self, hass, sensors, location_name, solar_forecast, ev_charger):
-        """Initialize the coordinator with entity IDs and configuration."""
-        self.hass = hass
-        self.sensors = sensors
-        self.location_name = location_name
-        self.solar_forecast = solar_forecast
-        self.ev_charger = ev_charger
-
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="vicente_energy_hourly",
-            update_interval=timedelta(hours=1),
-        )
-
-    async def _async_update_data(self):
-        """Refresh calculated sensor values."""
-        calculated_values = {
-            "solar_power": 0,
-            "battery_soc": 0,
-            "house_load": 0,
-            "wallbox_power": 0,
-            "wallbox_state": "unplugged",
-            "inverter_on": False
-        }
-
-        for key, value in calculated_values.items():
-            entity_id = self.sensors[f"{key}_entity"]
-            self.hass.states.async_set(entity_id, value)
-
-        return calculated_values
@@ -0,0 +1,126 @@
+"""Learned forecast correction by hour of day and forecast magnitude."""
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+
+from .ring_buffer import decode_array, encode_array
+
+FORMAT_VERSION = 1
+HOURS = 24
+
+# Upper edges (kWh per hour) of the magnitude buckets; the last bucket is open
+SOLAR_BUCKET_EDGES = (0.25, 1.0, 2.5, 5.0)
+LOAD_BUCKET_EDGES = (0.5, 1.0, 2.0, 4.0)
+
+# Forecasts smaller than this carry too little signal to learn a ratio from
+MIN_LEARN_KWH = 0.05
+MAX_FACTOR = 3.0
+
+
+class BiasMatrix:
+    """Multiplicative correction factors over hour x magnitude bucket (x month).
+
+    Each actual-vs-forecast pair nudges one cell towards the observed ratio
+    with an exponential moving average, and per-hour absolute and percentage
+    errors are accumulated for accuracy reporting. Correction is a single
+    fancy-indexed multiply over the whole forecast array.
+    """
+
+    def __init__(self, bucket_edges: Sequence[float], by_month: bool = False) -> None:
+        """Start with neutral factors for the given bucket edges."""
+        self._edges = np.asarray(bucket_edges, dtype=np.float64)
+        self._by_month = by_month
+        shape = (12 if by_month else 1, HOURS, self._edges.size + 1)
+        self._factors = np.ones(shape, dtype=np.float32)
+        self._samples = np.zeros(HOURS, dtype=np.uint32)
+        self._abs_error = np.zeros(HOURS, dtype=np.float64)
+        self._pct_samples = np.zeros(HOURS, dtype=np.uint32)
+        self._abs_pct_error = np.zeros(HOURS, dtype=np.float64)
+
+    @property
+    def factors(self) -> np.ndarray:
+        """Return the correction factors indexed [month, hour, bucket]."""
+        return self._factors
+
+    def _month_index(self, month: Optional[int]) -> int:
+        return (month - 1) % 12 if self._by_month and month else 0
+
+    def update(self, hour: int, forecast_kwh: float, actual_kwh: float, alpha: float,
+               month: Optional[int] = None) -> None:
+        """Learn from one forecast/actual pair for the given hour of day."""
+        hour %= HOURS
+        error = abs(actual_kwh - forecast_kwh)
+        self._samples[hour] += 1
+        self._abs_error[hour] += error
+        if actual_kwh > 0:
+            self._pct_samples[hour] += 1
+            self._abs_pct_error[hour] += error / actual_kwh
+
+        if forecast_kwh < MIN_LEARN_KWH:
+            return
+        bucket = int(np.searchsorted(self._edges, forecast_kwh, side="right"))
+        cell = (self._month_index(month), hour, bucket)
+        ratio = min(max(actual_kwh / forecast_kwh, 0.0), MAX_FACTOR)
+        self._factors[cell] += alpha * (ratio - self._factors[cell])
+
+    def apply(self, forecast: Sequence[float], hours: Optional[Sequence[int]] = None,
+              month: Optional[int] = None) -> np.ndarray:
+        """Return the forecast with each value scaled by its cell's factor.
+
+        hours defaults to 0, 1, 2, ... (a forecast starting at midnight).
+        """
+        values = np.asarray(forecast, dtype=np.float64)
+        if hours is None:
+            hours = np.arange(values.size)
+        buckets = np.searchsorted(self._edges, values, side="right")
+        table = self._factors[self._month_index(month)]
+        return values * table[np.asarray(hours) % HOURS, buckets]
+
+    @property
+    def accuracy(self) -> dict[str, list[Optional[float]]]:
+        """Return mean absolute error (kWh) and MAPE (%) for each hour of day."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mae = self._abs_error / self._samples
+            mape = self._abs_pct_error / self._pct_samples * 100.0
+        return {
+            "mae_by_hour": [None if np.isnan(v) else round(float(v), 3) for v in mae],
+            "mape_by_hour": [None if np.isnan(v) else round(float(v), 1) for v in mape],
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-friendly dict of base64 arrays."""
+        return {
+            "format": FORMAT_VERSION,
+            "edges": self._edges.tolist(),
+            "by_month": self._by_month,
+            "factors": encode_array(self._factors.astype("<f4")),
+            "samples": encode_array(self._samples.astype("<u4")),
+            "abs_error": encode_array(self._abs_error.astype("<f8")),
+            "pct_samples": encode_array(self._pct_samples.astype("<u4")),
+            "abs_pct_error": encode_array(self._abs_pct_error.astype("<f8")),
+        }
+
+    @classmethod
+    def from_stored(cls, stored: Any, bucket_edges: Sequence[float],
+                    by_month: bool = False) -> "BiasMatrix":
+        """Restore a matrix from to_dict() output.
+
+        Factors are discarded when the stored layout no longer matches the
+        requested edges or month setting; accuracy statistics are kept.
+        """
+        if isinstance(stored, BiasMatrix):
+            return stored
+        matrix = cls(bucket_edges, by_month)
+        if not isinstance(stored, dict) or stored.get("format") != FORMAT_VERSION:
+            return matrix
+        matrix._samples = decode_array(stored["samples"], "<u4")
+        matrix._abs_error = decode_array(stored["abs_error"], "<f8")
+        matrix._pct_samples = decode_array(stored["pct_samples"], "<u4")
+        matrix._abs_pct_error = decode_array(stored["abs_pct_error"], "<f8")
+        if (list(stored.get("edges", [])) == matrix._edges.tolist()
+                and bool(stored.get("by_month")) == by_month):
+            matrix._factors = decode_array(stored["factors"], "<f4").reshape(
+                matrix._factors.shape)
+        return matrix
@@ -1,7 +1,23 @@
 """Charging power and budget estimation utilities."""
 
-from .const import CONF_SESSION_LEARNING_ALPHA
-from .models import Forecasts, Signals
+from collections.abc import Sequence
+
+from .budget_sampler import BudgetSampler
+from .charge_optimizer import DEFAULT_SLOTS, SLOT_HOURS, ChargeOptimizer, hourly_to_slots
+from .charge_planner import plan_charging
+from .const import (
+    CONF_BATTERY_MAX_POWER_KW,
+    CONF_BUDGET_CONFIDENCE,
+    CONF_SESSION_LEARNING_ALPHA,
+    DEFAULT_BATTERY_MAX_POWER_KW,
+    DEFAULT_BUDGET_CONFIDENCE,
+)
+from .models import BudgetDistribution, ChargePlan, Forecasts, OptimizedSchedule, Signals
+
+
+def _horizon_solar(fc: Forecasts) -> Sequence[float]:
+    """Return the solar forecast over the planner horizon, else the next 24 h."""
+    return fc.solar_horizon_kwh if fc.solar_horizon_kwh is not None else fc.solar_24h_kwh
 
 
 class ChargeEstimator:
@@ -11,10 +27,111 @@ class ChargeEstimator:
         """Store configuration parameters and the state manager."""
         self._params = params
         self._state_manager = state_manager
+        self._budget_remaining: float = 0.0
+        self._plan: ChargePlan | None = None
+        self._optimizer = ChargeOptimizer()
+        self._schedule: OptimizedSchedule | None = None
+        self._sampler = BudgetSampler()
+        self._distribution: BudgetDistribution | None = None
 
     def estimate(self, fc, sig):
-        """Bridge method for hourly_update_method in __init__.py."""
-        return self.compute_24h_budget(fc, sig)
+        """Bridge method for hourly_update_method in __init__.py.
+
+        When the forecast carries P10/P90 solar series, the budget is the
+        risk-adjusted one from compute_budget_distribution.
+        """
+        if fc.solar_p10_kwh is not None or fc.solar_p90_kwh is not None:
+            self._budget_remaining = self.compute_budget_distribution(fc, sig).risk_adjusted_kwh
+        else:
+            self._distribution = None
+            self._budget_remaining = self.compute_24h_budget(fc, sig)
+        return self._budget_remaining
+
+    @property
+    def distribution(self) -> BudgetDistribution | None:
+        """Return the most recent budget distribution, if quantiles were available."""
+        return self._distribution
+
+    def compute_budget_distribution(self, fc: Forecasts, sig: Signals,
+                                    confidence: float | None = None) -> BudgetDistribution:
+        """Compute P10/P50/P90 budgets and a risk-adjusted budget.
+
+        The risk-adjusted budget is the amount available in `confidence` of
+        the sampled solar scenarios (default from CONF_BUDGET_CONFIDENCE).
+        """
+        if confidence is None:
+            confidence = self._params.get(CONF_BUDGET_CONFIDENCE, DEFAULT_BUDGET_CONFIDENCE)
+        self._distribution = self._sampler.budget_distribution(
+            fc.solar_24h_kwh,
+            fc.load_24h_kwh,
+            battery_kwh=self._battery_budget(sig),
+            confidence=confidence,
+            p10=fc.solar_p10_kwh,
+            p90=fc.solar_p90_kwh,
+        )
+        return self._distribution
+
+    def get_power_level(self, sig: Signals) -> float:
+        """Bridge method for minute_update_method in __init__.py."""
+        return self.compute_power_level(sig, self._budget_remaining)
+
+    @property
+    def plan(self) -> ChargePlan | None:
+        """Return the most recent charge plan, if any."""
+        return self._plan
+
+    def compute_plan(self, fc: Forecasts, sig: Signals) -> ChargePlan:
+        """Plan hourly charging over the forecast horizon starting this hour."""
+        self._plan = plan_charging(
+            _horizon_solar(fc),
+            fc.load_24h_kwh,
+            soc_pct=sig.battery_soc_pct,
+            capacity_kwh=self._params.get('battery_capacity_kwh', 0.0),
+            reserve_pct=self._params.get('reserve_soc_pct', 0.0),
+            efficiency=self._params.get('storage_efficiency', 1.0),
+            max_charger_kw=self._params.get('max_charger_power_kw', 0.0),
+            budget_kwh=self._budget_remaining,
+        )
+        return self._plan
+
+    @property
+    def schedule(self) -> OptimizedSchedule | None:
+        """Return the most recent cost-optimal schedule, if any."""
+        return self._schedule
+
+    def compute_optimal_schedule(self, fc: Forecasts, sig: Signals,
+                                 hourly_prices: Sequence[float], *,
+                                 departure_hours: float, target_kwh: float,
+                                 capacity_kwh: float | None = None) -> OptimizedSchedule:
+        """Plan quarter-hour charge power minimizing grid import cost.
+
+        Forecasts and prices are hourly arrays starting this hour; the
+        target must be charged within departure_hours. capacity_kwh overrides
+        the configured capacity, e.g. with the BatteryService value.
+        """
+        if capacity_kwh is None or capacity_kwh <= 0:
+            capacity_kwh = self._params.get('battery_capacity_kwh', 0.0)
+        self._schedule = self._optimizer.solve(
+            hourly_to_slots(_horizon_solar(fc), DEFAULT_SLOTS),
+            hourly_to_slots(fc.load_24h_kwh, DEFAULT_SLOTS),
+            hourly_to_slots(hourly_prices, DEFAULT_SLOTS, spread=False),
+            soc_pct=sig.battery_soc_pct,
+            capacity_kwh=capacity_kwh,
+            reserve_pct=self._params.get('reserve_soc_pct', 0.0),
+            efficiency=self._params.get('storage_efficiency', 1.0),
+            max_charger_kw=self._params.get('max_charger_power_kw', 0.0),
+            battery_max_kw=self._params.get(CONF_BATTERY_MAX_POWER_KW,
+                                            DEFAULT_BATTERY_MAX_POWER_KW),
+            target_kwh=target_kwh,
+            departure_slot=int(departure_hours / SLOT_HOURS),
+        )
+        return self._schedule
+
+    def get_planned_power(self, hour: int) -> float:
+        """Return planned charge power (kW) for `hour` hours from the plan start."""
+        if self._plan is None or not 0 <= hour < len(self._plan.charge_kw):
+            return 0.0
+        return self._plan.charge_kw[hour]
 
     def compute_24h_budget(self, fc: Forecasts, sig: Signals) -> float:
         """Compute 24 h charging budget (kWh)."""
@@ -22,7 +139,10 @@ class ChargeEstimator:
         total_load = sum(fc.load_24h_kwh)
         solar_net = total_solar - total_load
         solar_budget = max(solar_net, 0.0)
+        return solar_budget + self._battery_budget(sig)
 
+    def _battery_budget(self, sig: Signals) -> float:
+        """Return usable battery energy above the reserve (kWh)."""
         soc_frac = sig.battery_soc_pct / 100.0
         reserve_frac = self._params.get('reserve_soc_pct', 0.0) / 100.0
         cap = self._params.get('battery_capacity_kwh', 0.0)
@@ -34,7 +154,7 @@ class ChargeEstimator:
         else:
             batt_budget = max(soc_frac - reserve_frac, 0.0) * cap * eff
 
-        return solar_budget + batt_budget
+        return batt_budget
 
     def compute_power_level(self, sig: Signals, budget_remaining: float) -> float:
         """Compute desired charge power (kW) based on solar or battery."""
@@ -67,14 +187,8 @@ class ChargeEstimator:
         error = actual_kwh - estimated_kwh
         # Learning rate (alpha) for session bias
         alpha = self._params.get(CONF_SESSION_LEARNING_ALPHA, 0.1)
-        # Update session bias in state manager
+        # Update session bias in state manager (which schedules its own save)
         await self._state_manager.update_session_bias(alpha, actual_kwh)
-        # Persist the updated bias asynchronously
-        try:
-            self._state_manager.hass.async_create_task(self._state_manager.async_save())
-        except AttributeError:
-            import asyncio
-            asyncio.create_task(self._state_manager.async_save())
 
     def _estimate_session_kwh(self):
         """Estimate expected kWh for the next session based on history."""
@@ -0,0 +1,290 @@
+"""Cost-optimal EV charge scheduling as a small dense linear program."""
+
+from collections.abc import Sequence
+import time
+
+import numpy as np
+
+from .models import OptimizedSchedule
+
+SLOT_HOURS = 0.25
+DEFAULT_SLOTS = 96
+
+# Objective weights relative to the tariff
+SURPLUS_VALUE_FRACTION = 0.05  # reward per kWh charged, as a fraction of the mean price
+CYCLE_PENALTY_FRACTION = 0.001  # discourages simultaneous battery charge/discharge
+
+# Interior point settings
+TOLERANCE = 1e-7
+MAX_ITERATIONS = 50
+STEP_FRACTION = 0.99  # stay this fraction of the way to the nearest bound
+REGULARIZATION = 1e-10
+MIN_BOUND_WIDTH = 1e-9
+DEFAULT_TIME_BUDGET_MS = 200.0
+
+
+def hourly_to_slots(hourly: Sequence[float], slots: int = DEFAULT_SLOTS,
+                    slot_hours: float = SLOT_HOURS, spread: bool = True) -> np.ndarray:
+    """Map hourly values onto fixed-length slots.
+
+    Energies (spread=True) are divided evenly across the hour's slots; rates
+    such as prices (spread=False) are repeated unchanged.
+    """
+    per_hour = int(round(1.0 / slot_hours))
+    arr = np.asarray(hourly, dtype=np.float64)
+    if spread:
+        arr = arr / per_hour
+    arr = np.repeat(arr, per_hour)
+    if arr.size >= slots:
+        return arr[:slots]
+    return np.pad(arr, (0, slots - arr.size))
+
+
+class ChargeOptimizer:
+    """Plan per-slot EV charge power that minimizes grid import cost.
+
+    Decision variables per slot are EV energy, battery charge, battery
+    discharge and grid import (kWh). Constraints cover the power balance
+    (excess is exported), battery SOC between reserve and capacity, the charger
+    limit and an energy target to be met before the departure slot.
+
+    The LP is solved with a primal-dual interior point method (Mehrotra
+    predictor-corrector), which takes a dozen or so iterations whatever the
+    inputs. Each iteration solves one normal-equations system over the
+    constraint rows; it is assembled from prefix sums in O(n^2) rather than
+    from the dense rows, and its diagonal power balance block is eliminated
+    before solving. The duality gap of the result is reported with it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no problem structure."""
+        self._slots: int = 0
+        self._structure: tuple[float, float, int] = (1.0, 1.0, 0)
+
+    def _mul_rows(self, v: np.ndarray) -> np.ndarray:
+        """Return rows @ v using prefix sums instead of the dense rows.
+
+        Variables are laid out as [e, c, d, g]. The rows are the power
+        balance per slot, the SOC change up to each slot and the energy
+        charged before departure.
+        """
+        ev, charge, discharge, grid = np.split(v, 4)
+        eta_in, eta_out, departure_slot = self._structure
+        return np.concatenate((
+            grid + discharge - ev - charge,
+            np.cumsum(eta_in * charge - discharge / eta_out),
+            [ev[:departure_slot].sum()],
+        ))
+
+    def _mul_rows_t(self, w: np.ndarray) -> np.ndarray:
+        """Return rows.T @ w using suffix sums instead of the dense rows."""
+        eta_in, eta_out, departure_slot = self._structure
+        n = self._slots
+        balance, soc, target = w[:n], w[n:2 * n], w[2 * n]
+        soc_suffix = np.cumsum(soc[::-1])[::-1]
+        ev = -balance
+        ev[:departure_slot] += target
+        return np.concatenate((
+            ev,
+            eta_in * soc_suffix - balance,
+            balance - soc_suffix / eta_out,
+            balance,
+        ))
+
+    def _normal_matrix(self, weights: np.ndarray) -> np.ndarray:
+        """Return rows @ diag(weights) @ rows.T from the row structure."""
+        eta_in, eta_out, departure_slot = self._structure
+        n = self._slots
+        w_ev, w_charge, w_discharge, w_grid = np.split(weights, 4)
+        idx = np.arange(n)
+        before_departure = idx < departure_slot
+
+        balance = np.diag(w_ev + w_charge + w_discharge + w_grid)
+        # SOC rows are prefix sums, so their products are prefix sums too
+        soc = np.cumsum(eta_in ** 2 * w_charge + w_discharge / eta_out ** 2)[
+            np.minimum.outer(idx, idx)]
+        cross = np.where(idx[:, None] <= idx[None, :],
+                         -(eta_in * w_charge + w_discharge / eta_out)[:, None], 0.0)
+        target = np.where(before_departure, -w_ev, 0.0)
+
+        matrix = np.zeros((2 * n + 1, 2 * n + 1))
+        matrix[:n, :n] = balance
+        matrix[n:2 * n, n:2 * n] = soc
+        matrix[:n, n:2 * n] = cross
+        matrix[n:2 * n, :n] = cross.T
+        matrix[:n, 2 * n] = matrix[2 * n, :n] = target
+        matrix[2 * n, 2 * n] = w_ev[before_departure].sum()
+        return matrix
+
+    def solve(self, solar_kwh: Sequence[float], load_kwh: Sequence[float],
+              prices: Sequence[float], *, soc_pct: float, capacity_kwh: float,
+              reserve_pct: float, efficiency: float, max_charger_kw: float,
+              battery_max_kw: float, target_kwh: float, departure_slot: int,
+              slot_hours: float = SLOT_HOURS,
+              time_budget_ms: float = DEFAULT_TIME_BUDGET_MS) -> OptimizedSchedule:
+        """Solve for the cheapest charge schedule over len(prices) slots.
+
+        The solve stops after time_budget_ms even if it has not converged,
+        returning the current iterate kept within the variable bounds.
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000.0
+        price = np.asarray(prices, dtype=np.float64)
+        n = price.size
+        solar = np.resize(np.asarray(solar_kwh, dtype=np.float64), n)
+        load = np.resize(np.asarray(load_kwh, dtype=np.float64), n)
+
+        # Split round-trip efficiency evenly between charge and discharge
+        eta = float(np.sqrt(min(max(efficiency, 1e-3), 1.0)))
+        departure_slot = int(min(max(departure_slot, 0), n))
+        self._slots = n
+        self._structure = (eta, eta, departure_slot)
+
+        start_kwh = capacity_kwh * soc_pct / 100.0
+        floor_kwh = min(capacity_kwh * reserve_pct / 100.0, start_kwh)
+        ev_max = max(max_charger_kw, 0.0) * slot_hours
+        batt_max = max(battery_max_kw, 0.0) * slot_hours
+        # Never ask for more than the charger can physically deliver
+        target = min(max(target_kwh, 0.0), ev_max * departure_slot)
+        # Import beyond what the house, EV and battery absorb is never
+        # useful; the cap keeps the LP bounded even for negative prices
+        grid_max = np.maximum(load - solar, 0.0) + ev_max + batt_max
+
+        # Bounds on the variables followed by bounds on the rows
+        inf = np.inf
+        lower = np.concatenate((
+            np.zeros(4 * n),
+            load - solar,
+            np.full(n, floor_kwh - start_kwh),
+            [target],
+        ))
+        upper = np.concatenate((
+            np.full(n, ev_max), np.full(n, batt_max), np.full(n, batt_max), grid_max,
+            np.full(n, inf),
+            np.full(n, max(capacity_kwh, start_kwh) - start_kwh),
+            [inf],
+        ))
+        upper = np.maximum(upper, lower + MIN_BOUND_WIDTH)
+
+        mean_price = float(np.mean(np.abs(price))) or 1.0
+        cost = np.concatenate((
+            np.full(n, -SURPLUS_VALUE_FRACTION * mean_price),
+            np.full(n, CYCLE_PENALTY_FRACTION * mean_price),
+            np.full(n, CYCLE_PENALTY_FRACTION * mean_price),
+            price,
+        ))
+
+        x, gap, iterations, converged = self._interior_point(cost, lower, upper, deadline)
+
+        ev, charge, discharge, grid = np.split(x, 4)
+        battery = start_kwh + np.cumsum(eta * charge - discharge / eta)
+        return OptimizedSchedule(
+            charge_kw=(ev / slot_hours).round(3).tolist(),
+            battery_kwh=battery.round(3).tolist(),
+            grid_import_kwh=grid.round(3).tolist(),
+            cost=round(float(price @ grid), 4),
+            iterations=iterations,
+            converged=converged,
+            solve_ms=round((time.perf_counter() - started) * 1000.0, 2),
+            optimality_gap=gap,
+        )
+
+    def _interior_point(self, cost: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                        deadline: float) -> tuple[np.ndarray, float, int, bool]:
+        """Minimize cost·x s.t. lower <= [x; rows x] <= upper.
+
+        The row values are carried as slack variables s with rows x - s = 0,
+        so every bound is a simple bound on w = [x; s]. Every variable has a
+        finite lower bound; upper bounds may be infinite. Returns x, the
+        duality gap, the iteration count and whether it converged.
+        """
+        nx = cost.size
+        size = lower.size
+        slots = self._slots
+        has_upper = np.isfinite(upper)
+        upper_finite = np.where(has_upper, upper, 0.0)
+        cost_w = np.concatenate((cost, np.zeros(size - nx)))
+
+        def mul_a(w: np.ndarray) -> np.ndarray:
+            return self._mul_rows(w[:nx]) - w[nx:]
+
+        def mul_at(y: np.ndarray) -> np.ndarray:
+            return np.concatenate((self._mul_rows_t(y), -y))
+
+        def max_step(values: np.ndarray, steps: np.ndarray) -> float:
+            shrinking = steps < 0
+            if not shrinking.any():
+                return 1.0
+            return min(1.0, float(np.min(-values[shrinking] / steps[shrinking])))
+
+        # Start strictly inside the bounds with unit duals
+        w = np.where(has_upper, (lower + upper_finite) / 2.0, lower + 1.0)
+        y = np.zeros(size - nx)
+        z_lower = np.ones(size)
+        z_upper = np.where(has_upper, 1.0, 0.0)
+        bounds_count = size + int(has_upper.sum())
+        cost_scale = 1.0 + float(np.max(np.abs(cost)))
+
+        converged = False
+        iteration = 0
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            gap_lower = w - lower
+            gap_upper = np.where(has_upper, upper_finite - w, 1.0)
+            primal_residual = -mul_a(w)
+            dual_residual = cost_w - mul_at(y) - z_lower + z_upper
+            mu = (gap_lower @ z_lower + gap_upper @ z_upper) / bounds_count
+            if (np.max(np.abs(primal_residual)) <= TOLERANCE * (1.0 + np.max(np.abs(w)))
+                    and np.max(np.abs(dual_residual)) <= TOLERANCE * cost_scale
+                    and mu <= TOLERANCE * cost_scale):
+                converged = True
+                break
+            if time.perf_counter() > deadline:
+                break
+
+            inverse_weight = 1.0 / (z_lower / gap_lower + z_upper / gap_upper)
+            normal = self._normal_matrix(inverse_weight[:nx])
+            normal[np.diag_indices_from(normal)] += inverse_weight[nx:] + REGULARIZATION
+            # The balance rows form a diagonal block; eliminate it and keep
+            # the Schur complement over the SOC and target rows
+            balance = normal.diagonal()[:slots].copy()
+            cross = normal[:slots, slots:]
+            schur = normal[slots:, slots:] - cross.T @ (cross / balance[:, None])
+
+            def solve_normal(rhs: np.ndarray) -> np.ndarray:
+                head = rhs[:slots] / balance
+                tail = np.linalg.solve(schur, rhs[slots:] - cross.T @ head)
+                return np.concatenate((head - cross @ tail / balance, tail))
+
+            def newton_step(target_lower: np.ndarray, target_upper: np.ndarray):
+                rhs = dual_residual - target_lower / gap_lower + target_upper / gap_upper
+                dy = solve_normal(primal_residual + mul_a(inverse_weight * rhs))
+                dw = inverse_weight * (mul_at(dy) - rhs)
+                dz_lower = (target_lower - z_lower * dw) / gap_lower
+                dz_upper = np.where(has_upper, (target_upper + z_upper * dw) / gap_upper, 0.0)
+                primal_step = min(max_step(gap_lower, dw),
+                                  max_step(gap_upper, np.where(has_upper, -dw, 0.0)))
+                dual_step = min(max_step(z_lower, dz_lower), max_step(z_upper, dz_upper))
+                return dw, dy, dz_lower, dz_upper, primal_step, dual_step
+
+            # Predictor: the pure Newton step towards complementarity
+            dw, dy, dz_lower, dz_upper, primal_step, dual_step = newton_step(
+                -gap_lower * z_lower, -gap_upper * z_upper)
+            mu_affine = ((gap_lower + primal_step * dw) @ (z_lower + dual_step * dz_lower)
+                         + (gap_upper - primal_step * dw) @ (z_upper + dual_step * dz_upper)
+                         ) / bounds_count
+            sigma = (mu_affine / mu) ** 3
+
+            # Corrector: centre and compensate the predictor's second-order term
+            dw, dy, dz_lower, dz_upper, primal_step, dual_step = newton_step(
+                sigma * mu - gap_lower * z_lower - dw * dz_lower,
+                np.where(has_upper, sigma * mu - gap_upper * z_upper + dw * dz_upper, 0.0))
+            primal_step *= STEP_FRACTION
+            dual_step *= STEP_FRACTION
+            w = w + primal_step * dw
+            y = y + dual_step * dy
+            z_lower = z_lower + dual_step * dz_lower
+            z_upper = z_upper + dual_step * dz_upper
+
+        dual_objective = lower @ z_lower - upper_finite @ z_upper
+        gap = abs(float(cost_w @ w) - float(dual_objective))
+        return np.clip(w[:nx], lower[:nx], upper[:nx]), gap, iteration, converged
@@ -0,0 +1,91 @@
+"""Vectorized rolling-horizon EV charge planning over hourly forecasts."""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from .models import ChargePlan
+
+PLAN_HORIZON_HOURS = 48
+
+
+def _fit_horizon(values: Sequence[float], horizon: int, repeat: bool) -> np.ndarray:
+    """Return values as a float array of exactly `horizon` entries.
+
+    Short series are either tiled (repeat=True, e.g. a daily load profile)
+    or zero padded (repeat=False, e.g. a solar forecast that ends early).
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.size >= horizon:
+        return arr[:horizon]
+    if repeat and arr.size:
+        return np.resize(arr, horizon)
+    return np.pad(arr, (0, horizon - arr.size))
+
+
+def _allocate(capacity: np.ndarray, total: float) -> np.ndarray:
+    """Fill capacity hour by hour from the start until total is used up."""
+    cumulative = np.cumsum(capacity)
+    before = cumulative - capacity
+    return np.clip(total - before, 0.0, capacity)
+
+
+def _clamped_balance(start: float, flow: np.ndarray, floor: float, ceiling: float) -> np.ndarray:
+    """Return the running balance of flow kept within [floor, ceiling].
+
+    Equivalent to repeatedly applying clip(x + flow[t], floor, ceiling), but
+    evaluated with the closed-form two-sided Skorokhod map so that it needs no
+    Python loop: an n x n window-minimum matrix replaces the recurrence.
+    """
+    width = max(ceiling - floor, 0.0)
+    psi = np.concatenate(([start - floor], start - floor + np.cumsum(flow)))
+    idx = np.arange(psi.size)
+    upper_tri = idx[None, :] >= idx[:, None]
+
+    # window_min[s, t] = min(psi[s..t]) for s <= t
+    window_min = np.minimum.accumulate(np.where(upper_tri, psi[None, :], np.inf), axis=1)
+    ceiling_push = np.where(upper_tri, np.minimum(psi[:, None] - width, window_min),
+                            -np.inf).max(axis=0)
+    floor_push = np.minimum(np.minimum.accumulate(psi), 0.0)
+    return (psi - np.maximum(floor_push, ceiling_push) + floor)[1:]
+
+
+def plan_charging(solar_kwh: Sequence[float], load_kwh: Sequence[float], *,
+                  soc_pct: float, capacity_kwh: float, reserve_pct: float,
+                  efficiency: float, max_charger_kw: float, budget_kwh: float,
+                  horizon: int = PLAN_HORIZON_HOURS) -> ChargePlan:
+    """Plan hourly EV charging over the horizon using array operations only.
+
+    EV charging is scheduled solar-first: each hour's surplus feeds the EV up
+    to the charger limit until the budget is used. The rest of the budget is
+    drawn from the battery as early as charger headroom allows. The battery
+    trajectory is the running balance of what remains, held between the
+    reserve and full capacity (the grid covers deficits and takes excess).
+    """
+    solar = _fit_horizon(solar_kwh, horizon, repeat=False)
+    load = _fit_horizon(load_kwh, horizon, repeat=True)
+    surplus = solar - load
+
+    max_kwh = max(max_charger_kw, 0.0)  # one hour at max power
+    budget = max(budget_kwh, 0.0)
+
+    ev_solar = _allocate(np.clip(surplus, 0.0, max_kwh), budget)
+
+    reserve_kwh = capacity_kwh * reserve_pct / 100.0
+    start_kwh = capacity_kwh * soc_pct / 100.0
+    usable_kwh = max(start_kwh - reserve_kwh, 0.0) * efficiency
+    ev_battery = _allocate(max_kwh - ev_solar,
+                           min(budget - float(ev_solar.sum()), usable_kwh))
+
+    # Battery flow: remaining surplus charges it, deficits and EV draw discharge it
+    flow = surplus - ev_solar
+    flow = np.where(flow > 0, flow * efficiency, flow) - ev_battery / max(efficiency, 1e-6)
+    battery = _clamped_balance(max(start_kwh, reserve_kwh), flow, reserve_kwh, capacity_kwh)
+
+    charge = ev_solar + ev_battery
+    return ChargePlan(
+        surplus_kwh=surplus.round(3).tolist(),
+        battery_kwh=battery.round(3).tolist(),
+        charge_kw=charge.round(3).tolist(),
+        total_kwh=round(float(charge.sum()), 3),
+    )
@@ -21,8 +21,7 @@ from .const import (
     DOMAIN,
 )
 
-from .service_registry import SERVICE_CLASS_MAP
-from .service_type import ServiceType
+from .services import SERVICE_CLASS_MAP, ServiceType
 
 # Define available integration options (currently only one each, can expand in future)
 AVAILABLE_EV_CHARGERS = ["Wallbox"]
@@ -249,8 +248,7 @@ from .const import (
     DOMAIN,
 )
 
-from .service_registry import SERVICE_CLASS_MAP
-from .service_type import ServiceType
+from .services import SERVICE_CLASS_MAP, ServiceType
 
 # Define available integration options (currently only one each, can expand in future)
 AVAILABLE_EV_CHARGERS = ["Wallbox"]
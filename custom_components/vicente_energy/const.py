@@ -24,6 +24,74 @@ CONF_MAX_CHARGER_POWER_KW = "max_charger_power_kw"
 CONF_SESSION_LEARNING_ALPHA = "session_learning_alpha"
 CONF_BUDGET_UPDATE_INTERVAL_HOURS = "budget_update_interval_hours"
 CONF_UPDATE_INTERVAL_MINUTES = "update_interval_minutes"
+CONF_CONTROL_SOLAR_DELTA_W = "control_solar_delta_w"
+CONF_CONTROL_LOAD_DELTA_W = "control_load_delta_w"
+CONF_CONTROL_SOC_DELTA_PCT = "control_soc_delta_pct"
+CONF_CONTROL_DEBOUNCE_SECONDS = "control_debounce_seconds"
+CONF_CONTROL_MIN_DWELL_SECONDS = "control_min_dwell_seconds"
+CONF_CHARGER_WRITE_HYSTERESIS_AMPS = "charger_write_hysteresis_amps"
+CONF_BATTERY_MAX_POWER_KW = "battery_max_power_kw"
+CONF_TARIFF_PRICES = "tariff_prices"
+CONF_DEPARTURE_HOUR = "departure_hour"
+CONF_DEPARTURE_TARGET_KWH = "departure_target_kwh"
+CONF_HISTORY_CAPACITY = "history_capacity"
+CONF_SAVE_DELAY_SECONDS = "save_delay_seconds"
+CONF_STATE_DELTA_LOG = "state_delta_log"
+CONF_BIAS_BY_MONTH = "bias_by_month"
+CONF_BUDGET_CONFIDENCE = "budget_confidence"
+CONF_POWERWALL_HOST = "powerwall_host"
+CONF_POWERWALL_PASSWORD = "powerwall_password"
+CONF_POWERWALL_POLL_SECONDS = "powerwall_poll_seconds"
+CONF_SOLAREDGE_HOST = "solaredge_host"
+CONF_SOLAREDGE_PORT = "solaredge_port"
+CONF_SOLAREDGE_UNIT_ID = "solaredge_unit_id"
+CONF_SOLAREDGE_POLL_SECONDS = "solaredge_poll_seconds"
+CONF_FRANKLIN_EMAIL = "franklin_email"
+CONF_FRANKLIN_PASSWORD = "franklin_password"
+CONF_FRANKLIN_GATEWAY_ID = "franklin_gateway_id"
+CONF_FRANKLIN_URL = "franklin_url"
+CONF_FRANKLIN_POLL_SECONDS = "franklin_poll_seconds"
+# Per-sensor {"absolute", "relative", "max_silence_seconds"} keyed by sensor key
+CONF_SENSOR_DEADBANDS = "sensor_deadbands"
 
 CONF_RESERVE_SOC = CONF_RESERVE_SOC_PCT
 CONF_SOLAR_WEIGHT = "solar_importance_weight"
+
+DEFAULT_CONTROL_SOLAR_DELTA_W = 200.0
+DEFAULT_CONTROL_LOAD_DELTA_W = 200.0
+DEFAULT_CONTROL_SOC_DELTA_PCT = 1.0
+DEFAULT_CONTROL_DEBOUNCE_SECONDS = 2.0
+DEFAULT_CONTROL_MIN_DWELL_SECONDS = 10.0
+DEFAULT_BATTERY_MAX_POWER_KW = 5.0
+DEFAULT_TARIFF_PRICE = 1.0
+DEFAULT_DEPARTURE_HOUR = 7
+DEFAULT_HISTORY_CAPACITY = 2000
+DEFAULT_SAVE_DELAY_SECONDS = 30.0
+DEFAULT_FORECAST_CACHE_TTL_SECONDS = 1800.0
+DEFAULT_BUDGET_CONFIDENCE = 0.8
+DEFAULT_POWERWALL_POLL_SECONDS = 5.0
+DEFAULT_SOLAREDGE_PORT = 1502
+DEFAULT_SOLAREDGE_UNIT_ID = 1
+DEFAULT_SOLAREDGE_POLL_SECONDS = 2.0
+DEFAULT_FRANKLIN_URL = "https://energy.franklinwh.com"
+DEFAULT_FRANKLIN_POLL_SECONDS = 5.0
+DEFAULT_SENSOR_MAX_SILENCE_SECONDS = 900.0
+
+# Budget job outputs that make up the budget and its schedules; every other
+# key in the payload is diagnostics
+BUDGET_FIELDS = (
+    "budget_24h_kwh",
+    "charge_schedule_kw",
+    "optimized_schedule_kw",
+    "optimized_cost",
+    "budget_p10_kwh",
+    "budget_p50_kwh",
+    "budget_p90_kwh",
+    "budget_confidence",
+)
+
+# hass.data keys of the direct device clients the vendor services share
+DATA_POWERWALL_CLIENT = "vicente_energy_powerwall_client"
+DATA_SUNSPEC_CLIENT = "vicente_energy_sunspec_client"
+DATA_FRANKLIN_CLIENT = "vicente_energy_franklin_client"
+GATEWAY_CLIENT_KEYS = (DATA_POWERWALL_CLIENT, DATA_SUNSPEC_CLIENT, DATA_FRANKLIN_CLIENT)
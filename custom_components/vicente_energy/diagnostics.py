@@ -0,0 +1,28 @@
+"""Diagnostics support for Vicente Energy."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import BUDGET_FIELDS, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant,
+                                             entry: ConfigEntry) -> dict[str, Any]:
+    """Return the job diagnostics and sensor write counters.
+
+    These change on every tick, so they are kept out of the sensors'
+    recorded attributes.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    scheduler = data["scheduler"]
+    budget = scheduler.coordinator("budget").data or {}
+    power_control = scheduler.coordinator("power_control").data or {}
+    return {
+        "budget": {key: value for key, value in budget.items() if key not in BUDGET_FIELDS},
+        "power_control": {key: value for key, value in power_control.items()
+                          if key != "power_level_kw"},
+        "state_writes": {sensor.deadband_key: sensor.deadband_stats
+                         for sensor in data.get("deadband_sensors", ())},
+    }
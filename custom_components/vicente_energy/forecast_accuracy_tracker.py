@@ -1,28 +1,80 @@
 """Track forecast accuracy and update stored bias values."""
 
+from typing import Optional
+
 from .state_manager import StateManager
 
 
 class ForecastAccuracyTracker:
-    """Compute running forecast error and update bias."""
+    """Compute running forecast error and update bias.
+
+    When the hour of day is known, the pair also trains the per-hour bias
+    matrix. The scalar bias then learns only the residual error left after
+    the matrix correction, so the two are not applied twice.
+
+    Hourly scoring is split in two: expect_hour() holds the forecasts for
+    the hour starting now, and score_hour() compares them with the energy
+    measured once that hour is over.
+    """
 
     def __init__(self, state_manager: StateManager, alpha: float, state: StateManager = None):
         """Initialize with state storage and learning rate."""
         self._state = state if state is not None else state_manager
         self._alpha = alpha
+        self._expected: Optional[tuple[dict[str, float], int, int]] = None
 
-    def update_solar(self, forecast_kwh: float, actual_kwh: float):
-        """Update solar bias based on forecast vs actual kWh."""
+    def _update(self, kind: str, forecast_kwh: float, actual_kwh: float,
+                hour: Optional[int], month: Optional[int]) -> Optional[float]:
+        """Return the new scalar bias for kind, or None to leave it unchanged."""
+        if hour is not None:
+            matrix = self._state.get_bias_matrix(kind)
+            corrected_kwh = float(matrix.apply([forecast_kwh], [hour], month)[0])
+            matrix.update(hour, forecast_kwh, actual_kwh, self._alpha, month)
+            self._state.async_schedule_save(f"{kind}_bias_matrix")
+            forecast_kwh = corrected_kwh
         if forecast_kwh == 0:
-            return
+            return None
         error = (actual_kwh - forecast_kwh) / forecast_kwh
-        new_bias = error * self._alpha
-        self._state.update_solar_bias(new_bias)
+        current = getattr(self._state, f"get_{kind}_bias")()
+        # Exponential moving average: accumulate rather than overwrite
+        return current + self._alpha * (error - current)
+
+    def update_solar(self, forecast_kwh: float, actual_kwh: float,
+                     hour: Optional[int] = None, month: Optional[int] = None):
+        """Update solar bias based on forecast vs actual kWh."""
+        new_bias = self._update("solar", forecast_kwh, actual_kwh, hour, month)
+        if new_bias is not None:
+            self._state.update_solar_bias(new_bias)
 
-    def update_load(self, forecast_kwh: float, actual_kwh: float):
+    def update_load(self, forecast_kwh: float, actual_kwh: float,
+                    hour: Optional[int] = None, month: Optional[int] = None):
         """Update load bias based on forecast vs actual kWh."""
-        if forecast_kwh == 0:
+        new_bias = self._update("load", forecast_kwh, actual_kwh, hour, month)
+        if new_bias is not None:
+            self._state.update_load_bias(new_bias)
+
+    def expect_hour(self, forecasts_kwh: dict[str, float], hour: int, month: int) -> None:
+        """Hold the forecast kWh per kind ("solar", "load") for the hour starting now."""
+        self._expected = (forecasts_kwh, hour, month)
+
+    def score_hour(self, actuals_kwh: Optional[dict[str, float]]) -> None:
+        """Score the held forecasts against the kWh measured over their hour.
+
+        Pass None when the hour was not fully measured; the held forecasts
+        are then dropped unscored.
+        """
+        expected, self._expected = self._expected, None
+        if expected is None or actuals_kwh is None:
             return
-        error = (actual_kwh - forecast_kwh) / forecast_kwh
-        new_bias = error * self._alpha
-        self._state.update_load_bias(new_bias)
+        forecasts_kwh, hour, month = expected
+        for kind, forecast_kwh in forecasts_kwh.items():
+            if kind in actuals_kwh:
+                getattr(self, f"update_{kind}")(forecast_kwh, actuals_kwh[kind],
+                                                 hour=hour, month=month)
+
+    def accuracy(self) -> dict[str, dict]:
+        """Return per-hour MAE/MAPE for the solar and load forecasts."""
+        return {
+            f"{kind}_accuracy": self._state.get_bias_matrix(kind).accuracy
+            for kind in ("solar", "load")
+        }
@@ -0,0 +1,110 @@
+"""Shared cache for parsed forecast arrays."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from dataclasses import dataclass
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DEFAULT_FORECAST_CACHE_TTL_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+ForecastFetcher = Callable[[], Awaitable[Sequence[float]]]
+
+
+@dataclass(frozen=True)
+class CachedForecast:
+    """A parsed forecast and the issue marker it was fetched for."""
+
+    values: np.ndarray
+    issued: Hashable
+    fetched_at: float
+
+
+class ForecastCache:
+    """Cache parsed forecasts per source with a TTL and stale-while-revalidate.
+
+    Entries are keyed by source and only reused while the source reports the
+    same issue marker (e.g. the forecast's last update time). Within the TTL
+    an entry is returned as is; after it the stale entry is still returned
+    immediately while a single background fetch refreshes it. Cached arrays
+    are read-only so every consumer can share them.
+    """
+
+    def __init__(self, hass: HomeAssistant,
+                 ttl: float = DEFAULT_FORECAST_CACHE_TTL_SECONDS) -> None:
+        """Initialize an empty cache."""
+        self.hass = hass
+        self._ttl = ttl
+        self._entries: dict[str, CachedForecast] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters."""
+        return {
+            "forecast_cache_hits": self._hits,
+            "forecast_cache_stale_hits": self._stale_hits,
+            "forecast_cache_misses": self._misses,
+        }
+
+    def issued(self, source: str) -> Optional[Hashable]:
+        """Return the issue marker of the cached entry for source, if any."""
+        entry = self._entries.get(source)
+        return entry.issued if entry is not None else None
+
+    @callback
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """Drop the entry for source, or all entries."""
+        if source is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(source, None)
+
+    async def async_get(self, source: str, issued: Hashable,
+                        fetch: ForecastFetcher) -> np.ndarray:
+        """Return the forecast for source, fetching only when needed."""
+        entry = self._entries.get(source)
+        if entry is not None and entry.issued == issued:
+            if time.monotonic() - entry.fetched_at < self._ttl:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+                self._refresh(source, issued, fetch)
+            return entry.values
+
+        self._misses += 1
+        return await self._refresh(source, issued, fetch)
+
+    def _refresh(self, source: str, issued: Hashable, fetch: ForecastFetcher) -> asyncio.Task:
+        """Start a fetch for source unless one is already running."""
+        task = self._refreshing.get(source)
+        if task is None:
+            task = self.hass.async_create_task(self._async_fetch(source, issued, fetch))
+            self._refreshing[source] = task
+        return task
+
+    async def _async_fetch(self, source: str, issued: Hashable,
+                           fetch: ForecastFetcher) -> np.ndarray:
+        """Fetch, parse and store a forecast; keep the old entry on failure."""
+        try:
+            values = np.asarray(await fetch(), dtype=np.float64)
+        except (ValueError, TypeError) as err:
+            _LOGGER.debug("Forecast source %s could not be refreshed: %s", source, err)
+            entry = self._entries.get(source)
+            return entry.values if entry is not None else np.empty(0)
+        finally:
+            self._refreshing.pop(source, None)
+
+        values.flags.writeable = False
+        self._entries[source] = CachedForecast(values, issued, time.monotonic())
+        return values
@@ -0,0 +1,90 @@
+"""Measure solar and house load energy over each scheduler hour."""
+
+from collections.abc import Callable
+from datetime import datetime
+import time
+from typing import Optional
+
+from homeassistant.core import callback
+
+from .input_collector import InputCollector
+from .models import Signals
+
+# Signals field integrated for each measured quantity
+MEASURED_FIELDS = {
+    "solar": "solar_power_w",
+    "load": "house_load_total_w",
+}
+
+# Slack allowed around one hour before a period no longer counts as that hour
+PERIOD_TOLERANCE_SECONDS = 300.0
+
+
+class HourlyEnergyMeter:
+    """Integrate collector power readings into energy per hourly period.
+
+    The collector reports a value only when it changes, so each reading is
+    held until the next one. take_hour() closes the period started by the
+    previous call and returns the energy measured over it, provided the
+    period spans an hour; a partial hour, such as the first after a
+    restart, is not reported.
+    """
+
+    def __init__(self, collector: InputCollector) -> None:
+        """Start with no readings and no open period."""
+        self._collector = collector
+        self._unsub: Optional[Callable[[], None]] = None
+        self._kwh = dict.fromkeys(MEASURED_FIELDS, 0.0)
+        self._last_kw: Optional[dict[str, float]] = None
+        self._last_t: Optional[float] = None
+        self._period_start: Optional[float] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Begin integrating from the collector's current snapshot."""
+        self.async_stop()
+        self.add_signals(time.time(), self._collector.get_signals())
+        self._unsub = self._collector.async_add_listener(self._handle_signals)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop integrating collector updates."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _handle_signals(self, signals: Signals) -> None:
+        self.add_signals(time.time(), signals)
+
+    def _advance(self, timestamp: float) -> None:
+        """Hold the last reading up to timestamp."""
+        if self._last_t is None or timestamp <= self._last_t:
+            return
+        hours = (timestamp - self._last_t) / 3600.0
+        for kind, kw in self._last_kw.items():
+            self._kwh[kind] += kw * hours
+        self._last_t = timestamp
+
+    def add_signals(self, timestamp: float, signals: Signals) -> None:
+        """Integrate up to a new snapshot taken at timestamp (epoch seconds)."""
+        self._advance(timestamp)
+        if self._last_t is None:
+            self._last_t = timestamp
+        self._last_kw = {kind: getattr(signals, field) / 1000.0
+                         for kind, field in MEASURED_FIELDS.items()}
+
+    def take_hour(self, now: datetime) -> Optional[dict[str, float]]:
+        """Close the current period at now and return its kWh per quantity.
+
+        Returns None when the period did not span an hour.
+        """
+        timestamp = now.timestamp()
+        self._advance(timestamp)
+        started, self._period_start = self._period_start, timestamp
+        energy, self._kwh = self._kwh, dict.fromkeys(MEASURED_FIELDS, 0.0)
+        if started is None or abs(timestamp - started - 3600.0) > PERIOD_TOLERANCE_SECONDS:
+            return None
+        # Scale to a whole hour so a tick a few seconds late is not scored low
+        scale = 3600.0 / (timestamp - started)
+        return {kind: kwh * scale for kind, kwh in energy.items()}
@@ -1,10 +1,46 @@
 """Gather raw sensor signals for Vicente Energy calculations."""
 
-from homeassistant.core import HomeAssistant
+from collections.abc import Callable
+from dataclasses import replace
+import logging
+from typing import Optional
 
+from homeassistant.const import PERCENTAGE, UnitOfPower
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_BATTERY_SOC_ENTITY,
+    CONF_EVCHARGER_POWER_ENTITY,
+    CONF_EVCHARGER_STATE_ENTITY,
+    CONF_HOUSE_LOAD_ENTITY,
+    CONF_SOLAR_FORECAST_ENTITIES,
+    CONF_SOLAR_POWER_ENTITY,
+)
 from .models import Signals
+from .services import ServiceType
+from .services.numeric import async_get_parser
 from .services.service_manager import ServiceManager
 
+_LOGGER = logging.getLogger(__name__)
+
+_INVERTER_ON_STATES = ("on", "true", "1")
+
+# Unit each numeric Signals field is reported in
+_FIELD_UNITS = {
+    "solar_power_w": UnitOfPower.WATT,
+    "battery_soc_pct": PERCENTAGE,
+    "house_load_total_w": UnitOfPower.WATT,
+    "wallbox_power_w": UnitOfPower.WATT,
+}
+
+
+def _parse_on(state: Optional[State]) -> bool:
+    """Return True when a state represents an 'on' inverter."""
+    if state is None or not hasattr(state, "state"):
+        return False
+    return str(state.state).lower() in _INVERTER_ON_STATES
+
 
 class InputCollector:
     """Collect sensor inputs and optional external service data."""
@@ -52,43 +88,202 @@ class InputCollector:
         self._wallbox_state_entity    = wallbox_state_entity
         # Store the ServiceManager (if any) for external data (e.g., Wallbox API)
         self.service_manager = service_manager
+        self._parser = async_get_parser(hass)
+
+        # Push mode state: snapshot kept current by state-change events
+        self._signals: Optional[Signals] = None
+        self._dirty: bool = True
+        self._unsubs: list[Callable[[], None]] = []
+        self._listeners: list[Callable[[Signals], None]] = []
+
+    @property
+    def is_listening(self) -> bool:
+        """Return True while the collector is subscribed to its entities."""
+        return self._signals is not None
+
+    @property
+    def has_changes(self) -> bool:
+        """Return True if any input changed since the last mark_clean()."""
+        return self._dirty
+
+    def mark_clean(self) -> None:
+        """Acknowledge the current snapshot as consumed."""
+        self._dirty = False
+
+    def mark_dirty(self) -> None:
+        """Force consumers to recompute on their next tick."""
+        self._dirty = True
+
+    @callback
+    def async_add_listener(self, listener: Callable[[Signals], None]) -> Callable[[], None]:
+        """Call listener with the new snapshot whenever an input changes.
+
+        Returns a function that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _set_signals(self, signals: Signals) -> None:
+        """Replace the snapshot, flag it dirty and notify listeners."""
+        self._signals = signals
+        self._dirty = True
+        for listener in list(self._listeners):
+            listener(signals)
+
+    def _entity_fields(self) -> dict[str, str]:
+        """Map each configured entity ID to the Signals field it feeds."""
+        fields = {
+            self._solar_power_entity: "solar_power_w",
+            self._battery_soc_entity: "battery_soc_pct",
+            self._house_load_entity: "house_load_total_w",
+            self._inverter_on_entity: "agate_inverter_on",
+        }
+        if not self._uses_charger_service():
+            fields[self._wallbox_power_entity] = "wallbox_power_w"
+        return {entity_id: field for entity_id, field in fields.items() if entity_id}
+
+    def _uses_charger_service(self) -> bool:
+        """Return True if charger power comes from the service manager."""
+        return bool(self.service_manager and hasattr(self.service_manager, "get_charger_state"))
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to all input entities and prime the signal snapshot.
+
+        After this call get_signals() returns the cached snapshot without any
+        state machine lookups; the snapshot is updated incrementally as events
+        arrive.
+        """
+        self.async_stop()
+        self._signals = self._poll_signals()
+        self._dirty = True
+
+        entity_ids = list(self._entity_fields())
+        if entity_ids:
+            self._unsubs.append(
+                async_track_state_change_event(
+                    self.hass, entity_ids, self._async_handle_state_event
+                )
+            )
+
+        if self._uses_charger_service() and hasattr(self.service_manager, "register_service_callback"):
+            try:
+                self.service_manager.register_service_callback(
+                    ServiceType.EV_CHARGER_SERVICE, self._handle_charger_change
+                )
+            except ValueError:
+                _LOGGER.debug("No EV charger service available for push updates")
+            else:
+                self._unsubs.append(
+                    lambda: self.service_manager.deregister_service_callback(
+                        ServiceType.EV_CHARGER_SERVICE, self._handle_charger_change
+                    )
+                )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from all entities and fall back to polling."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._signals = None
+
+    def update_entities_from_entry(self, entry) -> None:
+        """Re-read entity IDs from a config entry and resubscribe if listening."""
+        conf = {**entry.data, **entry.options}
+        self._solar_power_entity = conf.get(CONF_SOLAR_POWER_ENTITY, self._solar_power_entity)
+        self._solar_forecast_entities = conf.get(CONF_SOLAR_FORECAST_ENTITIES,
+                                                 self._solar_forecast_entities) or []
+        self._battery_soc_entity = conf.get(CONF_BATTERY_SOC_ENTITY, self._battery_soc_entity)
+        self._house_load_entity = conf.get(CONF_HOUSE_LOAD_ENTITY, self._house_load_entity)
+        self._wallbox_power_entity = conf.get(CONF_EVCHARGER_POWER_ENTITY,
+                                              self._wallbox_power_entity)
+        self._wallbox_state_entity = conf.get(CONF_EVCHARGER_STATE_ENTITY,
+                                              self._wallbox_state_entity)
+        if self.is_listening:
+            self.async_start()
+        else:
+            self._dirty = True
+
+    @callback
+    def _async_handle_state_event(self, event: Event) -> None:
+        """Apply a single entity change to the cached snapshot."""
+        if self._signals is None:
+            return
+        field = self._entity_fields().get(event.data["entity_id"])
+        if field is None:
+            return
+
+        new_state = event.data.get("new_state")
+        if field == "agate_inverter_on":
+            value = _parse_on(new_state)
+        else:
+            value = self._parse_float(new_state, field)
+
+        if getattr(self._signals, field) == value:
+            return
+        self._set_signals(replace(self._signals, **{field: value}))
+
+    def _handle_charger_change(self, entity_id: str,
+                               old_state: State, new_state: State) -> bool:
+        """Refresh charger power when the EV charger service reports a change."""
+        if self._signals is None:
+            return False
+        value = self._charger_service_power()
+        if self._signals.wallbox_power_w != value:
+            self._set_signals(replace(self._signals, wallbox_power_w=value))
+        return True
+
+    def _charger_service_power(self) -> float:
+        """Return charger power reported by the service manager."""
+        charger_state = self.service_manager.get_charger_state()
+        if isinstance(charger_state, dict) and 'charging_power' in charger_state:
+            try:
+                return float(charger_state['charging_power'])
+            except (ValueError, TypeError):
+                return 0.0
+        return 0.0
+
+    def _parse_float(self, state: Optional[State], field: str) -> float:
+        """Return a state's value in the field's unit, or 0.0 when missing or invalid."""
+        value = self._parser.parse(state, _FIELD_UNITS[field])
+        return 0.0 if value is None else value
 
     def get_signals(self) -> Signals:
-        """Return current Signals dataclass populated from sensors."""
-        # Solar power
-        sp = self.hass.states.get(self._solar_power_entity) if self._solar_power_entity else None
-        solar_power = float(sp.state) if sp and hasattr(sp, "state") else 0.0
-        # Battery SOC
-        bs = self.hass.states.get(self._battery_soc_entity)
-        battery_soc = float(bs.state) if bs and hasattr(bs, "state") else 0.0
-        # House load
-        hl = self.hass.states.get(self._house_load_entity)
-        house_load = float(hl.state) if hl and hasattr(hl, "state") else 0.0
+        """Return current Signals dataclass populated from sensors.
+
+        When listening, the cached snapshot is returned as-is; otherwise the
+        state machine is polled.
+        """
+        if self._signals is not None:
+            return self._signals
+        return self._poll_signals()
+
+    def _poll_signals(self) -> Signals:
+        """Build a Signals snapshot by looking up every entity."""
+        states = self.hass.states
+        solar_power = self._parse_float(states.get(self._solar_power_entity), "solar_power_w") \
+            if self._solar_power_entity else 0.0
+        battery_soc = self._parse_float(states.get(self._battery_soc_entity), "battery_soc_pct")
+        house_load = self._parse_float(states.get(self._house_load_entity), "house_load_total_w")
 
         # EV charger power measurement
         wallbox_power = 0.0
-        if self.service_manager and hasattr(self.service_manager, "get_charger_state"):
+        if self._uses_charger_service():
             # Use external Wallbox service data if available
-            charger_state = self.service_manager.get_charger_state()
-            if isinstance(charger_state, dict) and 'charging_power' in charger_state:
-                try:
-                    wallbox_power = float(charger_state['charging_power'])
-                except (ValueError, TypeError):
-                    wallbox_power = 0.0
+            wallbox_power = self._charger_service_power()
         elif self._wallbox_power_entity:
             # Fallback to local sensor
-            wp_state = self.hass.states.get(self._wallbox_power_entity)
-            if wp_state and hasattr(wp_state, "state"):
-                try:
-                    wallbox_power = float(wp_state.state)
-                except ValueError:
-                    wallbox_power = 0.0
-
-        # Inverter on/off
-        inv = self.hass.states.get(self._inverter_on_entity)
-        inv_on = False
-        if inv and hasattr(inv, "state"):
-            inv_on = str(inv.state).lower() in ("on", "true", "1")
+            wallbox_power = self._parse_float(states.get(self._wallbox_power_entity),
+                                              "wallbox_power_w")
+
+        inv_on = _parse_on(states.get(self._inverter_on_entity))
         return Signals(
             solar_power_w=solar_power,
             battery_soc_pct=battery_soc,
@@ -1,45 +1,130 @@
-"""Simple load forecasting based on recent history."""
+"""House load forecasting from weekday/weekend hour-of-day profiles."""
 
-from collections import deque
+from datetime import datetime, timedelta
+import logging
+from typing import Optional
+
+import numpy as np
+
+from homeassistant.util import dt as dt_util
 
 from .const import CONF_HOUSE_LOAD_ENTITY
 
+_LOGGER = logging.getLogger(__name__)
+
+FORECAST_HOURS = 24
+HISTORY_DAYS = 28
+# Per-observation decay of a profile cell; each cell sees one sample per
+# matching day, so 0.85 weights a sample from four weeks ago at ~1%
+PROFILE_DECAY = 0.85
+
+WEEKDAY = 0
+WEEKEND = 1
+
+
+def _day_type(when: datetime) -> int:
+    """Return WEEKEND for Saturday/Sunday, WEEKDAY otherwise."""
+    return WEEKEND if when.weekday() >= 5 else WEEKDAY
+
 
 class LoadForecaster:
-    """Forecast house load using a rolling history window."""
+    """Forecast house load from exponentially decayed hourly profiles.
+
+    Two 24-hour profiles (weekday and weekend) are kept as running decayed
+    sums and weights. Each hourly sample touches a single cell, and the
+    profile array is kept current, so a forecast is an index lookup. Weeks of
+    history can be bulk-loaded from the recorder's long-term statistics.
+    """
 
-    def __init__(self, hass, config, state_manager):
+    def __init__(self, hass, config, state_manager, decay: float = PROFILE_DECAY):
         """Initialize with Home Assistant handle and state manager."""
         self.hass = hass
         self.entity_id = config.get(CONF_HOUSE_LOAD_ENTITY)
         self.state = state_manager
-        self.history = deque(maxlen=24)  # Stores last 24 hourly values
-
-    def update_history(self, actual_value):
-        """Append the latest measured value to the history buffer."""
-        if actual_value is not None:
-            try:
-                val = float(actual_value)
-                self.history.append(val)
-            except ValueError:
-                pass
-
-    def get_raw_forecast(self):
-        """Return the last 24 readings or zero if no history."""
-        # If no history, predict zero for 24 hours
-        if len(self.history) == 0:
-            return [0.0] * 24
-        values = list(self.history)
-        if len(values) < 24:
-            # Pad the beginning with zeros if history is shorter than 24 hours
-            return [0.0] * (24 - len(values)) + values
-        else:
-            # Use last 24 recorded values
-            return values[-24:]
-
-    def get_corrected_forecast(self):
-        """Apply stored bias to the raw forecast."""
-        raw = self.get_raw_forecast()
-        bias = self.state.get_load_bias()
-        return [max(val * (1 + bias), 0.0) for val in raw]
+        self._decay = decay
+        self._sums = np.zeros((2, FORECAST_HOURS))
+        self._weights = np.zeros((2, FORECAST_HOURS))
+        self._profile = np.zeros((2, FORECAST_HOURS))
+
+    @property
+    def profile(self) -> np.ndarray:
+        """Return the (weekday/weekend x hour) profile in kWh."""
+        return self._profile
 
+    def _add_sample(self, day_type: int, hour: int, value: float) -> None:
+        """Fold one hourly value into its profile cell."""
+        self._sums[day_type, hour] = self._sums[day_type, hour] * self._decay + value
+        self._weights[day_type, hour] = self._weights[day_type, hour] * self._decay + 1.0
+        self._profile[day_type, hour] = self._sums[day_type, hour] / self._weights[day_type, hour]
+        other = 1 - day_type
+        if self._weights[other, hour] == 0.0:
+            # Until the other day type has data, let it borrow this hour
+            self._profile[other, hour] = self._profile[day_type, hour]
+
+    def update_history(self, actual_value, when: Optional[datetime] = None):
+        """Record the kWh measured over the hour containing `when` (default now)."""
+        if actual_value is None:
+            return
+        try:
+            val = float(actual_value)
+        except (TypeError, ValueError):
+            return
+        when = dt_util.as_local(when) if when is not None else dt_util.now()
+        self._add_sample(_day_type(when), when.hour, val)
+
+    async def async_load_history(self, days: int = HISTORY_DAYS) -> int:
+        """Seed the profiles from recorder hourly statistics in a single query.
+
+        Returns the number of hourly samples applied.
+        """
+        if not self.entity_id or "recorder" not in self.hass.config.components:
+            return 0
+
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import statistics_during_period
+
+        end = dt_util.now().replace(minute=0, second=0, microsecond=0)
+        start = end - timedelta(days=days)
+        try:
+            stats = await get_instance(self.hass).async_add_executor_job(
+                statistics_during_period,
+                self.hass,
+                start,
+                end,
+                {self.entity_id},
+                "hour",
+                {"power": "kW"},
+                {"mean"},
+            )
+        except Exception as err:  # noqa: BLE001 - recorder errors must not block setup
+            _LOGGER.warning("Could not load load history for %s: %s", self.entity_id, err)
+            return 0
+
+        applied = 0
+        for row in stats.get(self.entity_id, []):
+            mean = row.get("mean")
+            if mean is None:
+                continue
+            started = row["start"]
+            if isinstance(started, (int, float)):
+                started = dt_util.utc_from_timestamp(started)
+            # Mean kW over one hour equals the hour's kWh
+            self.update_history(mean, started)
+            applied += 1
+        return applied
+
+    def get_raw_forecast(self, start: Optional[datetime] = None):
+        """Return the profile value for each of the next 24 hours from `start`."""
+        start = dt_util.as_local(start) if start is not None else dt_util.now()
+        hours = start.hour + np.arange(FORECAST_HOURS)
+        day_types = np.array([_day_type(start), _day_type(start + timedelta(days=1))])
+        return self._profile[day_types[hours // 24], hours % 24].tolist()
+
+    def get_corrected_forecast(self, start: Optional[datetime] = None):
+        """Apply the learned per-hour corrections and stored bias to the raw forecast."""
+        start = dt_util.as_local(start) if start is not None else dt_util.now()
+        raw = self.get_raw_forecast(start)
+        matrix = self.state.get_bias_matrix("load")
+        corrected = matrix.apply(raw, start.hour + np.arange(FORECAST_HOURS), start.month)
+        bias = self.state.get_load_bias()
+        return np.maximum(corrected * (1 + bias), 0.0).tolist()
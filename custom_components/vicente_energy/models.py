@@ -2,7 +2,7 @@
 """Dataclass models used throughout the Vicente Energy integration."""
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -16,9 +16,38 @@ class Signals:
 
 @dataclass
 class Forecasts:
-    """Hourly solar and load forecast collections."""
+    """Hourly solar and load forecast collections.
+
+    The 24 h series cover the next 24 hours and feed the budget. The
+    optional P10/P90 solar series are aligned with solar_24h_kwh (P50).
+    solar_horizon_kwh, when set, extends the solar forecast over the
+    planner horizon and is only read by the planner and optimizer.
+    """
     solar_24h_kwh: List[float]
     load_24h_kwh: List[float]
+    solar_p10_kwh: Optional[List[float]] = None
+    solar_p90_kwh: Optional[List[float]] = None
+    solar_horizon_kwh: Optional[List[float]] = None
+
+@dataclass
+class ChargePlan:
+    """Hourly EV charge schedule with the supporting projections."""
+    surplus_kwh: List[float]
+    battery_kwh: List[float]
+    charge_kw: List[float]
+    total_kwh: float
+
+@dataclass
+class OptimizedSchedule:
+    """Cost-optimal per-slot charge schedule and solver statistics."""
+    charge_kw: List[float]
+    battery_kwh: List[float]
+    grid_import_kwh: List[float]
+    cost: float
+    iterations: int
+    converged: bool
+    solve_ms: float
+    optimality_gap: float
 
 @dataclass
 class SessionEstimates:
@@ -31,3 +60,14 @@ class SessionEstimates:
 class SessionActuals:
     """Actual values recorded from a finished session."""
     kwh_used: float
+
+@dataclass
+class BudgetDistribution:
+    """Charging budget percentiles across sampled solar scenarios."""
+    p10_kwh: float
+    p50_kwh: float
+    p90_kwh: float
+    risk_adjusted_kwh: float
+    confidence: float
+    scenarios: int
+    sample_ms: float
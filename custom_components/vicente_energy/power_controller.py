@@ -0,0 +1,204 @@
+"""Reactive charger power control driven by input changes."""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import logging
+import time
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .charge_estimator import ChargeEstimator
+from .const import (
+    CONF_CHARGER_WRITE_HYSTERESIS_AMPS,
+    CONF_CONTROL_DEBOUNCE_SECONDS,
+    CONF_CONTROL_LOAD_DELTA_W,
+    CONF_CONTROL_MIN_DWELL_SECONDS,
+    CONF_CONTROL_SOC_DELTA_PCT,
+    CONF_CONTROL_SOLAR_DELTA_W,
+    DEFAULT_CONTROL_DEBOUNCE_SECONDS,
+    DEFAULT_CONTROL_LOAD_DELTA_W,
+    DEFAULT_CONTROL_MIN_DWELL_SECONDS,
+    DEFAULT_CONTROL_SOC_DELTA_PCT,
+    DEFAULT_CONTROL_SOLAR_DELTA_W,
+)
+from .input_collector import InputCollector
+from .models import Signals
+from .services import ServiceType
+from .services.ev_charger_service import DEFAULT_WRITE_HYSTERESIS_AMPS
+from .services.service_manager import ServiceManager
+
+_LOGGER = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 100
+
+
+class PowerController:
+    """Recompute and push the charger setpoint when inputs move enough.
+
+    Changes reported by the InputCollector are compared with the signals used
+    for the last setpoint. Once solar power, house load or SOC crosses its
+    delta, a recompute is scheduled after the debounce window and no sooner
+    than the minimum dwell time after the previous setpoint write.
+    """
+
+    def __init__(self, hass: HomeAssistant, collector: InputCollector,
+                 estimator: ChargeEstimator, service_manager: Optional[ServiceManager],
+                 params: dict,
+                 on_update: Optional[Callable[[dict[str, Any]], None]] = None) -> None:
+        """Store collaborators and read control thresholds from params."""
+        self.hass = hass
+        self._collector = collector
+        self._estimator = estimator
+        self._service_manager = service_manager
+        self._on_update = on_update
+
+        self._solar_delta_w = float(params.get(CONF_CONTROL_SOLAR_DELTA_W,
+                                               DEFAULT_CONTROL_SOLAR_DELTA_W))
+        self._load_delta_w = float(params.get(CONF_CONTROL_LOAD_DELTA_W,
+                                              DEFAULT_CONTROL_LOAD_DELTA_W))
+        self._soc_delta_pct = float(params.get(CONF_CONTROL_SOC_DELTA_PCT,
+                                               DEFAULT_CONTROL_SOC_DELTA_PCT))
+        self._debounce_s = float(params.get(CONF_CONTROL_DEBOUNCE_SECONDS,
+                                            DEFAULT_CONTROL_DEBOUNCE_SECONDS))
+        self._min_dwell_s = float(params.get(CONF_CONTROL_MIN_DWELL_SECONDS,
+                                             DEFAULT_CONTROL_MIN_DWELL_SECONDS))
+        self._write_hysteresis_amps = int(params.get(CONF_CHARGER_WRITE_HYSTERESIS_AMPS,
+                                                     DEFAULT_WRITE_HYSTERESIS_AMPS))
+
+        self._reference: Optional[Signals] = None
+        self._pending_since: Optional[float] = None
+        self._last_write: Optional[float] = None
+        self._cancel_timer: Optional[CALLBACK_TYPE] = None
+        self._unsub_collector: Optional[CALLBACK_TYPE] = None
+        self._lock = asyncio.Lock()
+
+        self._power_kw: float = 0.0
+        self._setpoints_queued: int = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def power_level_kw(self) -> float:
+        """Return the last computed power level."""
+        return self._power_kw
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return reaction latency and write statistics."""
+        latencies = self._latencies
+        diagnostics = {
+            "setpoints_queued": self._setpoints_queued,
+            "reaction_latency_s": round(latencies[-1], 3) if latencies else None,
+            "reaction_latency_avg_s": (round(sum(latencies) / len(latencies), 3)
+                                       if latencies else None),
+            "reaction_latency_max_s": round(max(latencies), 3) if latencies else None,
+        }
+        charger = self._get_charger()
+        if charger is not None:
+            # The charger reports how many setpoints it actually wrote
+            diagnostics.update(charger.write_diagnostics)
+            diagnostics.update(charger.energy_diagnostics)
+        return diagnostics
+
+    @callback
+    def async_start(self) -> None:
+        """Begin reacting to collector snapshot changes."""
+        self.async_stop()
+        self._unsub_collector = self._collector.async_add_listener(self._handle_signals)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop reacting to changes and cancel any pending recompute."""
+        if self._unsub_collector is not None:
+            self._unsub_collector()
+            self._unsub_collector = None
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._pending_since = None
+
+    def _crossed_delta(self, signals: Signals) -> bool:
+        """Return True if signals moved far enough from the last reference."""
+        ref = self._reference
+        if ref is None:
+            return True
+        return (
+            abs(signals.solar_power_w - ref.solar_power_w) >= self._solar_delta_w
+            or abs(signals.house_load_total_w - ref.house_load_total_w) >= self._load_delta_w
+            or abs(signals.battery_soc_pct - ref.battery_soc_pct) >= self._soc_delta_pct
+            or signals.agate_inverter_on != ref.agate_inverter_on
+        )
+
+    @callback
+    def _handle_signals(self, signals: Signals) -> None:
+        """Schedule a recompute when a change crosses its delta."""
+        if not self._crossed_delta(signals):
+            return
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        if self._cancel_timer is not None:
+            # A recompute is already scheduled; it will read the latest snapshot
+            return
+
+        delay = self._debounce_s
+        if self._last_write is not None:
+            dwell_left = self._last_write + self._min_dwell_s - time.monotonic()
+            delay = max(delay, dwell_left)
+        self._cancel_timer = async_call_later(self.hass, max(delay, 0.0), self._timer_fired)
+
+    @callback
+    def _timer_fired(self, _now) -> None:
+        """Run the debounced recompute."""
+        self._cancel_timer = None
+        self.hass.async_create_task(self.async_run())
+
+    async def async_run(self, publish: bool = True,
+                        signals: Optional[Signals] = None) -> dict[str, Any]:
+        """Recompute the power level, write the setpoint and publish it.
+
+        Pass publish=False when the caller delivers the result itself, such
+        as a scheduled job, and signals to compute from a snapshot the caller
+        already took instead of reading the collector.
+        """
+        async with self._lock:
+            if signals is None:
+                signals = self._collector.get_signals()
+            self._collector.mark_clean()
+            self._reference = signals
+            self._power_kw = self._estimator.get_power_level(signals)
+
+            await self._async_write_setpoint(self._power_kw)
+
+            if self._pending_since is not None:
+                self._latencies.append(time.monotonic() - self._pending_since)
+                self._pending_since = None
+
+            data = {"power_level_kw": self._power_kw, **self.diagnostics}
+            if publish and self._on_update is not None:
+                self._on_update(data)
+            return data
+
+    def _get_charger(self):
+        """Return the configured EV charger service, if any."""
+        if self._service_manager is None:
+            return None
+        try:
+            return self._service_manager.get_service(ServiceType.EV_CHARGER_SERVICE)
+        except ValueError:
+            return None
+
+    async def _async_write_setpoint(self, power_kw: float) -> None:
+        """Push the setpoint to the configured EV charger service."""
+        charger = self._get_charger()
+        if charger is None:
+            _LOGGER.debug("No EV charger service configured; setpoint not written")
+            return
+
+        # Applied on every write so a charger swapped in by an options
+        # update uses it too
+        charger.write_hysteresis_amps = self._write_hysteresis_amps
+        await charger.set_charging_power_kw(power_kw)
+        self._last_write = time.monotonic()
+        self._setpoints_queued += 1
@@ -0,0 +1,143 @@
+"""Fixed-capacity time-series ring buffer with compact serialization."""
+
+import base64
+from collections.abc import Iterable, Iterator
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+def encode_array(arr: np.ndarray) -> str:
+    """Return the array's raw bytes as base64 text."""
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def decode_array(data: str, dtype: str) -> np.ndarray:
+    """Return a writable array decoded from encode_array() output."""
+    return np.frombuffer(base64.b64decode(data), dtype=dtype).copy()
+
+
+class RingBuffer:
+    """Array-backed history of float32 values with uint32 epoch-second timestamps.
+
+    Appending is O(1); once full, the oldest sample is overwritten. The
+    buffer serializes to a small dict holding base64 little-endian arrays,
+    so a store file grows with capacity rather than with uptime.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Allocate storage for `capacity` samples."""
+        if capacity <= 0:
+            raise ValueError("RingBuffer capacity must be positive")
+        self._values = np.zeros(capacity, dtype="<f4")
+        self._timestamps = np.zeros(capacity, dtype="<u4")
+        self._next = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples retained."""
+        return self._values.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values().tolist())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare sample values with another buffer or a plain sequence."""
+        if isinstance(other, RingBuffer):
+            return self.values().tolist() == other.values().tolist()
+        if isinstance(other, (list, tuple)):
+            return self.values().tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"RingBuffer(capacity={self.capacity}, count={self._count})"
+
+    def append(self, value: float, timestamp: Optional[float] = None) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._values[self._next] = value
+        self._timestamps[self._next] = int(time.time() if timestamp is None else timestamp)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, values: Iterable[float], timestamp: Optional[float] = None) -> None:
+        """Append several samples sharing one timestamp."""
+        for value in values:
+            self.append(value, timestamp)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._next = 0
+        self._count = 0
+
+    def _order(self) -> np.ndarray:
+        """Return storage indices in chronological order."""
+        start = (self._next - self._count) % self.capacity
+        return (start + np.arange(self._count)) % self.capacity
+
+    def values(self) -> np.ndarray:
+        """Return samples oldest-first as a float32 array."""
+        return self._values[self._order()]
+
+    def timestamps(self) -> np.ndarray:
+        """Return sample timestamps oldest-first as epoch seconds."""
+        return self._timestamps[self._order()]
+
+    def resize(self, capacity: int) -> "RingBuffer":
+        """Return a copy keeping the newest samples that fit in `capacity`."""
+        resized = RingBuffer(capacity)
+        order = self._order()[-capacity:]
+        count = order.size
+        resized._values[:count] = self._values[order]
+        resized._timestamps[:count] = self._timestamps[order]
+        resized._count = count
+        resized._next = count % capacity
+        return resized
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-friendly dict of base64 arrays."""
+        order = self._order()
+        return {
+            "format": FORMAT_VERSION,
+            "capacity": self.capacity,
+            "values": encode_array(self._values[order]),
+            "timestamps": encode_array(self._timestamps[order]),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], capacity: Optional[int] = None) -> "RingBuffer":
+        """Restore a buffer produced by to_dict(), optionally re-sizing it."""
+        values = decode_array(data["values"], "<f4")
+        timestamps = decode_array(data["timestamps"], "<u4")
+        buffer = cls(capacity or data.get("capacity") or max(values.size, 1))
+        keep = min(values.size, buffer.capacity)
+        if keep:
+            buffer._values[:keep] = values[-keep:]
+            buffer._timestamps[:keep] = timestamps[-keep:]
+        buffer._count = keep
+        buffer._next = keep % buffer.capacity
+        return buffer
+
+    @classmethod
+    def from_stored(cls, stored: Any, capacity: int) -> "RingBuffer":
+        """Build a buffer from stored data in either the current or legacy form.
+
+        Legacy stores kept plain JSON lists without timestamps; those samples
+        are stamped with the migration time.
+        """
+        if isinstance(stored, RingBuffer):
+            return stored if stored.capacity == capacity else stored.resize(capacity)
+        if isinstance(stored, dict) and "values" in stored:
+            return cls.from_dict(stored, capacity)
+        buffer = cls(capacity)
+        if isinstance(stored, list):
+            buffer.extend((float(v) for v in stored[-capacity:]), time.time())
+        return buffer
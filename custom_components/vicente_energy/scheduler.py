@@ -0,0 +1,235 @@
+"""Wall-clock aligned scheduler for the integration's periodic jobs."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Collection
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+import logging
+import math
+import time
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .models import Forecasts, Signals
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TickSnapshot:
+    """Inputs shared by every job that runs on one tick.
+
+    Signals are read once per tick. Forecasts are those of the latest
+    forecast refresh, including one made earlier in the same tick.
+    """
+    now: datetime
+    signals: Signals
+    forecasts: Optional[Forecasts] = None
+
+
+JobRunner = Callable[[TickSnapshot], Awaitable[Any]]
+
+
+@dataclass
+class _Job:
+    """A registered job with its publishing coordinator and timing stats."""
+    name: str
+    interval: timedelta
+    run: JobRunner
+    provides: Optional[str]
+    coordinator: DataUpdateCoordinator
+    compare_keys: Optional[frozenset[str]] = None
+    output: Any = None
+    runs: int = 0
+    changes: int = 0
+    failures: int = 0
+    last_ms: Optional[float] = None
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_error: Optional[str] = None
+
+
+def _changed(old: Any, new: Any) -> bool:
+    """Return True unless new equals old."""
+    try:
+        return bool(old != new)
+    except ValueError:
+        # Outputs holding numpy arrays compare element-wise; treat as changed
+        return True
+
+
+def _compared(output: Any, keys: Optional[frozenset[str]]) -> Any:
+    """Return the part of output that decides whether it changed."""
+    if keys is None or not isinstance(output, dict):
+        return output
+    return {key: value for key, value in output.items() if key in keys}
+
+
+class Scheduler:
+    """Run named jobs at several rates from one wall-clock aligned timer.
+
+    Ticks fall on multiples of the greatest common divisor of the job
+    intervals, counted from local midnight, so hourly jobs run on the hour
+    and minute jobs on the minute. The jobs due on a tick run in
+    registration order against one TickSnapshot. A job registered with
+    provides=<field> feeds its output into that snapshot field for the
+    jobs after it and for later ticks. Each job publishes through its own
+    DataUpdateCoordinator, whose listeners are only notified when the
+    job's output changed. A job registered with compare_keys is compared
+    on those keys of its dict output only; changes to the other keys, such
+    as diagnostics, are stored without notifying listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str,
+                 get_signals: Callable[[], Signals]) -> None:
+        """Create an empty scheduler reading signals through get_signals."""
+        self.hass = hass
+        self.name = name
+        self._get_signals = get_signals
+        self._jobs: dict[str, _Job] = {}
+        self._provided: dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._unsub_tick: Optional[CALLBACK_TYPE] = None
+        self._next_tick: Optional[datetime] = None
+
+    @property
+    def diagnostics(self) -> dict[str, dict[str, Any]]:
+        """Return per-job run counts and timings."""
+        return {
+            job.name: {
+                "interval_s": job.interval.total_seconds(),
+                "runs": job.runs,
+                "changes": job.changes,
+                "failures": job.failures,
+                "last_ms": job.last_ms,
+                "avg_ms": round(job.total_ms / job.runs, 1) if job.runs else None,
+                "max_ms": job.max_ms,
+                "last_error": job.last_error,
+            }
+            for job in self._jobs.values()
+        }
+
+    def add_job(self, name: str, interval: timedelta, run: JobRunner, *,
+                provides: Optional[str] = None,
+                coordinator_name: Optional[str] = None,
+                compare_keys: Optional[Collection[str]] = None) -> DataUpdateCoordinator:
+        """Register run to be called every interval; return its publishing coordinator.
+
+        interval must divide a day evenly. coordinator_name defaults to
+        "<scheduler name>_<job name>". compare_keys limits which keys of the
+        output notify listeners when they change.
+        """
+        if interval.total_seconds() < 1 or 86400 % int(interval.total_seconds()):
+            raise ValueError(f"Interval of job {name} must divide a day into whole seconds")
+        if provides is not None and provides not in TickSnapshot.__dataclass_fields__:
+            raise ValueError(f"Job {name} provides unknown snapshot field {provides}")
+        coordinator = DataUpdateCoordinator(
+            self.hass, _LOGGER, name=coordinator_name or f"{self.name}_{name}")
+        self._jobs[name] = _Job(name, interval, run, provides, coordinator,
+                                frozenset(compare_keys) if compare_keys is not None else None)
+        return coordinator
+
+    def coordinator(self, name: str) -> DataUpdateCoordinator:
+        """Return the coordinator publishing job name's output."""
+        return self._jobs[name].coordinator
+
+    @callback
+    def async_publish(self, name: str, output: Any) -> None:
+        """Publish output for job name from outside a tick, if it changed."""
+        self._async_update(self._jobs[name], output)
+
+    @callback
+    def _async_update(self, job: _Job, output: Any) -> None:
+        """Store a job's output, notifying listeners if its compared part changed."""
+        changed = _changed(_compared(job.output, job.compare_keys),
+                           _compared(output, job.compare_keys))
+        job.output = output
+        if changed:
+            job.changes += 1
+            job.coordinator.async_set_updated_data(output)
+        else:
+            job.coordinator.data = output
+
+    async def async_first_run(self) -> None:
+        """Run every job once, then start ticking.
+
+        Raises ConfigEntryNotReady if any job fails, as a coordinator's
+        first refresh would.
+        """
+        failed = await self.async_run_jobs()
+        if failed:
+            raise ConfigEntryNotReady(f"Scheduled jobs failed: {', '.join(failed)}")
+        self._schedule_next()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop ticking."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    async def async_run_jobs(self, *names: str, now: Optional[datetime] = None) -> list[str]:
+        """Run the named jobs, or all jobs, on one snapshot; return those that failed."""
+        jobs = [self._jobs[name] for name in names] if names else list(self._jobs.values())
+        async with self._lock:
+            return await self._async_run(jobs, now or dt_util.now())
+
+    async def async_run_due(self, now: datetime) -> list[str]:
+        """Run the jobs due at the tick boundary now; return those that failed."""
+        elapsed = round((now - dt_util.start_of_local_day(now)).total_seconds())
+        due = [job for job in self._jobs.values()
+               if elapsed % int(job.interval.total_seconds()) == 0]
+        async with self._lock:
+            return await self._async_run(due, now)
+
+    async def _async_run(self, jobs: list[_Job], now: datetime) -> list[str]:
+        snapshot = TickSnapshot(now=now, signals=self._get_signals(), **self._provided)
+        failed = []
+        for job in jobs:
+            started = time.monotonic()
+            try:
+                output = await job.run(snapshot)
+            except Exception as err:  # noqa: BLE001 - one failing job must not stop the others
+                job.failures += 1
+                job.last_error = repr(err)
+                failed.append(job.name)
+                _LOGGER.exception("Scheduled job %s failed", job.name)
+                continue
+            elapsed_ms = round((time.monotonic() - started) * 1000.0, 1)
+            job.runs += 1
+            job.last_ms = elapsed_ms
+            job.total_ms += elapsed_ms
+            job.max_ms = max(job.max_ms, elapsed_ms)
+            job.last_error = None
+
+            if job.provides is not None:
+                self._provided[job.provides] = output
+                snapshot = replace(snapshot, **{job.provides: output})
+            self._async_update(job, output)
+        return failed
+
+    def _tick_seconds(self) -> int:
+        return math.gcd(*(int(job.interval.total_seconds()) for job in self._jobs.values()))
+
+    def _schedule_next(self) -> None:
+        """Arm the timer for the next tick boundary after now."""
+        if not self._jobs:
+            return
+        now = dt_util.now()
+        midnight = dt_util.start_of_local_day(now)
+        step = self._tick_seconds()
+        ticks = math.floor((now - midnight).total_seconds() / step) + 1
+        self._next_tick = midnight + timedelta(seconds=ticks * step)
+        self._unsub_tick = async_track_point_in_time(self.hass, self._handle_tick, self._next_tick)
+
+    @callback
+    def _handle_tick(self, _fired: datetime) -> None:
+        tick = self._next_tick
+        self._schedule_next()
+        self.hass.async_create_background_task(
+            self.async_run_due(tick), f"{self.name} scheduled jobs")
@@ -1,24 +1,45 @@
 """Sensor entity implementations for Vicente Energy."""
 
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import Any, Optional
+
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import ENERGY_KILO_WATT_HOUR, POWER_KILO_WATT
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-DOMAIN = "vicente_energy"
+from .const import (
+    BUDGET_FIELDS,
+    CONF_LOCATION_NAME,
+    CONF_LOCATION_NAME_ENTITY,
+    CONF_SENSOR_DEADBANDS,
+    DEFAULT_SENSOR_MAX_SILENCE_SECONDS,
+    DOMAIN,
+)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Vicente Energy sensor entities from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
+    overrides = entry.options.get(CONF_SENSOR_DEADBANDS, entry.data.get(CONF_SENSOR_DEADBANDS, {}))
     sensors = [
-        Budget24hSensor(data["hourly_coordinator"]),
-        PowerLevelSensor(data["minute_coordinator"]),
+        Budget24hSensor(data["scheduler"].coordinator("budget")),
+        PowerLevelSensor(data["scheduler"].coordinator("power_control")),
         SessionStartTimeSensor(data["session"]),
         SessionDurationSensor(data["session"]),
         SessionEnergyUsedSensor(data["session"]),
         AvailableAfterSensor(data["session"]),
         ChargeStateSensor(data["session"])
     ]
+    for sensor in sensors:
+        if sensor.deadband_key in overrides:
+            sensor.deadband = Deadband.from_config(overrides[sensor.deadband_key])
+    # Their write counters are reported by the diagnostics platform
+    data["deadband_sensors"] = list(sensors)
     # Add location name sensor if provided
     loc_name = entry.options.get(CONF_LOCATION_NAME, entry.data.get(CONF_LOCATION_NAME))
     if loc_name:
@@ -28,6 +49,118 @@ async def async_setup_entry(hass, entry, async_add_entities):
         hass.data[DOMAIN][entry.entry_id][CONF_LOCATION_NAME_ENTITY] = location_sensor
     async_add_entities(sensors, True)
 
+
+@dataclass(frozen=True)
+class Deadband:
+    """How far a sensor's value must move before a new state is written.
+
+    A numeric value is written once it moves more than the larger of the
+    absolute band and the relative band times the last written value. Any
+    other value is written whenever it changes. A value within the band is
+    still written if nothing was written for max_silence.
+    """
+    absolute: float = 0.0
+    relative: float = 0.0
+    max_silence: timedelta = timedelta(seconds=DEFAULT_SENSOR_MAX_SILENCE_SECONDS)
+
+    @classmethod
+    def from_config(cls, conf: dict[str, Any]) -> "Deadband":
+        """Build a deadband from an options mapping."""
+        return cls(
+            absolute=float(conf.get("absolute", 0.0)),
+            relative=float(conf.get("relative", 0.0)),
+            max_silence=timedelta(seconds=float(conf.get("max_silence_seconds",
+                                                         DEFAULT_SENSOR_MAX_SILENCE_SECONDS))),
+        )
+
+    def crossed(self, last: Any, value: Any) -> bool:
+        """Return True if value is far enough from last to be written."""
+        numeric = (int, float)
+        if not isinstance(last, numeric) or not isinstance(value, numeric) \
+                or isinstance(last, bool) or isinstance(value, bool):
+            return value != last
+        return abs(value - last) > max(self.absolute, self.relative * abs(last))
+
+
+class DeadbandSensor:
+    """Write a sensor's state only when it crosses its deadband.
+
+    Subclasses set deadband_key, used to look up per-sensor overrides, and a
+    default deadband. Updates call async_write_if_changed instead of
+    async_write_ha_state, and the writes made and avoided are counted.
+    Attributes returned by deadband_attributes are written whenever they
+    change. Once added to Home Assistant, a timer writes the state again
+    after max_silence without writes.
+    """
+
+    deadband_key: str = ""
+    deadband: Deadband = Deadband()
+
+    _deadband_last: Any = None
+    _deadband_last_attributes: Any = None
+    _deadband_written_at: Optional[float] = None
+    _deadband_cancel_silence: Optional[CALLBACK_TYPE] = None
+    deadband_writes: int = 0
+    deadband_writes_avoided: int = 0
+
+    @property
+    def deadband_attributes(self) -> Any:
+        """Return the attribute values that are written whenever they change."""
+        return None
+
+    @property
+    def deadband_stats(self) -> dict[str, int]:
+        """Return the numbers of state writes made and avoided."""
+        return {
+            "writes": self.deadband_writes,
+            "writes_avoided": self.deadband_writes_avoided,
+        }
+
+    @callback
+    def async_write_if_changed(self, force: bool = False) -> bool:
+        """Write the state if it crossed the deadband or max silence elapsed."""
+        value = self.state
+        attributes = self.deadband_attributes
+        now = time.monotonic()
+        written_at = self._deadband_written_at
+        if (not force and written_at is not None
+                and now - written_at < self.deadband.max_silence.total_seconds()
+                and not self.deadband.crossed(self._deadband_last, value)
+                and attributes == self._deadband_last_attributes):
+            self.deadband_writes_avoided += 1
+            return False
+        self._deadband_last = value
+        self._deadband_last_attributes = attributes
+        self._deadband_written_at = now
+        self.deadband_writes += 1
+        self.async_write_ha_state()
+        self._async_arm_silence_timer()
+        return True
+
+    @callback
+    def _async_arm_silence_timer(self) -> None:
+        """Schedule a write for when max_silence passes without one."""
+        if self._deadband_cancel_silence is not None:
+            self._deadband_cancel_silence()
+            self._deadband_cancel_silence = None
+        if getattr(self, "hass", None) is None:
+            return
+        self._deadband_cancel_silence = async_call_later(
+            self.hass, self.deadband.max_silence, self._async_silence_elapsed)
+
+    @callback
+    def _async_silence_elapsed(self, _now) -> None:
+        self._deadband_cancel_silence = None
+        self.async_write_if_changed(force=True)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the max-silence write."""
+        if self._deadband_cancel_silence is not None:
+            self._deadband_cancel_silence()
+            self._deadband_cancel_silence = None
+        await super().async_will_remove_from_hass()
+
+
 class LocationNameSensor(SensorEntity):
     """Sensor to expose the configured location name."""
 
@@ -52,10 +185,14 @@ class LocationNameSensor(SensorEntity):
         """Update the stored location name (called on config changes)."""
         self._location_name = name or ""
 
-class Budget24hSensor(CoordinatorEntity):
+class Budget24hSensor(DeadbandSensor, CoordinatorEntity):
     """Sensor showing the 24‑hour charging budget."""
+
+    deadband_key = "budget_24h_kwh"
+    deadband = Deadband(absolute=0.05)
+
     def __init__(self, coordinator):
-        """Initialize with the hourly coordinator."""
+        """Initialize with the budget job's coordinator."""
         super().__init__(coordinator)
         self._attr_name = "Vicente Energy 24h Budget"
         self._attr_unit_of_measurement = ENERGY_KILO_WATT_HOUR
@@ -65,16 +202,40 @@ class Budget24hSensor(CoordinatorEntity):
         """Return the rounded 24‑hour budget."""
         return round(self.coordinator.data.get("budget_24h_kwh", 0.0), 3)
 
+    @property
+    def deadband_attributes(self) -> dict[str, Any]:
+        """Return the schedules and budget quantiles, leaving out diagnostics."""
+        data = self.coordinator.data or {}
+        return {key: data.get(key) for key in BUDGET_FIELDS if key != "budget_24h_kwh"}
+
+    @property
+    def extra_state_attributes(self):
+        """Return the hourly charge schedule (kW), cost-optimal plan and budget quantiles.
+
+        Diagnostics in the same payload change every tick and are reported
+        by the diagnostics platform instead, so they add no recorder rows.
+        """
+        return self.deadband_attributes
+
     @property
     def unique_id(self):
         """Return a unique identifier for the sensor."""
         # Use the coordinator's name (which is typically the entry_id or alias) to form a stable unique_id
         return f"{getattr(self.coordinator, 'name', 'vicente_energy')}_budget_24h_kwh"
 
-class PowerLevelSensor(CoordinatorEntity):
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new budget only if it moved past the deadband."""
+        self.async_write_if_changed()
+
+class PowerLevelSensor(DeadbandSensor, CoordinatorEntity):
     """Sensor showing current charging power level."""
+
+    deadband_key = "power_level_kw"
+    deadband = Deadband(absolute=0.05, relative=0.02)
+
     def __init__(self, coordinator):
-        """Initialize with the minute coordinator."""
+        """Initialize with the power control job's coordinator."""
         super().__init__(coordinator)
         self._attr_name = "Vicente Energy Power Level"
         self._attr_unit_of_measurement = POWER_KILO_WATT
@@ -89,12 +250,44 @@ class PowerLevelSensor(CoordinatorEntity):
         """Return a unique identifier for the sensor."""
         return f"{getattr(self.coordinator, 'name', 'vicente_energy')}_power_level_kw"
 
-class SessionStartTimeSensor(CoordinatorEntity):
-    """Sensor showing when the current charging session began."""
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new power level only if it moved past the deadband."""
+        self.async_write_if_changed()
+
+class SessionSensor(DeadbandSensor, SensorEntity):
+    """Base for sensors pushed by the session manager's update signal.
+
+    The sensor is written when a signal's delta names one of its
+    session_fields, subject to its deadband; it is never polled.
+    """
+
+    _attr_should_poll = False
+    session_fields: tuple[str, ...] = ()
 
     def __init__(self, session):
         """Initialize sensor with the session manager."""
         self._session = session
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the entry's session updates."""
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, self._session.signal, self._handle_session_delta))
+
+    @callback
+    def _handle_session_delta(self, delta: dict[str, Any]) -> None:
+        if any(name in delta for name in self.session_fields):
+            self.async_write_if_changed()
+
+class SessionStartTimeSensor(SessionSensor):
+    """Sensor showing when the current charging session began."""
+
+    deadband_key = "session_start_time"
+    session_fields = ("session_start_time",)
+
+    def __init__(self, session):
+        """Initialize sensor with the session manager."""
+        super().__init__(session)
         self._attr_name = "Vicente Energy Session Start Time"
 
     @property
@@ -103,11 +296,15 @@ class SessionStartTimeSensor(CoordinatorEntity):
         ts = self._session.session_start_time
         return ts.isoformat() if ts else None
 
-class SessionDurationSensor(CoordinatorEntity):
+class SessionDurationSensor(SessionSensor):
     """Sensor showing the duration of the current session."""
+
+    deadband_key = "session_duration"
+    session_fields = ("session_duration",)
+
     def __init__(self, session):
         """Initialize sensor with the session manager."""
-        self._session = session
+        super().__init__(session)
         self._attr_name = "Vicente Energy Session Duration"
 
     @property
@@ -115,11 +312,16 @@ class SessionDurationSensor(CoordinatorEntity):
         """Return the duration of the charging session in minutes."""
         return int(self._session.session_duration.total_seconds() / 60) if self._session.session_duration else 0
 
-class SessionEnergyUsedSensor(CoordinatorEntity):
+class SessionEnergyUsedSensor(SessionSensor):
     """Sensor showing energy used in the current session."""
+
+    deadband_key = "session_kwh_used"
+    deadband = Deadband(absolute=0.01)
+    session_fields = ("session_kwh_used",)
+
     def __init__(self, session):
         """Initialize sensor with the session manager."""
-        self._session = session
+        super().__init__(session)
         self._attr_name = "Vicente Energy Session kWh Used"
         self._attr_unit_of_measurement = ENERGY_KILO_WATT_HOUR
 
@@ -128,11 +330,16 @@ class SessionEnergyUsedSensor(CoordinatorEntity):
         """Return energy used so far in the session."""
         return round(self._session.session_kwh_used, 3)
 
-class AvailableAfterSensor(CoordinatorEntity):
+class AvailableAfterSensor(SessionSensor):
     """Sensor for kWh available after session completion."""
+
+    deadband_key = "available_after_kwh"
+    deadband = Deadband(absolute=0.05)
+    session_fields = ("session_available_after",)
+
     def __init__(self, session):
         """Initialize sensor with the session manager."""
-        self._session = session
+        super().__init__(session)
         self._attr_name = "Vicente Energy kWh Available After"
         self._attr_unit_of_measurement = ENERGY_KILO_WATT_HOUR
 
@@ -141,11 +348,15 @@ class AvailableAfterSensor(CoordinatorEntity):
         """Return forecasted battery energy after session completes."""
         return round(self._session.session_available_after, 3)
 
-class ChargeStateSensor(CoordinatorEntity):
+class ChargeStateSensor(SessionSensor):
     """Sensor reflecting the charging session state."""
+
+    deadband_key = "charge_state"
+    session_fields = ("charge_state",)
+
     def __init__(self, session):
         """Initialize sensor with the session manager."""
-        self._session = session
+        super().__init__(session)
         self._attr_name = "Vicente Energy Charge State"
 
     @property
@@ -9,7 +9,7 @@ class Budget24hSensor(SensorEntity):
     """Expose the 24‑hour energy budget from the coordinator."""
 
     def __init__(self, coordinator):
-        """Initialize with the hourly coordinator."""
+        """Initialize with the budget job's coordinator."""
         self.coordinator = coordinator
 
     @property
@@ -31,7 +31,7 @@ class PowerLevelSensor(SensorEntity):
     """Expose the instantaneous power level from the coordinator."""
 
     def __init__(self, coordinator):
-        """Initialize with the minute coordinator."""
+        """Initialize with the power control job's coordinator."""
         self.coordinator = coordinator
 
     @property
@@ -51,12 +51,11 @@ class PowerLevelSensor(SensorEntity):
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Vicente Energy sensors via config entry."""
-    hourly_coordinator = hass.data[DOMAIN][entry.entry_id]["hourly_coordinator"]
-    minute_coordinator = hass.data[DOMAIN][entry.entry_id]["minute_coordinator"]
+    scheduler = hass.data[DOMAIN][entry.entry_id]["scheduler"]
 
     sensors = [
-        Budget24hSensor(hourly_coordinator),
-        PowerLevelSensor(minute_coordinator),
+        Budget24hSensor(scheduler.coordinator("budget")),
+        PowerLevelSensor(scheduler.coordinator("power_control")),
     ]
 
     async_add_entities(sensors, True)
@@ -15,14 +15,7 @@ async def async_register_services(hass, domain, session_manager, state_manager):
     async def handle_reset_history(call):
         """Clear stored biases and history."""
         # Reset all bias and history data
-        state_manager.data["solar_bias"] = 0.0
-        state_manager.data["load_bias"] = 0.0
-        state_manager.data["session_bias"] = 0.0
-        state_manager.data["last_session_kwh"] = 0.0
-        state_manager.data["last_raw_session_kwh"] = None
-        state_manager.data["forecast_error_history"] = {"solar_errors": [], "load_errors": []}
-        state_manager.data["session_bias_history"] = []
-        await state_manager.async_save()
+        await state_manager.reset_history()
 
     hass.services.async_register(domain, "set_power_level", handle_set_power)
     hass.services.async_register(domain, "reset_history", handle_reset_history)
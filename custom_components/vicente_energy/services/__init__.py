@@ -1,28 +1,14 @@
+"""Expose available service classes and service type mappings.
 
-"""Expose available service classes and service type mappings."""
-
-# Explicitly import service classes for easy external access
+Vendor modules are imported on first lookup rather than with the package,
+so setting up an entry only loads the vendors it is configured to use.
+"""
 
+from collections.abc import Iterator, Mapping
 from enum import StrEnum, auto
+import importlib
 
-from .chargepoint import ChargepointEVChargerService
-from .default import (
-    DefaultBatteryService,
-    DefaultEVChargerService,
-    DefaultForecastService,
-    DefaultGridService,
-    DefaultSolarService,
-)
-from .forecast_solar import ForecastSolarService
-from .franklin import (
-    FranklinBatteryService,
-    FranklinGridService,
-    FranklinSolarService,
-)
-from .solaredge import SolarEdgeSolarService
-from .solcast import SolcastService
-from .tesla import PowerwallBatteryService
-from .wallbox import WallboxEVChargerService
+from homeassistant.core import HomeAssistant
 
 
 class ServiceType(StrEnum):
@@ -33,29 +19,87 @@ class ServiceType(StrEnum):
     GRID_SERVICE = auto()
     FORECAST_SERVICE = auto()
 
-SERVICE_CLASS_MAP = {
+# "<module relative to this package>:<class name>" for every service
+SERVICE_CLASS_PATHS: dict[ServiceType, dict[str, str]] = {
     ServiceType.EV_CHARGER_SERVICE: {
-        "wallbox": WallboxEVChargerService,
-        "chargepoint": ChargepointEVChargerService,
-        "default": DefaultEVChargerService,
+        "wallbox": ".wallbox:WallboxEVChargerService",
+        "chargepoint": ".chargepoint:ChargepointEVChargerService",
+        "default": ".default:DefaultEVChargerService",
     },
     ServiceType.BATTERY_SERVICE: {
-        "franklin": FranklinBatteryService,
-        "powerwall": PowerwallBatteryService,
-        "default": DefaultBatteryService,
+        "franklin": ".franklin:FranklinBatteryService",
+        "franklin_api": ".franklin:FranklinApiBatteryService",
+        "powerwall": ".tesla:PowerwallBatteryService",
+        "powerwall_local": ".tesla:PowerwallLocalBatteryService",
+        "default": ".default:DefaultBatteryService",
     },
     ServiceType.SOLAR_SERVICE: {
-        "franklin": FranklinSolarService,
-        "solaredge": SolarEdgeSolarService,
-        "default": DefaultSolarService,
+        "franklin": ".franklin:FranklinSolarService",
+        "franklin_api": ".franklin:FranklinApiSolarService",
+        "solaredge": ".solaredge:SolarEdgeSolarService",
+        "solaredge_modbus": ".solaredge:SolarEdgeModbusSolarService",
+        "powerwall_local": ".tesla:PowerwallLocalSolarService",
+        "default": ".default:DefaultSolarService",
     },
     ServiceType.GRID_SERVICE: {
-        "franklin": FranklinGridService,
-        "default": DefaultGridService,
+        "franklin": ".franklin:FranklinGridService",
+        "franklin_api": ".franklin:FranklinApiGridService",
+        "powerwall_local": ".tesla:PowerwallLocalGridService",
+        "default": ".default:DefaultGridService",
     },
     ServiceType.FORECAST_SERVICE: {
-        "solcast": SolcastService,
-        "forecast.solar": ForecastSolarService,
-        "default": DefaultForecastService,
+        "solcast": ".solcast:SolcastService",
+        "forecast.solar": ".forecast_solar:ForecastSolarService",
+        "default": ".default:DefaultForecastService",
     },
 }
+
+
+def _import_class(path: str) -> type:
+    """Import the module named in path and return its class."""
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+class _LazyServiceClasses(Mapping[str, type]):
+    """Service name to class mapping that imports each class on first lookup."""
+
+    def __init__(self, paths: dict[str, str]) -> None:
+        self._paths = paths
+        self._classes: dict[str, type] = {}
+
+    def __getitem__(self, name: str) -> type:
+        service_class = self._classes.get(name)
+        if service_class is None:
+            service_class = self._classes[name] = _import_class(self._paths[name])
+        return service_class
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+SERVICE_CLASS_MAP: dict[ServiceType, Mapping[str, type]] = {
+    service_type: _LazyServiceClasses(paths)
+    for service_type, paths in SERVICE_CLASS_PATHS.items()
+}
+
+
+async def async_import_service_classes(hass: HomeAssistant, service_ids: dict[ServiceType, str]) -> None:
+    """Import the modules of the selected services off the event loop.
+
+    Unknown names are skipped; the service manager reports them when it
+    binds the services.
+    """
+    selected = [
+        (ServiceType(service_type), name) for service_type, name in service_ids.items()
+        if name in SERVICE_CLASS_PATHS.get(ServiceType(service_type), {})
+    ]
+
+    def _import_selected() -> None:
+        for service_type, name in selected:
+            SERVICE_CLASS_MAP[service_type][name]  # noqa: B018 - imports on lookup
+
+    await hass.async_add_import_executor_job(_import_selected)
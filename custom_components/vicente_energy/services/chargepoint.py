@@ -2,14 +2,15 @@
 
 import logging
 
+from homeassistant.const import UnitOfElectricCurrent
 from homeassistant.core import HomeAssistant, State
 
 from .ev_charger_service import (
     EVChargerService,
     EVChargerState,
     convert_amps_to_kw,
-    convert_kw_to_amps,
 )
+from .discovery import EntityRole
 from .service import VEEntityStateChangeHandler
 
 CHARGEPOINT_STATE_MAP = {
@@ -25,42 +26,43 @@ CHARGEPOINT_STATE_MAP = {
 
 _LOGGER = logging.getLogger(__name__)
 
+CHARGEPOINT_PLATFORM = "chargepoint"
+
 class ChargepointEVChargerService(EVChargerService):
     """Interact with a ChargePoint charger via Home Assistant sensors."""
 
+    _discovery_platform = CHARGEPOINT_PLATFORM
+    _entity_roles = {
+        "power_output": EntityRole("select", ("power_output",), "select.cph25_power_output"),
+        "charging_status": EntityRole("sensor", ("charging_status",), "sensor.cph25_charging_status"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         """Set up entity handlers for ChargePoint sensors."""
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "select.cph25_power_output": self._handle_power_change,
-            "sensor.cph25_charging_status": self._handle_charger_state_change,
+            "power_output": self._handle_power_change,
+            "charging_status": self._handle_charger_state_change,
         }
         super().__init__(hass, handlers)
         self._max_charging_power_amps = 32
 
-    async def set_charging_power_amps(self, power_amps: int) -> None:
-        """Set charging current in amps via Home Assistant service."""
+    async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+        """Set charging current in amps; errors reach the base class, which retries."""
         _LOGGER.debug("Setting charging power to %.2f kW (%.1f A)",
                       convert_amps_to_kw(power_amps, self._voltage), power_amps)
 
-        try:
-            await self._hass.services.async_call(
-                "number",
-                "set_value",
-                {
-                    "entity_id": "select.cph25_power_output",
-                    "value": round(power_amps)
-                },
-                blocking = True
-            )
-            _LOGGER.debug("Wallbox charging power changed: %.2f kW", power_amps)
-        except ValueError:
-            _LOGGER.debug("Unable to change Wallbox charging power value: %.2f kW", power_amps)
-
-    async def set_charging_power_kw(self, power_kw: float) -> None:
-        """Set charging power in kW via helper that converts to amps."""
-        await self.set_charging_power_amps(convert_kw_to_amps(power_kw, self._voltage))
-
+        await self._hass.services.async_call(
+            "number",
+            "set_value",
+            {
+                "entity_id": self._entities.get(
+                    "power_output", self._entity_roles["power_output"].default),
+                "value": round(power_amps)
+            },
+            blocking = True
+        )
+        _LOGGER.debug("Wallbox charging power changed: %.2f kW", power_amps)
 
     def _handle_charger_state_change(self, entity_id: str,
                                      old_state: State, new_state: State) -> bool:
@@ -82,10 +84,10 @@ class ChargepointEVChargerService(EVChargerService):
 
     def _handle_power_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
         """Handle updates to the charging power sensor."""
-        try:
-            value = convert_amps_to_kw(int(new_state.state), self._voltage)
-        except ValueError:
-            _LOGGER.debug("Ignoring bad charging power value: %s", new_state.state.lower())
+        amps = self._parse_state(new_state, UnitOfElectricCurrent.AMPERE)
+        value = None if amps is None else convert_amps_to_kw(amps, self._voltage)
+        self._record_power_sample(new_state, value)
+        if value is None:
             return False
 
         if self._charging_power_kw == value:
@@ -0,0 +1,61 @@
+"""Today's energy from a device's lifetime energy counters."""
+
+from datetime import date
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+STORAGE_VERSION = 1
+SAVE_DELAY_SECONDS = 10.0
+
+
+class DailyEnergyCounters:
+    """Turn lifetime counters into the energy since the local day started.
+
+    The counter values at the first reading of each local day are stored,
+    so a restart during the day keeps counting from the same baseline
+    instead of starting today's energy again from zero. A counter that
+    goes backwards was reset on the device and starts a new baseline.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Use the storage document named after the device client."""
+        self._store = Store(hass, STORAGE_VERSION, f"vicente_energy_{name}_day_start")
+        self._loaded = False
+        self._day: Optional[date] = None
+        self._start: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Restore the stored baselines; later calls do nothing."""
+        if self._loaded:
+            return
+        self._loaded = True
+        stored = await self._store.async_load()
+        if stored:
+            self._day = date.fromisoformat(stored["day"])
+            self._start = dict(stored["start"])
+
+    @callback
+    def reset(self) -> None:
+        """Forget the baselines, e.g. when the client points at another device."""
+        # The stored baselines belong to the previous device
+        self._loaded = True
+        self._day = None
+        self._start.clear()
+
+    @callback
+    def today(self, key: str, lifetime: float, day: date) -> float:
+        """Return lifetime minus the counter's value at the start of day."""
+        if day != self._day:
+            self._day = day
+            self._start.clear()
+        start = self._start.get(key)
+        if start is None or lifetime < start:
+            start = self._start[key] = lifetime
+            self._store.async_delay_save(self._data, SAVE_DELAY_SECONDS)
+        return lifetime - start
+
+    @callback
+    def _data(self) -> dict[str, Any]:
+        return {"day": self._day.isoformat(), "start": dict(self._start)}
@@ -20,6 +20,9 @@ class DefaultEVChargerService(EVChargerService):
     async def set_charging_power_kw(self, power_kw: float) -> None:
         self._charging_power_kw = power_kw
 
+    async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+        self._charging_power_kw = convert_amps_to_kw(power_amps)
+
 class DefaultBatteryService(BatteryService):
     """Battery service with no external API."""
 
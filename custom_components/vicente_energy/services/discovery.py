@@ -0,0 +1,182 @@
+"""Registry-backed discovery of vendor entities shared by all services."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY = "vicente_energy_entity_discovery"
+
+
+@dataclass(frozen=True)
+class EntityRole:
+    """How to recognize the entity that fills one role of a vendor service.
+
+    keys are tried in order against the registry entry's translation_key,
+    the end of its unique_id and the end of its entity_id, so a role still
+    resolves after the device or entity is renamed. default is used when no
+    registry entry matches (e.g. entities defined in YAML).
+    """
+
+    domain: str
+    keys: tuple[str, ...]
+    default: Optional[str] = None
+
+    def rank(self, entry: er.RegistryEntry) -> Optional[int]:
+        """Return the index of the first key entry matches, or None."""
+        unique_id = str(entry.unique_id)
+        for rank, key in enumerate(self.keys):
+            if (entry.translation_key == key
+                    or unique_id.endswith(key)
+                    or entry.entity_id.endswith(f"_{key}")):
+                return rank
+        return None
+
+
+@callback
+def async_get_discovery(hass: HomeAssistant) -> "EntityDiscovery":
+    """Return the discovery index shared by every service and config entry."""
+    discovery = hass.data.get(DATA_DISCOVERY)
+    if discovery is None:
+        discovery = hass.data[DATA_DISCOVERY] = EntityDiscovery(hass)
+    return discovery
+
+
+class EntityDiscovery:
+    """Index registry entries by integration platform and entity domain.
+
+    The entity registry is read once; afterwards the index is kept current
+    from entity registry update events, one entry at a time. Resolved role
+    maps are cached per platform and dropped only when an entry of that
+    platform changes, or when a device changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index; it is built on first use."""
+        self.hass = hass
+        # platform → domain → entity_ids, in registry order
+        self._index: Optional[dict[str, dict[str, dict[str, None]]]] = None
+        self._platform_of: dict[str, str] = {}
+        self._resolved: dict[tuple, dict[str, str]] = {}
+        self._index_builds = 0
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return index and cache sizes."""
+        return {
+            "indexed_entities": len(self._platform_of),
+            "indexed_platforms": len(self._index or {}),
+            "cached_resolutions": len(self._resolved),
+            "index_builds": self._index_builds,
+        }
+
+    def _ensure_index(self) -> dict[str, dict[str, dict[str, None]]]:
+        """Build the platform index from the entity registry once."""
+        if self._index is not None:
+            return self._index
+
+        self._index = {}
+        for entry in er.async_get(self.hass).entities.values():
+            self._add(entry)
+        self._index_builds += 1
+        _LOGGER.debug("Indexed %d registry entities across %d platforms",
+                      len(self._platform_of), len(self._index))
+
+        self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry_updated)
+        self.hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._handle_device_registry_updated)
+        return self._index
+
+    def _add(self, entry: er.RegistryEntry) -> None:
+        self._index.setdefault(entry.platform, {}).setdefault(entry.domain, {})[entry.entity_id] = None
+        self._platform_of[entry.entity_id] = entry.platform
+
+    def _remove(self, entity_id: str) -> Optional[str]:
+        platform = self._platform_of.pop(entity_id, None)
+        if platform is not None:
+            domain = entity_id.split(".", 1)[0]
+            self._index.get(platform, {}).get(domain, {}).pop(entity_id, None)
+        return platform
+
+    def _invalidate(self, platform: Optional[str]) -> None:
+        """Drop cached role maps for platform."""
+        if platform is None:
+            return
+        self._resolved = {key: value for key, value in self._resolved.items() if key[0] != platform}
+
+    @callback
+    def _handle_entity_registry_updated(self, event: Event) -> None:
+        """Re-index the one entry the event is about."""
+        entity_id = event.data["entity_id"]
+        self._invalidate(self._remove(event.data.get("old_entity_id", entity_id)))
+        self._invalidate(self._remove(entity_id))
+        if event.data["action"] != "remove":
+            entry = er.async_get(self.hass).async_get(entity_id)
+            if entry is not None:
+                self._add(entry)
+                self._invalidate(entry.platform)
+
+    @callback
+    def _handle_device_registry_updated(self, event: Event) -> None:
+        """Device renames or disables can change which entities a role resolves to."""
+        self._resolved.clear()
+
+    @callback
+    def async_entity_ids(self, platform: str, domain: str) -> list[str]:
+        """Return the indexed entity IDs of one platform and domain."""
+        return list(self._ensure_index().get(platform, {}).get(domain, ()))
+
+    @callback
+    def async_resolve(self, platform: str, roles: Mapping[str, EntityRole]) -> dict[str, str]:
+        """Return role → entity_id for the roles platform provides.
+
+        Only the platform's entries in each role's domain are examined.
+        Roles prefer entities on the same device as the first resolved role,
+        so a second charger or inverter cannot be mixed into the map. Roles
+        with no match fall back to their default, or are left out.
+        """
+        cache_key = (platform, tuple(roles.items()))
+        resolved = self._resolved.get(cache_key)
+        if resolved is not None:
+            return dict(resolved)
+
+        domains = self._ensure_index().get(platform, {})
+        entity_registry = er.async_get(self.hass)
+        device_registry = dr.async_get(self.hass)
+
+        resolved = {}
+        anchor_device: Optional[str] = None
+        for role_name, role in roles.items():
+            best: Optional[tuple[bool, int]] = None
+            best_device: Optional[str] = None
+            for entity_id in domains.get(role.domain, ()):
+                entry = entity_registry.async_get(entity_id)
+                if entry is None or entry.disabled_by is not None:
+                    continue
+                if entry.device_id is not None:
+                    device = device_registry.async_get(entry.device_id)
+                    if device is not None and device.disabled:
+                        continue
+                rank = role.rank(entry)
+                if rank is None:
+                    continue
+                # Other devices sort after the anchor device, then key order decides
+                score = (anchor_device is not None and entry.device_id != anchor_device, rank)
+                if best is None or score < best:
+                    best = score
+                    resolved[role_name] = entity_id
+                    best_device = entry.device_id
+            if best is not None:
+                anchor_device = anchor_device or best_device
+            elif role.default is not None:
+                resolved[role_name] = role.default
+
+        self._resolved[cache_key] = resolved
+        return dict(resolved)
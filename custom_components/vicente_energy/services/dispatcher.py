@@ -0,0 +1,152 @@
+"""Integration-wide state change dispatcher shared by all services."""
+
+from collections import Counter
+from collections.abc import Callable
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .service import VEEntityStateChangeHandler
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = "vicente_energy_state_dispatcher"
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> "StateChangeDispatcher":
+    """Return the dispatcher shared by every service and config entry."""
+    dispatcher = hass.data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = StateChangeDispatcher(hass)
+    return dispatcher
+
+
+class StateChangeDispatcher:
+    """Route state changes to service handlers through one event subscription.
+
+    Handlers are kept in a single entity_id index. Events whose state did
+    not change are dropped before any handler runs, unless the entity was
+    registered with attributes=True. Changes arriving within one event loop
+    iteration are batched: each entity is dispatched once with its first old
+    state and latest new state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty handler index."""
+        self.hass = hass
+        self._handlers: dict[str, list[VEEntityStateChangeHandler]] = {}
+        self._attribute_entities: Counter[str] = Counter()
+        self._unsub_tracker: Optional[CALLBACK_TYPE] = None
+        self._pending: dict[str, tuple[Optional[State], Optional[State]]] = {}
+        self._flush_scheduled = False
+
+        self._received: Counter[str] = Counter()
+        self._dropped: Counter[str] = Counter()
+        self._coalesced: Counter[str] = Counter()
+        self._dispatched: Counter[str] = Counter()
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the entities with at least one handler."""
+        return list(self._handlers)
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return per-entity event counters."""
+        return {
+            entity_id: {
+                "received": self._received[entity_id],
+                "dropped_unchanged": self._dropped[entity_id],
+                "coalesced": self._coalesced[entity_id],
+                "dispatched": self._dispatched[entity_id],
+                "handlers": len(handlers),
+            }
+            for entity_id, handlers in self._handlers.items()
+        }
+
+    @callback
+    def async_register(self, entity_id: str, handler: VEEntityStateChangeHandler,
+                       attributes: bool = False) -> Callable[[], None]:
+        """Add a handler for entity_id and return a function that removes it.
+
+        With attributes=True, attribute-only changes are dispatched as well.
+        """
+        handlers = self._handlers.setdefault(entity_id, [])
+        handlers.append(handler)
+        if attributes:
+            self._attribute_entities[entity_id] += 1
+        if len(handlers) == 1:
+            self._resubscribe()
+
+        @callback
+        def remove() -> None:
+            registered = self._handlers.get(entity_id)
+            if registered is None or handler not in registered:
+                return
+            registered.remove(handler)
+            if attributes:
+                self._attribute_entities[entity_id] -= 1
+                if self._attribute_entities[entity_id] <= 0:
+                    del self._attribute_entities[entity_id]
+            if not registered:
+                del self._handlers[entity_id]
+                self._pending.pop(entity_id, None)
+                self._resubscribe()
+
+        return remove
+
+    def _resubscribe(self) -> None:
+        """Track exactly the indexed entities with one listener."""
+        if self._unsub_tracker is not None:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+        if self._handlers:
+            self._unsub_tracker = async_track_state_change_event(
+                self.hass, list(self._handlers), self._handle_event)
+
+    def _changed(self, entity_id: str, old_state: State, new_state: State) -> bool:
+        if new_state.state != old_state.state:
+            return True
+        return entity_id in self._attribute_entities and new_state.attributes != old_state.attributes
+
+    @callback
+    def _handle_event(self, event: Event) -> None:
+        """Filter a state change and queue it for the batched dispatch."""
+        entity_id = event.data["entity_id"]
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        self._received[entity_id] += 1
+
+        if old_state is None or new_state is None or not self._changed(entity_id, old_state, new_state):
+            self._dropped[entity_id] += 1
+            return
+
+        pending = self._pending.get(entity_id)
+        if pending is not None:
+            self._coalesced[entity_id] += 1
+            old_state = pending[0]
+        self._pending[entity_id] = (old_state, new_state)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        """Run the handlers for every entity changed in this loop iteration."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        for entity_id, (old_state, new_state) in pending.items():
+            if not self._changed(entity_id, old_state, new_state):
+                # The batch returned to where it started
+                self._dropped[entity_id] += 1
+                continue
+            self._dispatched[entity_id] += 1
+            for handler in list(self._handlers.get(entity_id, ())):
+                try:
+                    handler(entity_id, old_state, new_state)
+                except Exception:  # noqa: BLE001 - one service must not starve the others
+                    _LOGGER.exception("Error handling state change for %s", entity_id)
@@ -1,13 +1,19 @@
 """Base classes and helpers for EV charger integrations."""
 
 from abc import abstractmethod
+import asyncio
 from enum import StrEnum
-from typing import Optional
+import logging
+import time
+from typing import Any, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
 
 from .service import VEEntityStateChangeHandler, VEService
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class EVChargerState(StrEnum):
     CHARGER_UNKNOWN = "unknown"
@@ -28,6 +34,136 @@ def convert_kw_to_amps(power_kw: float, voltage: int = DEFAULT_CHARGER_VOLTAGE)
 def convert_amps_to_kw(power_a: float, voltage: int = DEFAULT_CHARGER_VOLTAGE) -> float:
     return (power_a * voltage)/ 1000
 
+# Setpoints are whole amps, so a band of 1 A would only drop repeats
+DEFAULT_WRITE_HYSTERESIS_AMPS = 2
+DEFAULT_WRITE_BURST = 3
+DEFAULT_WRITE_RATE_PER_MINUTE = 6.0
+
+class TokenBucket:
+    """Token-bucket rate limiter measured against the monotonic clock."""
+
+    def __init__(self, capacity: int, rate_per_minute: float) -> None:
+        """Start with a full bucket of `capacity` tokens."""
+        self._capacity = float(capacity)
+        self._rate_per_s = rate_per_minute / 60.0
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self._rate_per_s)
+        self._stamp = now
+
+    def time_until_available(self) -> float:
+        """Return seconds until a token can be consumed (0 if available now)."""
+        self._refill()
+        if self._tokens >= 1.0:
+            return 0.0
+        if self._rate_per_s <= 0:
+            return float("inf")
+        return (1.0 - self._tokens) / self._rate_per_s
+
+    def consume(self) -> None:
+        """Take one token from the bucket."""
+        self._refill()
+        self._tokens = max(self._tokens - 1.0, 0.0)
+
+DEFAULT_MAX_SAMPLE_GAP_SECONDS = 120.0
+DEFAULT_MAX_INTERPOLATION_SECONDS = 300.0
+
+class EnergyIntegrator:
+    """Integrate charging power samples into energy in constant memory.
+
+    Samples up to max_gap apart are integrated with the trapezoidal rule.
+    Home Assistant only reports changes, so a longer quiet interval means
+    the power held, and the previous sample is held across it. An interval
+    that spans unavailability is interpolated over at most
+    max_interpolation seconds; the remainder is counted as uncovered
+    rather than guessed. Timestamps are epoch seconds.
+
+    When the charger has its own energy counter, its increases are summed
+    alongside, so the two can be compared over the same span.
+    """
+
+    def __init__(self, max_gap: float = DEFAULT_MAX_SAMPLE_GAP_SECONDS,
+                 max_interpolation: float = DEFAULT_MAX_INTERPOLATION_SECONDS) -> None:
+        """Start with no energy and no samples."""
+        self._max_gap = max_gap
+        self._max_interpolation = max_interpolation
+        self._kwh = 0.0
+        self._last_t: Optional[float] = None
+        self._last_kw = 0.0
+        self._unavailable = False
+        self.samples = 0
+        self.gaps = 0
+        self.uncovered_s = 0.0
+
+        self._counter_last: Optional[float] = None
+        self._counter_kwh = 0.0
+        self._kwh_at_counter_start: Optional[float] = None
+
+    def energy_kwh(self, timestamp: Optional[float] = None) -> float:
+        """Return the energy integrated so far, held up to timestamp if given."""
+        if timestamp is None or self._last_t is None or self._unavailable \
+                or timestamp <= self._last_t:
+            return self._kwh
+        return self._kwh + self._last_kw * (timestamp - self._last_t) / 3600.0
+
+    def add_sample(self, timestamp: float, power_kw: float) -> None:
+        """Integrate up to a new power sample taken at timestamp."""
+        last_t = self._last_t
+        if last_t is not None and timestamp > last_t:
+            dt = timestamp - last_t
+            if self._unavailable:
+                covered = min(dt, self._max_interpolation)
+                self.gaps += 1
+                self.uncovered_s += dt - covered
+                self._kwh += (self._last_kw + power_kw) / 2.0 * covered / 3600.0
+            elif dt > self._max_gap:
+                self._kwh += self._last_kw * dt / 3600.0
+            else:
+                self._kwh += (self._last_kw + power_kw) / 2.0 * dt / 3600.0
+        if last_t is None or timestamp > last_t:
+            self._last_t = timestamp
+        self._last_kw = power_kw
+        self._unavailable = False
+        self.samples += 1
+
+    def mark_unavailable(self, timestamp: float) -> None:
+        """Hold the last power up to timestamp, when the reading was lost."""
+        if self._last_t is None or self._unavailable:
+            return
+        if timestamp > self._last_t:
+            self._kwh += self._last_kw * (timestamp - self._last_t) / 3600.0
+            self._last_t = timestamp
+        self._unavailable = True
+
+    def add_counter(self, counter_kwh: float) -> None:
+        """Record a reading of the charger's own energy counter."""
+        last = self._counter_last
+        if last is None:
+            self._kwh_at_counter_start = self.energy_kwh()
+        elif counter_kwh >= last:
+            self._counter_kwh += counter_kwh - last
+        else:
+            # The counter restarted, as per-session counters do
+            self._counter_kwh += counter_kwh
+        self._counter_last = counter_kwh
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return integration counters and the divergence from the charger's counter."""
+        divergence = None
+        if self._kwh_at_counter_start is not None:
+            divergence = round(self._kwh - self._kwh_at_counter_start - self._counter_kwh, 4)
+        return {
+            "charger_energy_kwh": round(self._kwh, 4),
+            "charger_power_samples": self.samples,
+            "charger_power_gaps": self.gaps,
+            "charger_power_uncovered_s": round(self.uncovered_s, 1),
+            "charger_counter_divergence_kwh": divergence,
+        }
+
 class EVChargerService(VEService):
     """Common functionality for EV charger services."""
 
@@ -38,9 +174,27 @@ class EVChargerService(VEService):
         self._voltage: int = DEFAULT_CHARGER_VOLTAGE
         self._max_charging_power_amps: int = 0
         self._charging_power_kw: float = 0.0
+        self._energy = EnergyIntegrator()
+
+        # Setpoint write coalescing
+        self._write_hysteresis_amps: int = DEFAULT_WRITE_HYSTERESIS_AMPS
+        self._write_bucket = TokenBucket(DEFAULT_WRITE_BURST, DEFAULT_WRITE_RATE_PER_MINUTE)
+        self._last_written_amps: Optional[int] = None
+        self._inflight_amps: Optional[int] = None
+        self._pending_amps: Optional[int] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._writes_issued: int = 0
+        self._writes_suppressed: int = 0
+        self._writes_coalesced: int = 0
+        self._writes_failed: int = 0
 
         super().__init__(hass, entity_handlers)
 
+    @property
+    def charger_state(self) -> EVChargerState:
+        """Return the charger state last reported by the charger."""
+        return self._charger_state
+
     async def get_charger_state(self) -> EVChargerState:
         return self._charger_state
 
@@ -56,16 +210,145 @@ class EVChargerService(VEService):
     async def get_max_charging_power_amps(self) -> int:
         return self._max_charging_power_amps
 
+    @property
+    def charged_energy_kwh(self) -> float:
+        """Return the energy delivered since connecting, integrated from power samples."""
+        return self._energy.energy_kwh(time.time())
+
+    @property
+    def integrated_energy_kwh(self) -> float:
+        """Return the energy integrated up to the latest power sample.
+
+        Unlike charged_energy_kwh this is not held forward to now, so it
+        never decreases while the charger service runs.
+        """
+        return self._energy.energy_kwh()
+
+    async def get_charged_energy_kwh(self) -> float:
+        return self.charged_energy_kwh
+
+    @property
+    def energy_diagnostics(self) -> dict[str, Any]:
+        """Return energy integration counters for diagnostic attributes."""
+        return self._energy.diagnostics
+
+    def _record_power_sample(self, state: Optional[State], power_kw: Optional[float]) -> None:
+        """Feed a charging power state change to the energy integrator.
+
+        Samples are stamped with the state's last_changed time, so energy
+        does not depend on when the change is processed. power_kw None marks
+        the reading unavailable.
+        """
+        if state is None:
+            return
+        timestamp = state.last_changed.timestamp()
+        if power_kw is None:
+            self._energy.mark_unavailable(timestamp)
+        else:
+            self._energy.add_sample(timestamp, power_kw)
+
     async def get_charger_voltage(self) -> int:
         return self._voltage
 
     async def set_charger_voltage(self, voltage: int) -> None:
         self._voltage = voltage
 
-    @abstractmethod
+    @property
+    def write_hysteresis_amps(self) -> int:
+        """Return how far a setpoint must move from the current target to be written."""
+        return self._write_hysteresis_amps
+
+    @write_hysteresis_amps.setter
+    def write_hysteresis_amps(self, amps: int) -> None:
+        self._write_hysteresis_amps = max(int(amps), 0)
+
+    @property
+    def write_diagnostics(self) -> dict[str, Any]:
+        """Return setpoint write counters for diagnostic attributes."""
+        return {
+            "charger_writes_issued": self._writes_issued,
+            "charger_writes_suppressed": self._writes_suppressed,
+            "charger_writes_coalesced": self._writes_coalesced,
+            "charger_writes_failed": self._writes_failed,
+            "charger_last_written_amps": self._last_written_amps,
+        }
+
+    async def disconnect(self):
+        """Cancel any queued setpoint write and stop tracking entities."""
+        if self._writer_task is not None and not self._writer_task.done():
+            self._writer_task.cancel()
+        self._writer_task = None
+        self._pending_amps = None
+        await super().disconnect()
+
     async def set_charging_power_amps(self, power_amps: int) -> None:
-        pass
+        """Queue a charging current setpoint without waiting for the write.
+
+        Setpoints equal to, or within the hysteresis band of, the value being
+        or last written are dropped. A burst of setpoints collapses into one
+        write of the latest value, issued as soon as the rate limiter allows.
+        A failed write is retried unless a newer setpoint replaced it.
+        """
+        amps = int(round(power_amps))
+        if self._pending_amps is None and self._should_suppress_write(amps):
+            self._writes_suppressed += 1
+            return
+
+        if self._pending_amps is not None:
+            self._writes_coalesced += 1
+        self._pending_amps = amps
+
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = self._hass.async_create_task(self._async_drain_writes())
 
-    @abstractmethod
     async def set_charging_power_kw(self, power_kw: float) -> None:
-        pass
+        """Queue a charging power setpoint in kW."""
+        await self.set_charging_power_amps(convert_kw_to_amps(power_kw, self._voltage))
+
+    def _should_suppress_write(self, amps: int) -> bool:
+        """Return True if writing amps would not meaningfully change the charger."""
+        # Compare with the write in flight, which the charger will end up at
+        last = self._inflight_amps if self._inflight_amps is not None else self._last_written_amps
+        if last is None:
+            return False
+        if amps == last:
+            return True
+        # Always honor starting and stopping the charge
+        if amps == 0 or last == 0:
+            return False
+        return abs(amps - last) < self._write_hysteresis_amps
+
+    async def _async_drain_writes(self) -> None:
+        """Write the latest pending setpoint, waiting on the rate limiter."""
+        while self._pending_amps is not None:
+            delay = self._write_bucket.time_until_available()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            amps, self._pending_amps = self._pending_amps, None
+            if amps is None:
+                break
+            if self._should_suppress_write(amps):
+                self._writes_suppressed += 1
+                continue
+
+            self._write_bucket.consume()
+            self._inflight_amps = amps
+            try:
+                await self._async_write_charging_power_amps(amps)
+            except (HomeAssistantError, ValueError) as err:
+                self._writes_failed += 1
+                _LOGGER.warning("Charger setpoint write of %d A failed: %s", amps, err)
+                if self._pending_amps is None:
+                    # Retry once the rate limiter allows, unless superseded
+                    self._pending_amps = amps
+                continue
+            finally:
+                self._inflight_amps = None
+
+            self._last_written_amps = amps
+            self._writes_issued += 1
+
+    @abstractmethod
+    async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+        """Send a charging current setpoint to the charger."""
@@ -3,6 +3,11 @@
 from abc import abstractmethod
 from datetime import datetime
 from typing import Optional
+
+import numpy as np
+
+from homeassistant.core import State
+
 from .service import VEEntityStateChangeHandler, VEService
 
 
@@ -14,9 +19,19 @@ class ForecastService(VEService):
         self._today_production_kwh: float = 0.0
         self._tomorrow_production_kwh: float = 0.0
         self._now_production_kw: float = 0.0
+        self._forecast_issued: Optional[datetime] = None
 
         super().__init__(hass, entity_handlers)
 
+    @property
+    def forecast_issued(self) -> Optional[datetime]:
+        """Return when the hourly forecast last changed, for cache keying."""
+        return self._forecast_issued
+
+    def _mark_forecast_issued(self, state: Optional[State]) -> None:
+        """Record that the hourly forecast changed with the given state update."""
+        self._forecast_issued = state.last_updated if state is not None else None
+
     async def get_today_production_kwh(self) -> float:
         return self._today_production_kwh
 
@@ -26,6 +41,26 @@ class ForecastService(VEService):
     async def get_now_production_kw(self) -> float:
         return self._now_production_kw
 
+    async def get_hourly_production_kwh(self) -> list[float]:
+        """Return today's and tomorrow's hourly production as a 48-entry list."""
+        today = [await self._get_today_hour_production_kwh(h) for h in range(24)]
+        tomorrow = [await self._get_tomorrow_hour_production_kwh(h) for h in range(24)]
+        return today + tomorrow
+
+    async def get_hourly_forecast_array(self) -> np.ndarray:
+        """Return hourly production from local midnight today as an array.
+
+        Services with a longer horizon return more than 48 entries.
+        """
+        return np.asarray(await self.get_hourly_production_kwh(), dtype=np.float64)
+
+    async def get_hourly_quantile_array(self) -> Optional[np.ndarray]:
+        """Return P10/P50/P90 rows aligned with get_hourly_forecast_array().
+
+        Returns None for services that only provide a single estimate.
+        """
+        return None
+
     async def get_this_hour_production_kwh(self) -> float:
         current_hour = datetime.now().hour  # 0 through 23
         return await self._get_today_hour_production_kwh(current_hour)
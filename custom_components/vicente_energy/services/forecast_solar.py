@@ -2,9 +2,10 @@
 
 from datetime import datetime
 import logging
-from typing import List, cast
+from typing import List
 
-from homeassistant.core import HomeAssistant, State
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import HomeAssistant
 
 from .service import VEEntityStateChangeHandler
 from .forecast_service import ForecastService
@@ -32,26 +33,28 @@ class ForecastSolarService(ForecastService):
         await super().connect()
 
         # Prime the data members
-        try:
-            state: State = cast(State, self._hass.states.get("sensor.energy_production_today"))
-            self._today_production_kwh = float(state.state)
-
-            state = cast(State, self._hass.states.get("sensor.energy_production_tomorrow"))
-            self._tomorrow_production_kwh = float(state.state)
-
-            state = cast(State, self._hass.states.get("sensor.power_production_now"))
-            self._now_production_kw = float(state.state)
-
-            current_hour = datetime.now().hour  # 0 through 23
-            state = cast(State, self._hass.states.get("sensor.energy_current_hour"))
-            self._today_hourly_production_kwh[current_hour] = float(state.state)
-            if current_hour is 23:
-                self._tomorrow_hourly_production_kwh[0] = float(state.state)
+        states = self._hass.states
+        kwh = UnitOfEnergy.KILO_WATT_HOUR
+        today = self._parse_state(states.get("sensor.energy_production_today"), kwh)
+        if today is not None:
+            self._today_production_kwh = today
+        tomorrow = self._parse_state(states.get("sensor.energy_production_tomorrow"), kwh)
+        if tomorrow is not None:
+            self._tomorrow_production_kwh = tomorrow
+        now = self._parse_state(states.get("sensor.power_production_now"), UnitOfPower.KILO_WATT)
+        if now is not None:
+            self._now_production_kw = now
+
+        current_hour = datetime.now().hour  # 0 through 23
+        current = self._parse_state(states.get("sensor.energy_current_hour"), kwh)
+        if current is not None:
+            self._today_hourly_production_kwh[current_hour] = current
+        next_hour = self._parse_state(states.get("sensor.energy_next_hour"), kwh)
+        if next_hour is not None:
+            if current_hour == 23:
+                self._tomorrow_hourly_production_kwh[0] = next_hour
             else:
-                self._today_hourly_production_kwh[current_hour+1] = float(state.state)
-
-        except ValueError:
-            _LOGGER.warning("Failed to prime Forecast.Solar state: %s", state.state)
+                self._today_hourly_production_kwh[current_hour+1] = next_hour
 
     async def _get_today_hour_production_kwh(self, hour: int) -> float:
         return self._today_hourly_production_kwh[hour]
@@ -60,12 +63,9 @@ class ForecastSolarService(ForecastService):
         return self._tomorrow_hourly_production_kwh[hour]
 
     def _handle_current_hour_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            current_hour = datetime.now().hour  # 0 through 23
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar current hour forecast from state: %s",
-                            new_state.state)
+        current_hour = datetime.now().hour  # 0 through 23
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_hourly_production_kwh[current_hour] == value:
@@ -73,16 +73,14 @@ class ForecastSolarService(ForecastService):
 
         self._today_hourly_production_kwh[current_hour] = value
         _LOGGER.debug("Forecast.Solar current hour forecast updated: %.2f", value)
+        self._mark_forecast_issued(new_state)
 
         return True
 
     def _handle_next_hour_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            current_hour = datetime.now().hour  # 0 through 23
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar next hour forecast from state: %s",
-                            new_state.state)
+        current_hour = datetime.now().hour  # 0 through 23
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if current_hour == 23:
@@ -95,14 +93,12 @@ class ForecastSolarService(ForecastService):
             self._today_hourly_production_kwh[current_hour+1] = value
 
         _LOGGER.debug("Forecast.Solar next hour forecast updated: %.2f", value)
+        self._mark_forecast_issued(new_state)
         return True
 
     def _handle_now_production_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production now from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        if value is None:
             return False
 
         if self._now_production_kw == value:
@@ -113,11 +109,8 @@ class ForecastSolarService(ForecastService):
         return True
 
     def _handle_today_production_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production today from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_production_kwh == value:
@@ -125,14 +118,12 @@ class ForecastSolarService(ForecastService):
 
         self._today_production_kwh = value
         _LOGGER.debug("Forecast.Solar production today updated: %.2f", value)
+        self._mark_forecast_issued(new_state)
         return True
 
     def _handle_tomorrow_production_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production today from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._tomorrow_production_kwh == value:
@@ -140,4 +131,5 @@ class ForecastSolarService(ForecastService):
 
         self._tomorrow_production_kwh = value
         _LOGGER.debug("Forecast.Solar production now updated: %.2f", value)
+        self._mark_forecast_issued(new_state)
         return True
@@ -1,32 +1,56 @@
 """Service implementations for FranklinWH devices."""
 
 import logging
+from typing import Optional
+
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower
 from homeassistant.core import HomeAssistant
 
 from .grid_service import GridService
 from .battery_service import BatteryService
+from .discovery import EntityRole
+from .franklin_client import FranklinClient, async_get_franklin_client
+from .gateway import (
+    GatewayBatteryService,
+    GatewayGridService,
+    GatewayService,
+    GatewaySolarService,
+)
 from .service import VEEntityStateChangeHandler
 from .solar_service import SolarService
 
 _LOGGER = logging.getLogger(__name__)
 
+FRANKLIN_PLATFORM = "franklin_wh"
+# Reported as the changed entity when an aGate poll updates a service
+FRANKLIN_AGATE = "franklin_agate"
+
+
+def _franklin_role(key: str) -> EntityRole:
+    return EntityRole("sensor", (key,), f"sensor.franklinwh_{key}")
+
 class FranklinBatteryService(BatteryService):
     """Battery service for FranklinWH systems."""
 
+    _discovery_platform = FRANKLIN_PLATFORM
+    _entity_roles = {
+        "state_of_charge": _franklin_role("state_of_charge"),
+        "battery_charge": _franklin_role("battery_charge"),
+        "battery_discharge": _franklin_role("battery_discharge"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.franklinwh_state_of_charge": self._handle_soc_change,
-            "sensor.franklinwh_battery_charge": self._handle_today_charge_change,
-            "sensor.franklinwh_battery_discharge": self._handle_today_discharge_change,
+            "state_of_charge": self._handle_soc_change,
+            "battery_charge": self._handle_today_charge_change,
+            "battery_discharge": self._handle_today_discharge_change,
         }
         super().__init__(hass, handlers)
 
     def _handle_soc_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin SOC from state: %s", new_state.state)
+        value = self._parse_state(new_state, PERCENTAGE)
+        if value is None:
             return False
 
         if self._battery_soc == value:
@@ -37,10 +61,8 @@ class FranklinBatteryService(BatteryService):
         return True
 
     def _handle_today_charge_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin charge energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_charge_kwh == value:
@@ -51,10 +73,8 @@ class FranklinBatteryService(BatteryService):
         return True
 
     def _handle_today_discharge_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin discharge energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_discharge_kwh == value:
@@ -67,20 +87,23 @@ class FranklinBatteryService(BatteryService):
 class FranklinSolarService(SolarService):
     """Solar production service for FranklinWH inverters."""
 
+    _discovery_platform = FRANKLIN_PLATFORM
+    _entity_roles = {
+        "solar_energy": _franklin_role("solar_energy"),
+        "solar_production": _franklin_role("solar_production"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.franklinwh_solar_energy": self._handle_now_change,
-            "sensor.franklinwh_solar_production": self._handle_today_change,
+            "solar_energy": self._handle_now_change,
+            "solar_production": self._handle_today_change,
         }
         super().__init__(hass, handlers)
 
     def _handle_now_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin production now from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        if value is None:
             return False
 
         if self._now_production_kw == value:
@@ -91,10 +114,8 @@ class FranklinSolarService(SolarService):
         return True
 
     def _handle_today_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin production today energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_production_kwh == value:
@@ -107,20 +128,25 @@ class FranklinSolarService(SolarService):
 class FranklinGridService(GridService):
     """Grid data service for FranklinWH gateway."""
 
+    _discovery_platform = FRANKLIN_PLATFORM
+    _entity_roles = {
+        "grid_export": _franklin_role("grid_export"),
+        "grid_import": _franklin_role("grid_import"),
+        "home_load": _franklin_role("home_load"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.franklinwh_grid_export": self._handle_today_export_change,
-            "sensor.franklinwh_grid_import": self._handle_today_import_change,
-            "sensor.franklinwh_home_load": self._handle_now_home_load_change,
+            "grid_export": self._handle_today_export_change,
+            "grid_import": self._handle_today_import_change,
+            "home_load": self._handle_now_home_load_change,
         }
         super().__init__(hass, handlers)
 
     def _handle_today_export_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin export today from state: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_export_kwh == value:
@@ -131,10 +157,8 @@ class FranklinGridService(GridService):
         return True
 
     def _handle_today_import_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin import today from state: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_import_kwh == value:
@@ -145,16 +169,35 @@ class FranklinGridService(GridService):
         return True
 
     def _handle_now_home_load_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Franklin home load now from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        if value is None:
             return False
 
-        if self._today_import_kwh == value:
+        if self._now_home_load_kw == value:
             return False
 
-        self._today_import_kwh = value
+        self._now_home_load_kw = value
         _LOGGER.debug("Franklin home load now updated: %.2f", value)
         return True
+
+
+class FranklinApiService(GatewayService):
+    """Feed a service from the shared FranklinWH aGate client."""
+
+    _gateway_entity = FRANKLIN_AGATE
+    _gateway_name = "FranklinWH API"
+
+    def _get_client(self) -> Optional[FranklinClient]:
+        return async_get_franklin_client(self._hass)
+
+
+class FranklinApiBatteryService(FranklinApiService, GatewayBatteryService):
+    """Battery service reading the FranklinWH aGate API directly."""
+
+
+class FranklinApiGridService(FranklinApiService, GatewayGridService):
+    """Grid service reading the FranklinWH aGate API directly."""
+
+
+class FranklinApiSolarService(FranklinApiService, GatewaySolarService):
+    """Solar production service reading the FranklinWH aGate API directly."""
@@ -0,0 +1,191 @@
+"""Shared client for the FranklinWH aGate API."""
+
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import logging
+import time
+from typing import Any, Optional
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from ..const import DATA_FRANKLIN_CLIENT
+from .polling_client import PollingClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_URL = "https://energy.franklinwh.com"
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+REQUEST_TIMEOUT_SECONDS = 10.0
+
+LOGIN_PATH = "/hes-gateway/terminal/initialize/appUserOrInstallerLogin"
+RUNTIME_PATH = "/hes-gateway/terminal/getDeviceCompositeInfo"
+
+# Response code for an expired or invalid login token
+_CODE_UNAUTHORIZED = 401
+
+
+class FranklinAuthError(Exception):
+    """The aGate API rejected the configured credentials."""
+
+
+@dataclass(frozen=True)
+class FranklinSnapshot:
+    """One poll of the aGate, shared by the battery, grid and solar roles.
+
+    Power is in kW; positive battery power is discharge and positive grid
+    power is import. Energies are the aGate's kWh totals for today.
+    """
+
+    soc_pct: float
+    battery_kw: float
+    grid_kw: float
+    solar_kw: float
+    load_kw: float
+    battery_charge_kwh: float
+    battery_discharge_kwh: float
+    grid_import_kwh: float
+    grid_export_kwh: float
+    solar_kwh: float
+    fetched_at: float
+
+
+class FranklinTransport(ABC):
+    """Fetch the raw aGate runtime payload; replaced by a stub in tests."""
+
+    @abstractmethod
+    async def async_fetch_runtime(self) -> dict[str, Any]:
+        """Return the aGate's runtimeData mapping."""
+
+
+class FranklinApiTransport(FranklinTransport):
+    """Fetch runtime data from the FranklinWH API over HA's pooled session.
+
+    The API logs in with the account e-mail and the MD5 of the password and
+    returns a token, which is sent as a header until it is rejected. base_url
+    points at the cloud by default, or at a local endpoint serving the same API.
+    """
+
+    def __init__(self, hass: HomeAssistant, email: str, password: str, gateway_id: str,
+                 base_url: str = DEFAULT_URL,
+                 session: Optional[aiohttp.ClientSession] = None) -> None:
+        """Store the account details; nothing is sent until the first fetch."""
+        self._email = email
+        # The API expects the password's MD5 digest, not the password itself
+        self._password_md5 = hashlib.md5(password.encode(), usedforsecurity=False).hexdigest()
+        self._gateway_id = gateway_id
+        self._base_url = base_url.rstrip("/")
+        self._session = session or async_get_clientsession(hass)
+        self._token: Optional[str] = None
+        self._login_lock = asyncio.Lock()
+
+    async def _async_login(self) -> str:
+        """Return a login token, logging in once for concurrent callers."""
+        async with self._login_lock:
+            if self._token is not None:
+                return self._token
+            async with self._session.post(
+                f"{self._base_url}{LOGIN_PATH}",
+                data={"account": self._email, "password": self._password_md5,
+                      "lang": "en_US", "type": 1},
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                response.raise_for_status()
+                body = await response.json(content_type=None)
+            try:
+                self._token = body["result"]["token"]
+            except (KeyError, TypeError) as err:
+                raise FranklinAuthError(f"FranklinWH login failed: {body.get('message')}") from err
+            return self._token
+
+    async def async_fetch_runtime(self) -> dict[str, Any]:
+        """Return the aGate's runtimeData mapping, logging in again once if needed."""
+        for attempt in range(2):
+            token = await self._async_login()
+            async with self._session.get(
+                f"{self._base_url}{RUNTIME_PATH}",
+                params={"gatewayId": self._gateway_id, "refreshFlag": 1},
+                headers={"loginToken": token},
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                response.raise_for_status()
+                body = await response.json(content_type=None)
+            if body.get("code") == _CODE_UNAUTHORIZED and attempt == 0:
+                # Token expired; drop it unless a concurrent request already has
+                if self._token == token:
+                    self._token = None
+                continue
+            try:
+                return body["result"]["runtimeData"]
+            except (KeyError, TypeError) as err:
+                raise ValueError(f"Unexpected FranklinWH response: {body.get('message')}") from err
+        raise FranklinAuthError("FranklinWH rejected the login token")
+
+
+@callback
+def async_get_franklin_client(hass: HomeAssistant) -> Optional["FranklinClient"]:
+    """Return the configured aGate client, if any."""
+    return hass.data.get(DATA_FRANKLIN_CLIENT)
+
+
+@callback
+def async_setup_franklin_client(hass: HomeAssistant, transport: FranklinTransport,
+                                poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> "FranklinClient":
+    """Create, or reconfigure, the aGate client shared by the Franklin services."""
+    client = async_get_franklin_client(hass)
+    if client is None:
+        client = hass.data[DATA_FRANKLIN_CLIENT] = FranklinClient(hass, transport, poll_interval)
+    else:
+        # Listeners stay attached, so running services follow the new settings
+        client.reconfigure(transport, poll_interval)
+    return client
+
+
+class FranklinClient(PollingClient[FranklinSnapshot]):
+    """Poll the aGate once per interval for every Franklin role.
+
+    The decoded payload is cached as a FranklinSnapshot and pushed to every
+    listener, so the battery, grid and solar services together cost one API
+    call per interval.
+    """
+
+    _name = "franklin"
+    _poll_errors = (aiohttp.ClientError, TimeoutError, ValueError, FranklinAuthError)
+
+    def __init__(self, hass: HomeAssistant, transport: FranklinTransport,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> None:
+        """Wrap transport; nothing is fetched until started."""
+        super().__init__(hass, poll_interval)
+        self._transport = transport
+
+    def reconfigure(self, transport: FranklinTransport, poll_interval: float) -> None:
+        """Use a new transport and interval without dropping listeners."""
+        self._transport = transport
+        self._set_poll_interval(poll_interval)
+
+    async def _async_fetch_snapshot(self) -> FranklinSnapshot:
+        return self._parse(await self._transport.async_fetch_runtime())
+
+    @staticmethod
+    def _parse(runtime: dict[str, Any]) -> FranklinSnapshot:
+        """Convert the aGate's kW/kWh runtime fields into a snapshot."""
+        try:
+            return FranklinSnapshot(
+                soc_pct=float(runtime["soc"]),
+                battery_kw=float(runtime["p_fhp"]),
+                grid_kw=float(runtime["p_grid"]),
+                solar_kw=float(runtime["p_sun"]),
+                load_kw=float(runtime["p_load"]),
+                battery_charge_kwh=float(runtime["kwh_fhp_chg"]),
+                battery_discharge_kwh=float(runtime["kwh_fhp_di"]),
+                grid_import_kwh=float(runtime["kwh_grid_use"]),
+                grid_export_kwh=float(runtime["kwh_grid_out"]),
+                solar_kwh=float(runtime["kwh_sun"]),
+                fetched_at=time.monotonic(),
+            )
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"Unexpected FranklinWH runtime data: {err}") from err
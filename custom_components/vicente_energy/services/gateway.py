@@ -0,0 +1,100 @@
+"""Services fed by a shared battery gateway client."""
+
+from abc import abstractmethod
+from typing import Optional, Protocol
+
+from .battery_service import BatteryService
+from .grid_service import GridService
+from .polling_client import PollingClient
+from .service import VEService
+from .solar_service import SolarService
+
+
+class GatewaySnapshot(Protocol):
+    """Readings every battery gateway snapshot provides.
+
+    Power is in kW with positive battery power meaning discharge; energies
+    are kWh for today.
+    """
+
+    soc_pct: float
+    battery_kw: float
+    solar_kw: float
+    load_kw: float
+    battery_charge_kwh: float
+    battery_discharge_kwh: float
+    grid_import_kwh: float
+    grid_export_kwh: float
+    solar_kwh: float
+
+
+class GatewayService(VEService):
+    """Feed a service from a shared gateway polling client.
+
+    The battery, grid and solar roles all listen to the same client, so one
+    gateway poll updates all three. Vendors subclass this to name their
+    client; the role subclasses below copy their values from a snapshot.
+    """
+
+    # Reported as the changed entity when a gateway poll updates the service
+    _gateway_entity: str = ""
+    _gateway_name: str = "Gateway"
+
+    @abstractmethod
+    def _get_client(self) -> Optional[PollingClient]:
+        """Return the vendor's configured gateway client, if any."""
+
+    async def connect(self):
+        client = self._get_client()
+        if client is None:
+            raise RuntimeError(f"{self._gateway_name} is not configured")
+        # Fails, and is retried by the service manager, while the gateway is unreachable
+        snapshot = await client.async_get_snapshot()
+        self._unsubs.append(client.async_add_listener(self._handle_gateway_snapshot))
+        self._handle_gateway_snapshot(snapshot)
+
+    def _handle_gateway_snapshot(self, snapshot: GatewaySnapshot) -> None:
+        if self._apply_snapshot(snapshot):
+            self._notify_callbacks(self._gateway_entity, None, None)
+
+    @abstractmethod
+    def _apply_snapshot(self, snapshot: GatewaySnapshot) -> bool:
+        """Copy this role's values from snapshot; return True if any changed."""
+
+
+class GatewayBatteryService(GatewayService, BatteryService):
+    """Battery role of a gateway service."""
+
+    def _apply_snapshot(self, snapshot: GatewaySnapshot) -> bool:
+        values = (snapshot.soc_pct, snapshot.battery_kw,
+                  snapshot.battery_charge_kwh, snapshot.battery_discharge_kwh)
+        current = (self._battery_soc, self._storage_power_kw,
+                   self._today_charge_kwh, self._today_discharge_kwh)
+        if values == current:
+            return False
+        (self._battery_soc, self._storage_power_kw,
+         self._today_charge_kwh, self._today_discharge_kwh) = values
+        return True
+
+
+class GatewayGridService(GatewayService, GridService):
+    """Grid role of a gateway service."""
+
+    def _apply_snapshot(self, snapshot: GatewaySnapshot) -> bool:
+        values = (snapshot.grid_import_kwh, snapshot.grid_export_kwh, snapshot.load_kw)
+        current = (self._today_import_kwh, self._today_export_kwh, self._now_home_load_kw)
+        if values == current:
+            return False
+        self._today_import_kwh, self._today_export_kwh, self._now_home_load_kw = values
+        return True
+
+
+class GatewaySolarService(GatewayService, SolarService):
+    """Solar production role of a gateway service."""
+
+    def _apply_snapshot(self, snapshot: GatewaySnapshot) -> bool:
+        values = (snapshot.solar_kw, snapshot.solar_kwh)
+        if values == (self._now_production_kw, self._today_production_kwh):
+            return False
+        self._now_production_kw, self._today_production_kwh = values
+        return True
@@ -0,0 +1,160 @@
+"""Shared numeric state parsing with unit normalization."""
+
+from collections import Counter
+from collections.abc import Callable
+import logging
+from typing import Any, Optional
+
+from homeassistant.const import ATTR_DEVICE_CLASS, ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant, State, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PARSER = "vicente_energy_numeric_parser"
+
+POWER = "power"
+ENERGY = "energy"
+PERCENT = "percent"
+CURRENT = "current"
+
+# Unit → (quantity, factor to the quantity's base unit). Units are matched
+# case-sensitively, as Home Assistant spells them: mW is not MW.
+_UNITS: dict[str, tuple[str, float]] = {
+    "mW": (POWER, 1e-3),
+    "W": (POWER, 1.0),
+    "kW": (POWER, 1e3),
+    "MW": (POWER, 1e6),
+    "mWh": (ENERGY, 1e-3),
+    "Wh": (ENERGY, 1.0),
+    "kWh": (ENERGY, 1e3),
+    "MWh": (ENERGY, 1e6),
+    "%": (PERCENT, 1.0),
+    "A": (CURRENT, 1.0),
+}
+
+_DEVICE_CLASS_QUANTITY = {
+    "power": POWER,
+    "energy": ENERGY,
+    "energy_storage": ENERGY,
+    "battery": PERCENT,
+    "current": CURRENT,
+}
+
+# States that carry no value; rejected before any conversion is attempted
+_NO_VALUE_STATES = frozenset(("unknown", "unavailable", "none", ""))
+
+Converter = Callable[[float], float]
+
+
+def _identity(value: float) -> float:
+    return value
+
+
+def compile_converter(target: str, unit: Optional[str],
+                      device_class: Optional[str] = None) -> Optional[Converter]:
+    """Return a function converting values in unit to target, or None if incompatible.
+
+    A missing unit is taken to already be in the target unit, unless the
+    device class names a different quantity. An unrecognized unit, such as
+    kVA for a power target, is incompatible.
+    """
+    target_quantity, target_factor = _UNITS[target]
+    unit = unit.strip() if unit else ""
+    source = _UNITS.get(unit) if unit else None
+    if unit and source is None:
+        return None
+    quantity = source[0] if source else _DEVICE_CLASS_QUANTITY.get(device_class or "")
+    if quantity is not None and quantity != target_quantity:
+        return None
+    if source is None or source[1] == target_factor:
+        return _identity
+    scale = source[1] / target_factor
+    return lambda value: value * scale
+
+
+@callback
+def async_get_parser(hass: HomeAssistant) -> "NumericStateParser":
+    """Return the parser shared by every service and config entry."""
+    parser = hass.data.get(DATA_PARSER)
+    if parser is None:
+        parser = hass.data[DATA_PARSER] = NumericStateParser()
+    return parser
+
+
+class NumericStateParser:
+    """Parse numeric entity states into a requested unit.
+
+    Converters are compiled once per entity and target unit from the state's
+    unit_of_measurement and device_class, and recompiled only when those
+    attributes change. States without a value (unknown, unavailable) are
+    rejected by a set lookup, so the hot path raises no exceptions. Each
+    rejection is counted per entity.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty converter cache."""
+        # (entity_id, target) → (unit, device_class, converter)
+        self._converters: dict[tuple[str, str], tuple[Any, Any, Optional[Converter]]] = {}
+        self._parsed: Counter[str] = Counter()
+        self._unavailable: Counter[str] = Counter()
+        self._invalid: Counter[str] = Counter()
+        self._incompatible: Counter[str] = Counter()
+
+    @property
+    def diagnostics(self) -> dict[str, dict[str, Any]]:
+        """Return per-entity parse counters and the unit each entity reports."""
+        units = {entity_id: unit for (entity_id, _), (unit, _, _) in self._converters.items()}
+        entity_ids = set(self._parsed) | set(self._unavailable) | set(self._invalid) \
+            | set(self._incompatible)
+        return {
+            entity_id: {
+                "unit": units.get(entity_id),
+                "parsed": self._parsed[entity_id],
+                "unavailable": self._unavailable[entity_id],
+                "invalid": self._invalid[entity_id],
+                "incompatible_unit": self._incompatible[entity_id],
+            }
+            for entity_id in sorted(entity_ids)
+        }
+
+    def _converter(self, state: State, target: str) -> Optional[Converter]:
+        """Return the cached converter for state's entity, compiling it if needed."""
+        attributes = state.attributes
+        unit = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        device_class = attributes.get(ATTR_DEVICE_CLASS)
+        key = (state.entity_id, target)
+        cached = self._converters.get(key)
+        if cached is not None and cached[0] == unit and cached[1] == device_class:
+            return cached[2]
+
+        converter = compile_converter(target, unit, device_class)
+        if converter is None:
+            _LOGGER.warning("%s reports %s (%s), which cannot be converted to %s",
+                            state.entity_id, unit, device_class, target)
+        self._converters[key] = (unit, device_class, converter)
+        return converter
+
+    def parse(self, state: Optional[State], target: str) -> Optional[float]:
+        """Return state's value converted to target, or None if it has no usable value."""
+        if state is None:
+            return None
+        entity_id = state.entity_id
+        raw = state.state
+        if raw is None or raw.lower() in _NO_VALUE_STATES:
+            self._unavailable[entity_id] += 1
+            return None
+
+        converter = self._converter(state, target)
+        if converter is None:
+            self._incompatible[entity_id] += 1
+            return None
+
+        try:
+            value = float(raw)
+        except ValueError:
+            self._invalid[entity_id] += 1
+            _LOGGER.debug("Ignoring non-numeric state of %s: %s", entity_id, raw)
+            return None
+
+        self._parsed[entity_id] += 1
+        return converter(value)
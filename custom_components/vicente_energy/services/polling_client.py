@@ -0,0 +1,138 @@
+"""Base for clients that poll one device on behalf of several services."""
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+import time
+from typing import Any, Generic, Optional, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL_SECONDS = 1.0
+
+SnapshotT = TypeVar("SnapshotT")
+
+
+class PollingClient(ABC, Generic[SnapshotT]):
+    """Poll a device once per interval for every listener.
+
+    Each poll is decoded into a snapshot, which is cached and pushed to
+    every listener, so all the services reading the device together cost
+    one poll per interval. Concurrent refresh requests share one in-flight
+    poll. Polling runs while any listener is registered.
+
+    Subclasses implement _async_fetch_snapshot() and set _name, the prefix
+    of their diagnostics keys, and _poll_errors, the exceptions a scheduled
+    poll logs instead of raising. Snapshots carry a monotonic fetched_at.
+    """
+
+    _name: str = ""
+    _poll_errors: tuple[type[Exception], ...] = (OSError, TimeoutError, ValueError)
+
+    def __init__(self, hass: HomeAssistant, poll_interval: float) -> None:
+        """Start with no snapshot; nothing is fetched until polled."""
+        self.hass = hass
+        self._poll_interval = max(poll_interval, MIN_POLL_INTERVAL_SECONDS)
+
+        self._snapshot: Optional[SnapshotT] = None
+        self._in_flight: Optional[asyncio.Task] = None
+        self._listeners: list[Callable[[SnapshotT], None]] = []
+        self._unsub_poll: Optional[CALLBACK_TYPE] = None
+
+        self._polls = 0
+        self._poll_failures = 0
+        self._last_poll_ms: Optional[float] = None
+
+    @property
+    def snapshot(self) -> Optional[SnapshotT]:
+        """Return the last successful poll, if any."""
+        return self._snapshot
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return poll counters."""
+        return {
+            f"{self._name}_polls": self._polls,
+            f"{self._name}_poll_failures": self._poll_failures,
+            f"{self._name}_last_poll_ms": self._last_poll_ms,
+        }
+
+    def _set_poll_interval(self, poll_interval: float) -> None:
+        """Apply a new interval, restarting polling if it runs."""
+        poll_interval = max(poll_interval, MIN_POLL_INTERVAL_SECONDS)
+        if poll_interval != self._poll_interval:
+            self._poll_interval = poll_interval
+            if self._unsub_poll is not None:
+                self._unsub_poll()
+                self._start_polling()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[SnapshotT], None]) -> Callable[[], None]:
+        """Push every new snapshot to listener; polling runs while any are registered."""
+        self._listeners.append(listener)
+        if self._unsub_poll is None:
+            self._start_polling()
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self.async_stop()
+
+        return remove_listener
+
+    def _start_polling(self) -> None:
+        self._unsub_poll = async_track_time_interval(
+            self.hass, self._async_scheduled_poll, timedelta(seconds=self._poll_interval))
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    async def _async_scheduled_poll(self, _now=None) -> None:
+        try:
+            await self.async_refresh()
+        except self._poll_errors as err:
+            _LOGGER.debug("%s poll failed: %s", self._name, err)
+
+    async def async_get_snapshot(self, max_age: Optional[float] = None) -> SnapshotT:
+        """Return the cached snapshot, polling if it is missing or older than max_age."""
+        max_age = self._poll_interval if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.fetched_at < max_age:
+            return snapshot
+        return await self.async_refresh()
+
+    async def async_refresh(self) -> SnapshotT:
+        """Poll the device, joining a poll that is already in flight."""
+        if self._in_flight is None or self._in_flight.done():
+            self._in_flight = self.hass.async_create_task(self._async_poll())
+        return await asyncio.shield(self._in_flight)
+
+    async def _async_poll(self) -> SnapshotT:
+        started = time.monotonic()
+        try:
+            snapshot = await self._async_fetch_snapshot()
+        except Exception:
+            self._poll_failures += 1
+            raise
+        self._polls += 1
+        self._last_poll_ms = round((time.monotonic() - started) * 1000.0, 1)
+
+        self._snapshot = snapshot
+        for listener in list(self._listeners):
+            listener(snapshot)
+        return snapshot
+
+    @abstractmethod
+    async def _async_fetch_snapshot(self) -> SnapshotT:
+        """Fetch and decode one poll of the device."""
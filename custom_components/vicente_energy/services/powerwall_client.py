@@ -0,0 +1,198 @@
+"""Direct client for the Tesla Powerwall local gateway API."""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+import logging
+import time
+from typing import Any, Optional
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+
+from ..const import DATA_POWERWALL_CLIENT
+from .daily_energy import DailyEnergyCounters
+from .polling_client import PollingClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+REQUEST_TIMEOUT_SECONDS = 10.0
+
+LOGIN_PATH = "/api/login/Basic"
+AGGREGATES_PATH = "/api/meters/aggregates"
+SOE_PATH = "/api/system_status/soe"
+
+
+@dataclass(frozen=True)
+class PowerwallSnapshot:
+    """One poll of the gateway, shared by the battery, grid and solar roles.
+
+    Power is in kW; positive battery power is discharge and positive site
+    power is grid import. Energies are kWh since local midnight.
+    """
+
+    soc_pct: float
+    battery_kw: float
+    site_kw: float
+    solar_kw: float
+    load_kw: float
+    battery_charge_kwh: float
+    battery_discharge_kwh: float
+    grid_import_kwh: float
+    grid_export_kwh: float
+    solar_kwh: float
+    fetched_at: float
+
+
+def _base_url(host: str) -> str:
+    """Return the gateway URL; a bare host name means HTTPS."""
+    return host.rstrip("/") if "://" in host else f"https://{host}"
+
+
+@callback
+def async_get_powerwall_client(hass: HomeAssistant) -> Optional["PowerwallClient"]:
+    """Return the configured gateway client, if any."""
+    return hass.data.get(DATA_POWERWALL_CLIENT)
+
+
+@callback
+def async_setup_powerwall_client(hass: HomeAssistant, host: str, password: str,
+                                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+                                 session: Optional[aiohttp.ClientSession] = None) -> "PowerwallClient":
+    """Create, or reconfigure, the gateway client shared by the Powerwall services."""
+    client = async_get_powerwall_client(hass)
+    if client is None:
+        client = hass.data[DATA_POWERWALL_CLIENT] = PowerwallClient(
+            hass, host, password, poll_interval, session)
+    else:
+        # Listeners stay attached, so running services follow the new settings
+        client.reconfigure(host, password, poll_interval)
+    return client
+
+
+class PowerwallClient(PollingClient[PowerwallSnapshot]):
+    """Poll the gateway once per interval for every Powerwall role.
+
+    Each poll fetches the meter aggregates and the state of energy
+    concurrently over one keep-alive session. The gateway reports lifetime
+    energy counters, so today's energy is the difference from the first
+    reading of the local day, which is kept across restarts.
+    """
+
+    _name = "powerwall"
+    _poll_errors = (aiohttp.ClientError, TimeoutError, ValueError)
+
+    def __init__(self, hass: HomeAssistant, host: str, password: str,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+                 session: Optional[aiohttp.ClientSession] = None) -> None:
+        """Configure the gateway address; nothing is fetched until started."""
+        super().__init__(hass, poll_interval)
+        self._host = host
+        self._password = password
+        self._base_url = _base_url(host)
+        self._session = session
+        self._logged_in = False
+        self._login_generation = 0
+        self._login_lock = asyncio.Lock()
+        self._daily = DailyEnergyCounters(hass, self._name)
+
+    def reconfigure(self, host: str, password: str, poll_interval: float) -> None:
+        """Apply new gateway settings without dropping listeners."""
+        if host != self._host or password != self._password:
+            self._host = host
+            self._password = password
+            self._base_url = _base_url(host)
+            self._logged_in = False
+            self._daily.reset()
+        self._set_poll_interval(poll_interval)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            # Own cookie jar for the auth cookie, accepting it from an IP address;
+            # the gateway uses a self-signed certificate
+            self._session = async_create_clientsession(
+                self.hass, verify_ssl=False, cookie_jar=aiohttp.CookieJar(unsafe=True))
+        return self._session
+
+    async def _async_login(self) -> None:
+        """Log in unless logged in; concurrent requests share one login."""
+        async with self._login_lock:
+            if self._logged_in:
+                return
+            async with self._get_session().post(
+                f"{self._base_url}{LOGIN_PATH}",
+                json={"username": "customer", "password": self._password, "email": "",
+                      "force_sm_off": False},
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                response.raise_for_status()
+            self._logged_in = True
+            self._login_generation += 1
+
+    async def _async_get_json(self, path: str) -> dict[str, Any]:
+        for attempt in range(2):
+            await self._async_login()
+            generation = self._login_generation
+            async with self._get_session().get(
+                f"{self._base_url}{path}",
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                if response.status in (401, 403) and attempt == 0:
+                    # Session cookie expired; log in again once, unless a
+                    # concurrent request already has
+                    if generation == self._login_generation:
+                        self._logged_in = False
+                    continue
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        raise aiohttp.ClientError(f"Powerwall rejected credentials for {path}")
+
+    async def _async_fetch_snapshot(self) -> PowerwallSnapshot:
+        await self._daily.async_load()
+        aggregates, soe = await asyncio.gather(
+            self._async_get_json(AGGREGATES_PATH), self._async_get_json(SOE_PATH))
+        return self._parse(aggregates, soe)
+
+    def _today_kwh(self, key: str, lifetime_wh: float, day: date) -> float:
+        """Return the energy since the start of day."""
+        return self._daily.today(key, lifetime_wh, day) / 1000.0
+
+    def _parse(self, aggregates: dict[str, Any], soe: dict[str, Any]) -> PowerwallSnapshot:
+        """Convert the gateway's W/Wh readings into a snapshot."""
+        try:
+            site = aggregates["site"]
+            battery = aggregates["battery"]
+            solar = aggregates["solar"]
+            load = aggregates["load"]
+            soc = float(soe["percentage"])
+            power_w = {name: float(meter["instant_power"]) for name, meter in
+                       (("battery", battery), ("site", site), ("solar", solar), ("load", load))}
+            lifetime_wh = {
+                "battery_in": float(battery["energy_imported"]),
+                "battery_out": float(battery["energy_exported"]),
+                "site_in": float(site["energy_imported"]),
+                "site_out": float(site["energy_exported"]),
+                "solar_out": float(solar["energy_exported"]),
+            }
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"Unexpected Powerwall response: {err!r}") from err
+
+        today = dt_util.now().date()
+        today_kwh = {key: self._today_kwh(key, wh, today) for key, wh in lifetime_wh.items()}
+        return PowerwallSnapshot(
+            soc_pct=soc,
+            battery_kw=power_w["battery"] / 1000.0,
+            site_kw=power_w["site"] / 1000.0,
+            solar_kw=power_w["solar"] / 1000.0,
+            load_kw=power_w["load"] / 1000.0,
+            battery_charge_kwh=today_kwh["battery_in"],
+            battery_discharge_kwh=today_kwh["battery_out"],
+            grid_import_kwh=today_kwh["site_in"],
+            grid_export_kwh=today_kwh["site_out"],
+            solar_kwh=today_kwh["solar_out"],
+            fetched_at=time.monotonic(),
+        )
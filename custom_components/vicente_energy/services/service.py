@@ -2,15 +2,37 @@
 
 from abc import ABC
 from collections.abc import Callable
+import logging
 from typing import Optional
 
-from homeassistant.core import HomeAssistant, State
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.core import HomeAssistant, State, callback
+
+from .discovery import EntityRole, async_get_discovery
+from .numeric import async_get_parser
+
+_LOGGER = logging.getLogger(__name__)
 
 VEEntityStateChangeHandler = Callable[[str, State, State], bool]
 
 class VEService(ABC):
-    """Base service class that manages callbacks and entity tracking."""
+    """Base service class that manages callbacks and entity tracking.
+
+    Entities are tracked through the integration-wide StateChangeDispatcher,
+    which drops unchanged states and batches changes before the handlers
+    here run. Entities listed in _attribute_entities are also dispatched on
+    attribute-only changes.
+
+    Vendor services that declare _entity_roles key their handlers by role
+    instead of entity_id. connect() resolves the roles through the shared
+    EntityDiscovery index for _discovery_platform and tracks whichever
+    entities they map to.
+    """
+
+    _attribute_entities: frozenset[str] = frozenset()
+    # Integration domain that provides this service's entities
+    _discovery_platform: Optional[str] = None
+    # Maps role → how to find its entity in the registry
+    _entity_roles: dict[str, EntityRole] = {}
 
     def __init__(self, hass: HomeAssistant,
                  entity_handlers: Optional[dict[str, VEEntityStateChangeHandler]]) -> None:
@@ -18,13 +40,37 @@ class VEService(ABC):
         self._hass: HomeAssistant = hass
         self._entity_handlers: Optional[dict[str, VEEntityStateChangeHandler]]\
             = entity_handlers  # Maps entity_id → handler
+        self._role_handlers: dict[str, VEEntityStateChangeHandler] = {}
+        self._entities: dict[str, str] = {}  # Maps role → resolved entity_id
+        if self._entity_roles:
+            self._role_handlers = entity_handlers or {}
+            self._entity_handlers = None
         self._callbacks: list[VEEntityStateChangeHandler] = []
         self._unsubs: list[Callable[[], None]] = []
 
     async def connect(self):
         """Begin tracking configured entities."""
+        if self._entity_roles:
+            self.resolve_entities()
+            await self.set_handler_map({
+                self._entities[role]: handler
+                for role, handler in self._role_handlers.items()
+                if role in self._entities
+            })
+            return
         await self.set_handler_map(self._entity_handlers)
 
+    @callback
+    def resolve_entities(self) -> dict[str, str]:
+        """Look up the entity for each role and return role → entity_id."""
+        discovery = async_get_discovery(self._hass)
+        self._entities = discovery.async_resolve(self._discovery_platform, self._entity_roles)
+        missing = set(self._entity_roles) - set(self._entities)
+        if missing:
+            _LOGGER.warning("%s: no %s entity found for %s", type(self).__name__,
+                            self._discovery_platform, ", ".join(sorted(missing)))
+        return self._entities
+
     async def disconnect(self):
         """Stop tracking entities and clear callbacks."""
         for unsub in self._unsubs:
@@ -34,17 +80,35 @@ class VEService(ABC):
     async def set_handler_map(self,
                               entity_handlers: Optional[dict[str, VEEntityStateChangeHandler]]):
         """Subscribe to state changes for the given entity map."""
+        # Imported here: the dispatcher module imports the handler type from this one
+        from .dispatcher import async_get_dispatcher
+
+        # Replace, rather than add to, any previous subscriptions
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
         self._entity_handlers = entity_handlers  # Maps entity_id → handler
 
         if self._entity_handlers is not None:
+            dispatcher = async_get_dispatcher(self._hass)
             for entity_id in self._entity_handlers:
-                unsub = async_track_state_change(
-                    self._hass,
+                unsub = dispatcher.async_register(
                     entity_id,
-                    self._handle_state_change
+                    self._handle_state_change,
+                    attributes=entity_id in self._attribute_entities,
                 )
                 self._unsubs.append(unsub)
 
+    def _parse_state(self, state: Optional[State], unit: str) -> Optional[float]:
+        """Return a state's value in unit, or None if it has no usable value."""
+        return async_get_parser(self._hass).parse(state, unit)
+
+    def adopt_callbacks(self, previous: "VEService") -> None:
+        """Take over the callbacks registered on the service this one replaces."""
+        for cb in previous._callbacks:
+            if cb not in self._callbacks:
+                self._callbacks.append(cb)
+
     def register_callback(self, callback: VEEntityStateChangeHandler) -> None:
         """Add a callback for state change notifications."""
         self._callbacks.append(callback)
@@ -57,20 +121,19 @@ class VEService(ABC):
         except ValueError:
             _LOGGER.warning(f"Attempted to deregister non-existent callback {callback.__name__}.")
 
-    async def _handle_state_change(self,
-                                   entity_id: str, old_state: State | None,
-                                   new_state: State | None) -> None:
-        """Internal callback for Home Assistant state change events."""
-        if old_state is None or new_state is None:
-            return
-
-        if new_state.state == old_state.state:
-            return
-
+    @callback
+    def _handle_state_change(self,
+                             entity_id: str, old_state: State,
+                             new_state: State) -> None:
+        """Internal callback for changes routed by the dispatcher."""
         # 🧠 Delegate update to the specific entity handler
         if self._entity_handlers is not None:
             handler = self._entity_handlers.get(entity_id)
             if handler and handler(entity_id, old_state, new_state):
-                # Notify external subscribers
-                for cb in self._callbacks:
-                    cb(entity_id, old_state, new_state)
+                self._notify_callbacks(entity_id, old_state, new_state)
+
+    def _notify_callbacks(self, entity_id: str, old_state: Optional[State],
+                          new_state: Optional[State]) -> None:
+        """Notify external subscribers of a change."""
+        for cb in self._callbacks:
+            cb(entity_id, old_state, new_state)
@@ -2,21 +2,49 @@
 
 import logging
 import asyncio
+import random
+import time
+from typing import Any, Optional
 
-from homeassistant.core import HomeAssistant
+import numpy as np
 
-from .__init__ import SERVICE_CLASS_MAP, ServiceType
+from homeassistant.core import HomeAssistant, callback
+
+from . import SERVICE_CLASS_MAP, ServiceType
 from .service import VEEntityStateChangeHandler, VEService
 
 _LOGGER = logging.getLogger(__name__)
 
+CONNECT_TIMEOUT_SECONDS = 30.0
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 600.0
+READY_TIMEOUT_SECONDS = 20.0
+
 class ServiceManager:
-    def __init__(self, hass: HomeAssistant, service_ids: dict[ServiceType, str]):
+    """Own the configured services and their connection lifecycle.
+
+    async_start() connects every service concurrently. Each connect attempt
+    is bounded by a timeout, and failed attempts are retried with capped
+    exponential backoff and jitter until they succeed or the manager stops.
+    Each ServiceType has a readiness future that completes on its first
+    successful connect, so consumers can wait for the services they need.
+    """
+
+    def __init__(self, hass: HomeAssistant, service_ids: dict[ServiceType, str],
+                 connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+                 retry_base: float = RETRY_BASE_SECONDS,
+                 retry_max: float = RETRY_MAX_SECONDS):
         """Initialize the ServiceManager with the named service types."""
         self._hass = hass
         self._services: dict[ServiceType, VEService] = {}
+        self._connect_timeout = connect_timeout
+        self._retry_base = retry_base
+        self._retry_max = retry_max
+        self._connect_tasks: dict[ServiceType, asyncio.Task] = {}
+        self._ready: dict[ServiceType, asyncio.Future] = {}
+        self._connect_stats: dict[ServiceType, dict[str, Any]] = {}
 
-        self.update_services(service_ids, False)
+        self.update_services(service_ids)
 
         _LOGGER.debug("ServiceManager initialized with services: %s", self._services)
 
@@ -39,15 +67,110 @@ class ServiceManager:
         _LOGGER.debug("Service %s disconnected successfully", service_type)
 
     async def connect_services(self):
-        """Connect to external services asynchronously (if any)."""
-        tasks = [service.connect() for service in self._services.values()]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        """Connect to external services and wait for the first attempts (if any).
 
-        for service_type, result in zip(self._services.keys(), results):
-            if isinstance(result, Exception):
-                _LOGGER.error("Service %s failed to connect: %s", service_type, result)
-            else:
-                _LOGGER.debug("Service %s connected successfully", service_type)
+        Services that fail to connect keep retrying in the background.
+        """
+        self.async_start()
+        await self.async_wait_ready(timeout=self._connect_timeout)
+
+    @callback
+    def async_start(self) -> None:
+        """Start connecting every service that is not connected or connecting."""
+        for service_type in self._services:
+            self._start_connect(service_type)
+
+    def _start_connect(self, service_type: ServiceType) -> None:
+        task = self._connect_tasks.get(service_type)
+        if task is not None and not task.done():
+            return
+        if self.ready(service_type).done():
+            return
+        self._connect_tasks[service_type] = self._hass.async_create_background_task(
+            self._async_connect_with_retry(service_type),
+            f"vicente_energy connect {service_type}",
+        )
+
+    def _retry_delay(self, retries: int) -> float:
+        """Return the backoff before retry number `retries`, with equal jitter."""
+        delay = min(self._retry_base * 2 ** (retries - 1), self._retry_max)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _async_connect_with_retry(self, service_type: ServiceType) -> None:
+        """Connect one service, retrying with backoff until it succeeds."""
+        service = self._services[service_type]
+        stats = self._connect_stats[service_type] = {
+            "service": type(service).__name__,
+            "state": "connecting",
+            "attempts": 0,
+            "retries": 0,
+            "connect_ms": None,
+            "last_error": None,
+        }
+        while True:
+            stats["attempts"] += 1
+            started = time.monotonic()
+            try:
+                async with asyncio.timeout(self._connect_timeout):
+                    await service.connect()
+            except Exception as err:  # noqa: BLE001 - any failure is retried
+                error = "timed out" if isinstance(err, TimeoutError) else str(err) or type(err).__name__
+                stats["retries"] += 1
+                stats["state"] = "retrying"
+                stats["last_error"] = error
+                delay = self._retry_delay(stats["retries"])
+                _LOGGER.warning("Service %s failed to connect (%s); retrying in %.0f s",
+                                service_type, error, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            stats["connect_ms"] = round((time.monotonic() - started) * 1000.0, 1)
+            stats["state"] = "connected"
+            _LOGGER.debug("Service %s connected in %.1f ms after %d attempt(s)",
+                          service_type, stats["connect_ms"], stats["attempts"])
+            future = self.ready(service_type)
+            if not future.done():
+                future.set_result(True)
+            return
+
+    def ready(self, service_type: ServiceType) -> asyncio.Future:
+        """Return the future that completes once service_type first connects."""
+        future = self._ready.get(service_type)
+        if future is None:
+            future = self._ready[service_type] = self._hass.loop.create_future()
+        return future
+
+    def is_ready(self, *service_types: ServiceType) -> bool:
+        """Return True if the given services (default: all) have connected."""
+        return all(self.ready(service_type).done() for service_type in service_types or self._services)
+
+    async def async_wait_ready(self, *service_types: ServiceType,
+                               timeout: Optional[float] = READY_TIMEOUT_SECONDS) -> bool:
+        """Wait until the given services (default: all) have connected.
+
+        Returns False if some are still not connected after timeout seconds.
+        """
+        futures = [self.ready(service_type) for service_type in service_types or self._services]
+        pending = [future for future in futures if not future.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        return all(future.done() for future in futures)
+
+    @property
+    def diagnostics(self) -> dict[str, dict[str, Any]]:
+        """Return per-service connect state, latency and retry counts."""
+        return {str(service_type): dict(stats) for service_type, stats in self._connect_stats.items()}
+
+    async def async_stop(self) -> None:
+        """Stop any connect retries and disconnect every service."""
+        tasks = list(self._connect_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._connect_tasks.clear()
+        for stats in self._connect_stats.values():
+            stats["state"] = "stopped"
+        await self.disconnect_services()
 
     async def disconnect_services(self):
         """Disconnect external services asynchronously (if any)."""
@@ -60,35 +183,76 @@ class ServiceManager:
             else:
                 _LOGGER.debug("Service %s disconnected successfully", service_type)
 
-    def update_services(self, service_ids: dict[ServiceType, str], connect: bool = True):
-        """Dynamically update the service types and reinitialize services."""
-        # Extract service types from the service_ids dictionary
-        for service_type, service_name in service_ids.items():
-            if service_name != self._services.get(service_type):
-                # Get the valid service class mapping for this service type
-                service_type_enum = ServiceType(service_type)
-                valid_services = SERVICE_CLASS_MAP.get(service_type_enum)
-                if not valid_services:
-                    raise ValueError(f"No services defined for service type '{service_type}'")
-
-
-                # Get the service class for the provided service name
-                service_class = valid_services.get(service_name)
-                if not service_class:
-                    raise ValueError(
-                        f"Service '{service_name}' is not valid for service type '{service_type}'. "
-                        f"Valid options: {list(valid_services.keys())}"
-                    )
-
-                # Nothing to change if the existing service is the name as the new one
-                existing_service = self._services.get(service_type)
-                if existing_service is None or service_class != existing_service.__name__:
-                    # Instantiate and store the service instance
-                    self._services[service_type] = service_class()
-
-                    # Optionally have the service instance connect
-                    if connect:
-                        service_class.connect()
+    def _service_class(self, service_type: ServiceType, service_name: str) -> type[VEService]:
+        """Return the class registered under service_name for service_type."""
+        valid_services = SERVICE_CLASS_MAP.get(ServiceType(service_type))
+        if not valid_services:
+            raise ValueError(f"No services defined for service type '{service_type}'")
+
+        service_class = valid_services.get(service_name)
+        if not service_class:
+            raise ValueError(
+                f"Service '{service_name}' is not valid for service type '{service_type}'. "
+                f"Valid options: {list(valid_services.keys())}"
+            )
+        return service_class
+
+    def update_services(self, service_ids: dict[ServiceType, str]) -> dict[ServiceType, Optional[VEService]]:
+        """Bind service_ids, instantiating only the service types whose class changed.
+
+        Unchanged services keep their instance, subscriptions and cached
+        values. Callbacks registered on a replaced service move to its
+        successor. Returns the replaced instances (None for new bindings),
+        which are not disconnected here; async_update_services does that.
+        """
+        # Validate everything before replacing anything
+        classes = {
+            ServiceType(service_type): self._service_class(service_type, service_name)
+            for service_type, service_name in service_ids.items()
+        }
+
+        replaced: dict[ServiceType, Optional[VEService]] = {}
+        for service_type, service_class in classes.items():
+            existing_service = self._services.get(service_type)
+            # Nothing to change if the existing service is the same class as the new one
+            if type(existing_service) is service_class:
+                continue
+
+            service = service_class(self._hass)
+            if existing_service is not None:
+                service.adopt_callbacks(existing_service)
+            self._services[service_type] = service
+            replaced[service_type] = existing_service
+        return replaced
+
+    async def async_update_services(self, service_ids: dict[ServiceType, str]) -> list[ServiceType]:
+        """Swap in the changed services and connect them; leave the rest running.
+
+        Returns the service types that were replaced.
+        """
+        started = time.monotonic()
+        replaced = self.update_services(service_ids)
+        for service_type, old_service in replaced.items():
+            task = self._connect_tasks.pop(service_type, None)
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            if old_service is not None:
+                try:
+                    await old_service.disconnect()
+                except Exception as err:  # noqa: BLE001 - the new service must still start
+                    _LOGGER.error("Service %s failed to disconnect: %s", service_type, err)
+
+            # Consumers waiting on the new service see it connect
+            future = self._ready.pop(service_type, None)
+            if future is not None and not future.done():
+                self._ready[service_type] = future
+            self._start_connect(service_type)
+
+        if replaced:
+            _LOGGER.debug("Replaced services %s in %.1f ms", list(replaced),
+                          (time.monotonic() - started) * 1000.0)
+        return list(replaced)
 
     def get_service(self, service_type: ServiceType) -> VEService:
         service = self._services.get(service_type)
@@ -99,6 +263,37 @@ class ServiceManager:
             )
         return service
 
+    @property
+    def forecast_service(self) -> VEService | None:
+        """Return the configured forecast service, if any."""
+        return self._services.get(ServiceType.FORECAST_SERVICE)
+
+    async def get_forecast(self) -> np.ndarray | list[float]:
+        """Return the hourly solar forecast starting at local midnight today.
+
+        This covers at least today and tomorrow (48 values), and more when
+        the forecast service has a longer horizon.
+        """
+        service = self.forecast_service
+        if service is None:
+            return []
+        try:
+            return await service.get_hourly_forecast_array()
+        except (ValueError, TypeError, IndexError) as err:
+            _LOGGER.debug("Forecast service data unavailable: %s", err)
+            return []
+
+    async def get_forecast_quantiles(self) -> Optional[np.ndarray]:
+        """Return P10/P50/P90 hourly forecast rows, if the service provides them."""
+        service = self.forecast_service
+        if service is None:
+            return None
+        try:
+            return await service.get_hourly_quantile_array()
+        except (ValueError, TypeError, IndexError) as err:
+            _LOGGER.debug("Forecast quantiles unavailable: %s", err)
+            return None
+
     def register_service_callback(self, service_type: ServiceType, cb: VEEntityStateChangeHandler):
         service: VEService = self.get_service(service_type)
         service.register_callback(cb)
@@ -1,32 +1,42 @@
 """Service implementations for SolarEdge devices."""
 
 import logging
+from homeassistant.const import UnitOfEnergy, UnitOfPower
 from homeassistant.core import HomeAssistant
 
 from .grid_service import GridService
 from .battery_service import BatteryService
+from .discovery import EntityRole
 from .service import VEEntityStateChangeHandler
 from .solar_service import SolarService
+from .sunspec_modbus import InverterReading, async_get_sunspec_client
 
 _LOGGER = logging.getLogger(__name__)
 
+SOLAREDGE_PLATFORM = "solaredge_modbus"
+# Reported as the changed entity when a direct inverter read updates the service
+SOLAREDGE_INVERTER = "solaredge_inverter"
+
 class SolarEdgeSolarService(SolarService):
     """Solar production service for SolarEdge inverters through the local MODBUS interface."""
 
+    _discovery_platform = SOLAREDGE_PLATFORM
+    _entity_roles = {
+        "ac_power": EntityRole("sensor", ("ac_power",), "sensor.solaredge_ac_power"),
+        "ac_energy": EntityRole("sensor", ("ac_energy_kwh",), "sensor.solaredge_ac_energy_kwh"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.solaredge_ac_power": self._handle_now_change,
-            "sensor.solaredge_ac_energy_kwh": self._handle_today_change,
+            "ac_power": self._handle_now_change,
+            "ac_energy": self._handle_today_change,
         }
         super().__init__(hass, handlers)
 
     def _handle_now_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse SolarEdge production now from state: %s",
-                            new_state.state)
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        if value is None:
             return False
 
         if self._now_production_kw == value:
@@ -37,10 +47,8 @@ class SolarEdgeSolarService(SolarService):
         return True
 
     def _handle_today_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse SolarEdge production today energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_production_kwh == value:
@@ -50,3 +58,26 @@ class SolarEdgeSolarService(SolarService):
         _LOGGER.debug("Today's SolarEdge production today updated: %.2f kWh", value)
         return True
 
+
+class SolarEdgeModbusSolarService(SolarService):
+    """Solar production service reading the inverter's SunSpec registers directly."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        super().__init__(hass)
+
+    async def connect(self):
+        client = async_get_sunspec_client(self._hass)
+        if client is None:
+            raise RuntimeError("SolarEdge Modbus connection is not configured")
+        # Fails, and is retried by the service manager, while the inverter is unreachable
+        reading = await client.async_get_snapshot()
+        self._unsubs.append(client.async_add_listener(self._handle_reading))
+        self._handle_reading(reading)
+
+    def _handle_reading(self, reading: InverterReading) -> None:
+        if (self._now_production_kw, self._today_production_kwh) == (reading.ac_power_kw,
+                                                                      reading.today_kwh):
+            return
+        self._now_production_kw = reading.ac_power_kw
+        self._today_production_kwh = reading.today_kwh
+        self._notify_callbacks(SOLAREDGE_INVERTER, None, None)
@@ -1,116 +1,194 @@
 """Service wrapper for Solcast solar forecast sensors."""
 
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
 import logging
-from typing import List, Optional, cast
+from typing import Any, Optional
 
+import numpy as np
+
+from homeassistant.const import UnitOfPower
 from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
 
 from .service import VEEntityStateChangeHandler
 from .forecast_service import ForecastService
 
 _LOGGER = logging.getLogger(__name__)
 
+FORECAST_DAYS = 7
+# Solcast reports the mean power (kW) of each half-hour period
+PERIOD_HOURS = 0.5
+
+FORECAST_ENTITIES = (
+    "sensor.solcast_pv_forecast_forecast_today",
+    "sensor.solcast_pv_forecast_forecast_tomorrow",
+    *(f"sensor.solcast_pv_forecast_forecast_day_{day}" for day in range(3, FORECAST_DAYS + 1)),
+)
+POWER_NOW_ENTITY = "sensor.solcast_pv_forecast_power_now"
+
+# Rows of the parsed forecast; missing P10/P90 estimates fall back to P50
+QUANTILE_KEYS = ("pv_estimate10", "pv_estimate", "pv_estimate90")
+P10, P50, P90 = range(3)
+
+
+def _period_start(value: Any) -> datetime:
+    """Return a period_start value (datetime or ISO string) in local time."""
+    if isinstance(value, str):
+        parsed = dt_util.parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Invalid period_start {value!r}")
+        value = parsed
+    if not isinstance(value, datetime):
+        raise ValueError(f"Invalid period_start {value!r}")
+    return dt_util.as_local(value)
+
+
+def _estimate(entry: dict, key: str) -> float:
+    value = entry.get(key)
+    if value is None:
+        value = entry.get("pv_estimate")
+    return float(value or 0.0)
+
+
+def parse_detailed_forecast(entries: Iterable[dict]) -> dict[date, np.ndarray]:
+    """Bin detailedForecast periods into P10/P50/P90 x 24 local-hour kWh per date.
+
+    Periods are placed by their period_start in local time, so on DST days
+    the repeated hour accumulates both periods and the skipped hour stays 0.
+    """
+    dates: list[date] = []
+    hours: list[int] = []
+    kwh: list[list[float]] = []
+    for entry in entries:
+        start = _period_start(entry["period_start"])
+        dates.append(start.date())
+        hours.append(start.hour)
+        kwh.append([_estimate(entry, key) * PERIOD_HOURS for key in QUANTILE_KEYS])
+
+    unique_dates = sorted(set(dates))
+    row_of = {day: row for row, day in enumerate(unique_dates)}
+    table = np.zeros((len(unique_dates), 24, len(QUANTILE_KEYS)))
+    np.add.at(table, ([row_of[day] for day in dates], hours), kwh)
+    return dict(zip(unique_dates, table.transpose(0, 2, 1)))
+
+
 class SolcastService(ForecastService):
-    """Use Solcast sensors to provide forecast data."""
+    """Use Solcast sensors to provide forecast data.
+
+    Each forecast sensor's detailedForecast is parsed once per state change
+    into per-date P10/P50/P90 hourly rows. Those are assembled into a
+    read-only array that starts at local midnight today and spans up to
+    FORECAST_DAYS days.
+    It is rebuilt only after new data or at the day rollover, and every
+    consumer shares it.
+    """
+
+    # The forecast lives in the detailedForecast attribute
+    _attribute_entities = frozenset(FORECAST_ENTITIES)
 
     def __init__(self, hass: HomeAssistant) -> None:
-        self._today_hourly_production_kwh: Optional[List[float]] = None
-        self._tomorrow_hourly_production_kwh: Optional[List[float]] = None
+        self._daily_kwh: dict[date, np.ndarray] = {}
+        self._quantiles: Optional[np.ndarray] = None
+        self._forecast: Optional[np.ndarray] = None
+        self._forecast_day: Optional[date] = None
 
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.solcast_pv_forecast_forecast_today": self._handle_today_production_change,
-            "sensor.solcast_pv_forecast_forecast_tomorrow": self._handle_tomorrow_production_change,
-            "sensor.solcast_pv_forecast_power_now": self._handle_now_production_change,
+            entity_id: self._handle_forecast_change for entity_id in FORECAST_ENTITIES
         }
+        handlers[POWER_NOW_ENTITY] = self._handle_now_production_change
         super().__init__(hass, handlers)
 
     async def connect(self):
         await super().connect()
-        await self.get_today_production_kwh()
-        await self.get_tomorrow_production_kwh()
+        for entity_id in FORECAST_ENTITIES:
+            state = self._hass.states.get(entity_id)
+            if state is not None:
+                self._ingest(state)
+
+    def _ingest(self, state: State) -> bool:
+        """Parse one forecast sensor into the per-date rows."""
+        detailed_forecast = state.attributes.get("detailedForecast")
+        if not detailed_forecast:
+            _LOGGER.debug("%s has no detailedForecast attribute", state.entity_id)
+            return False
+        try:
+            daily_kwh = parse_detailed_forecast(detailed_forecast)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Failed to parse Solcast forecast from %s: %s", state.entity_id, err)
+            return False
 
-    async def get_today_production_kwh(self) -> float:
-        if self._today_hourly_production_kwh is None or len(self._today_hourly_production_kwh) != 24:
-            await self._get_today_hour_production_kwh(0)
+        self._daily_kwh.update(daily_kwh)
+        self._quantiles = None
+        self._mark_forecast_issued(state)
+        return True
 
+    def get_quantile_array(self) -> np.ndarray:
+        """Return P10/P50/P90 hourly kWh rows from local midnight today.
+
+        The array spans today through the last forecast day.
+        """
+        today = dt_util.now().date()
+        if self._quantiles is not None and self._forecast_day == today:
+            return self._quantiles
+
+        self._daily_kwh = {day: rows for day, rows in self._daily_kwh.items() if day >= today}
+        last_day = max(self._daily_kwh, default=today)
+        # Always cover today and tomorrow so per-hour lookups stay valid
+        days = min(max((last_day - today).days + 1, 2), FORECAST_DAYS)
+        empty = np.zeros((len(QUANTILE_KEYS), 24))
+        quantiles = np.concatenate([
+            self._daily_kwh.get(today + timedelta(days=offset), empty) for offset in range(days)
+        ], axis=1)
+        quantiles.flags.writeable = False
+
+        self._quantiles = quantiles
+        self._forecast = quantiles[P50]
+        self._forecast_day = today
+        self._today_production_kwh = float(quantiles[P50, :24].sum())
+        self._tomorrow_production_kwh = float(quantiles[P50, 24:48].sum())
+        return quantiles
+
+    def get_forecast_array(self) -> np.ndarray:
+        """Return P50 hourly kWh from local midnight today through the last forecast day."""
+        self.get_quantile_array()
+        return self._forecast
+
+    async def get_hourly_forecast_array(self) -> np.ndarray:
+        return self.get_forecast_array()
+
+    async def get_hourly_quantile_array(self) -> Optional[np.ndarray]:
+        return self.get_quantile_array()
+
+    async def get_today_production_kwh(self) -> float:
+        self.get_forecast_array()
         return self._today_production_kwh
 
     async def get_tomorrow_production_kwh(self) -> float:
-        if self._tomorrow_hourly_production_kwh is None or len(self._tomorrow_hourly_production_kwh) != 24:
-            await self._get_today_hour_production_kwh(0)
-
+        self.get_forecast_array()
         return self._tomorrow_production_kwh
 
     async def _get_today_hour_production_kwh(self, hour: int) -> float:
-        if self._today_hourly_production_kwh is None or len(self._today_hourly_production_kwh) != 24:
-            state = self._hass.states.get("sensor.solcast_pv_forecast_forecast_today")
-            self._today_hourly_production_kwh = self._get_hourly_production_forecast(state)
-
-        self._today_production_kwh = sum(cast(List[float], self._today_hourly_production_kwh))
-
-        return self._today_hourly_production_kwh[hour]
+        return float(self.get_forecast_array()[hour])
 
     async def _get_tomorrow_hour_production_kwh(self, hour: int) -> float:
-        if self._tomorrow_hourly_production_kwh is None or len(self._tomorrow_hourly_production_kwh) != 24:
-            state = self._hass.states.get("sensor.solcast_pv_forecast_forecast_tomorrow")
-            self._tomorrow_hourly_production_kwh = self._get_hourly_production_forecast(state)
-
-        self._tomorrow_production_kwh = sum(cast(List[float], self._tomorrow_hourly_production_kwh))
+        return float(self.get_forecast_array()[24 + hour])
 
-        return self._tomorrow_hourly_production_kwh[hour]
-
-    def _handle_today_production_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
-        try:
-            self._today_hourly_production_kwh = self._get_hourly_production_forecast(new_state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production today from state: %s", new_state.state)
-            return False
-
-        self._today_production_kwh = sum(cast(List[float], self._today_hourly_production_kwh))
-        _LOGGER.debug("Forecast.Solar production today now updated")
-        return True
-
-    def _handle_tomorrow_production_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
-        try:
-            self._tomorrow_hourly_production_kwh = self._get_hourly_production_forecast(new_state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production tomorrow from state: %s", new_state.state)
+    def _handle_forecast_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
+        if not self._ingest(new_state):
             return False
-
-        self._tomorrow_production_kwh = sum(cast(List[float], self._tomorrow_hourly_production_kwh))
-        _LOGGER.debug("Forecast.Solar production tomorrow now updated")
+        _LOGGER.debug("Solcast forecast updated from %s", entity_id)
         return True
 
     def _handle_now_production_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Forecast.Solar production today from state: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        if value is None:
             return False
 
         if self._now_production_kw == value:
             return False
 
         self._now_production_kw = value
-        _LOGGER.debug("Forecast.Solar production now updated: %.2f", value)
+        _LOGGER.debug("Solcast production now updated: %.2f", value)
         return True
-
-    def _get_hourly_production_forecast(self, state) -> List[float]:
-        if state is None or state.attributes.get("detailedForecast") is None:
-            raise ValueError("The detailedForecast sensor attribute is unavailable.")
-
-        detailed_forecast = state.attributes["detailedForecast"]
-
-        if len(detailed_forecast) < 48:
-            raise ValueError(f"Expected at least 48 forecast entries, got {len(detailed_forecast)}.")
-
-        hourly_forecast = []
-        for i in range(0, 48, 2):
-            estimate1 = detailed_forecast[i].get("pv_estimate", 0)
-            estimate2 = detailed_forecast[i + 1].get("pv_estimate", 0)
-            hourly_total = float(estimate1) + float(estimate2)
-            hourly_forecast.append(hourly_total)
-
-        return hourly_forecast
-
@@ -0,0 +1,188 @@
+"""Direct SunSpec Modbus TCP reader for SolarEdge inverters."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import struct
+import time
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from ..const import DATA_SUNSPEC_CLIENT
+from .daily_energy import DailyEnergyCounters
+from .polling_client import PollingClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 1502
+DEFAULT_UNIT_ID = 1
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+READ_HOLDING_REGISTERS = 0x03
+
+# SunSpec inverter model (101/102/103) as mapped by SolarEdge, read as one block
+INVERTER_BLOCK_START = 40069
+INVERTER_BLOCK_COUNT = 40
+INVERTER_MODELS = (101, 102, 103)
+
+_MBAP = struct.Struct(">HHHB")
+_READ_REQUEST = struct.Struct(">BHH")
+# Fields within the inverter block, as (struct, register offset)
+_MODEL = (struct.Struct(">H"), 0)
+_AC_POWER = (struct.Struct(">hh"), 14)  # W, scale factor
+_AC_ENERGY = (struct.Struct(">Ih"), 24)  # acc32 Wh, scale factor
+_STATUS = (struct.Struct(">H"), 38)
+
+
+class ModbusError(Exception):
+    """The device returned a Modbus exception or a malformed response."""
+
+
+# readexactly() raises asyncio.IncompleteReadError, an EOFError, when the
+# inverter closes the connection mid-frame
+READ_ERRORS = (OSError, TimeoutError, EOFError, ModbusError)
+
+
+@dataclass(frozen=True)
+class InverterReading:
+    """One decoded read of the inverter block."""
+
+    ac_power_kw: float
+    lifetime_kwh: float
+    today_kwh: float
+    status: int
+    fetched_at: float
+
+
+def _field(block: memoryview, field: tuple[struct.Struct, int]) -> tuple:
+    layout, register = field
+    return layout.unpack_from(block, register * 2)
+
+
+def decode_inverter_block(block: memoryview) -> tuple[float, float, int]:
+    """Return (AC power W, lifetime energy Wh, status) from the inverter block.
+
+    Values are unpacked in place from the response buffer and scaled by
+    their SunSpec scale factors (value * 10 ** sf).
+    """
+    (model,) = _field(block, _MODEL)
+    if model not in INVERTER_MODELS:
+        raise ModbusError(f"Register {INVERTER_BLOCK_START} holds model {model}, not an inverter")
+    power, power_sf = _field(block, _AC_POWER)
+    energy, energy_sf = _field(block, _AC_ENERGY)
+    (status,) = _field(block, _STATUS)
+    return power * 10.0 ** power_sf, energy * 10.0 ** energy_sf, status
+
+
+@callback
+def async_get_sunspec_client(hass: HomeAssistant) -> Optional["SunSpecModbusClient"]:
+    """Return the configured inverter reader, if any."""
+    return hass.data.get(DATA_SUNSPEC_CLIENT)
+
+
+@callback
+def async_setup_sunspec_client(hass: HomeAssistant, host: str, port: int = DEFAULT_PORT,
+                               unit_id: int = DEFAULT_UNIT_ID,
+                               poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> "SunSpecModbusClient":
+    """Create, or reconfigure, the inverter reader shared by the SolarEdge services."""
+    client = async_get_sunspec_client(hass)
+    if client is None:
+        client = hass.data[DATA_SUNSPEC_CLIENT] = SunSpecModbusClient(
+            hass, host, port, unit_id, poll_interval)
+    else:
+        client.reconfigure(host, port, unit_id, poll_interval)
+    return client
+
+
+class SunSpecModbusClient(PollingClient[InverterReading]):
+    """Poll a SunSpec inverter over one persistent Modbus TCP connection.
+
+    Each poll is a single read of the contiguous inverter register block.
+    Requests are serialized on the connection, which is reopened after any
+    error. The lifetime energy counter is turned into today's energy from
+    the first reading of the local day, which is kept across restarts.
+    """
+
+    _name = "sunspec"
+    _poll_errors = READ_ERRORS
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int = DEFAULT_PORT,
+                 unit_id: int = DEFAULT_UNIT_ID,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> None:
+        """Configure the inverter address; nothing is read until started."""
+        super().__init__(hass, poll_interval)
+        self._host = host
+        self._port = port
+        self._unit_id = unit_id
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self._transaction_id = 0
+        self._daily = DailyEnergyCounters(hass, self._name)
+
+    def reconfigure(self, host: str, port: int, unit_id: int, poll_interval: float) -> None:
+        """Apply new settings without dropping listeners."""
+        if (host, port, unit_id) != (self._host, self._port, self._unit_id):
+            self._host, self._port, self._unit_id = host, port, unit_id
+            self._close()
+            self._daily.reset()
+        self._set_poll_interval(poll_interval)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling and close the connection."""
+        super().async_stop()
+        self._close()
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def async_read_registers(self, address: int, count: int) -> memoryview:
+        """Read count holding registers from address in one request."""
+        async with self._lock:
+            try:
+                async with asyncio.timeout(REQUEST_TIMEOUT_SECONDS):
+                    return await self._async_request(address, count)
+            except READ_ERRORS:
+                # The stream may hold a partial frame; start over next time
+                self._close()
+                raise
+
+    async def _async_request(self, address: int, count: int) -> memoryview:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        pdu = _READ_REQUEST.pack(READ_HOLDING_REGISTERS, address, count)
+        self._writer.write(_MBAP.pack(self._transaction_id, 0, len(pdu) + 1, self._unit_id) + pdu)
+        await self._writer.drain()
+
+        header = await self._reader.readexactly(_MBAP.size)
+        transaction_id, protocol_id, length, _unit = _MBAP.unpack(header)
+        body = memoryview(await self._reader.readexactly(length - 1))
+        if transaction_id != self._transaction_id or protocol_id != 0:
+            raise ModbusError("Mismatched Modbus response")
+        if body[0] == READ_HOLDING_REGISTERS | 0x80:
+            raise ModbusError(f"Modbus exception {body[1]} reading {address}")
+        if body[0] != READ_HOLDING_REGISTERS or body[1] != count * 2 or len(body) != count * 2 + 2:
+            raise ModbusError("Malformed Modbus response")
+        return body[2:]
+
+    async def _async_fetch_snapshot(self) -> InverterReading:
+        await self._daily.async_load()
+        block = await self.async_read_registers(INVERTER_BLOCK_START, INVERTER_BLOCK_COUNT)
+        power_w, energy_wh, status = decode_inverter_block(block)
+        today_wh = self._daily.today("ac_energy", energy_wh, dt_util.now().date())
+        return InverterReading(
+            ac_power_kw=power_w / 1000.0,
+            lifetime_kwh=energy_wh / 1000.0,
+            today_kwh=today_wh / 1000.0,
+            status=status,
+            fetched_at=time.monotonic(),
+        )
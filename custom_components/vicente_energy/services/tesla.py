@@ -1,30 +1,50 @@
 """Service implementations for Powerwall devices."""
 
 import logging
+from typing import Optional
+
+from homeassistant.const import PERCENTAGE, UnitOfEnergy
 from homeassistant.core import HomeAssistant
 
 from .battery_service import BatteryService
+from .discovery import EntityRole
+from .gateway import (
+    GatewayBatteryService,
+    GatewayGridService,
+    GatewayService,
+    GatewaySolarService,
+)
+from .powerwall_client import PowerwallClient, async_get_powerwall_client
 from .service import VEEntityStateChangeHandler
 
 _LOGGER = logging.getLogger(__name__)
 
+POWERWALL_PLATFORM = "powerwall"
+# Reported as the changed entity when a gateway poll updates a service
+POWERWALL_GATEWAY = "powerwall_gateway"
+
 class PowerwallBatteryService(BatteryService):
     """Battery service for Tesla Powerwall systems."""
 
+    _discovery_platform = POWERWALL_PLATFORM
+    _entity_roles = {
+        "charge": EntityRole("sensor", ("battery_capacity", "charge"), "sensor.battery_capacity"),
+        "battery_import": EntityRole("sensor", ("battery_import",), "sensor.battery_import"),
+        "battery_export": EntityRole("sensor", ("battery_export",), "sensor.battery_export"),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         # Define handlers
         handlers: dict[str, VEEntityStateChangeHandler] = {
-            "sensor.battery_capacity": self._handle_soc_change,
-            "sensor.battery_import": self._handle_today_charge_change,
-            "sensor.battery_export": self._handle_today_discharge_change,
+            "charge": self._handle_soc_change,
+            "battery_import": self._handle_today_charge_change,
+            "battery_export": self._handle_today_discharge_change,
         }
         super().__init__(hass, handlers)
 
     def _handle_soc_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Powerwall SOC from state: %s", new_state.state)
+        value = self._parse_state(new_state, PERCENTAGE)
+        if value is None:
             return False
 
         if self._battery_soc == value:
@@ -35,10 +55,8 @@ class PowerwallBatteryService(BatteryService):
         return True
 
     def _handle_today_charge_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Powerwall charge energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_charge_kwh == value:
@@ -49,10 +67,8 @@ class PowerwallBatteryService(BatteryService):
         return True
 
     def _handle_today_discharge_change(self, entity_id, old_state, new_state) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.warning("Failed to parse Powerwall discharge energy: %s", new_state.state)
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is None:
             return False
 
         if self._today_discharge_kwh == value:
@@ -61,3 +77,25 @@ class PowerwallBatteryService(BatteryService):
         self._today_discharge_kwh = value
         _LOGGER.debug("Today's Powerwall discharge updated: %.2f kWh", value)
         return True
+
+
+class PowerwallGatewayService(GatewayService):
+    """Feed a service from the shared Powerwall gateway client."""
+
+    _gateway_entity = POWERWALL_GATEWAY
+    _gateway_name = "Powerwall gateway"
+
+    def _get_client(self) -> Optional[PowerwallClient]:
+        return async_get_powerwall_client(self._hass)
+
+
+class PowerwallLocalBatteryService(PowerwallGatewayService, GatewayBatteryService):
+    """Battery service reading the Powerwall gateway directly."""
+
+
+class PowerwallLocalGridService(PowerwallGatewayService, GatewayGridService):
+    """Grid service reading the Powerwall gateway directly."""
+
+
+class PowerwallLocalSolarService(PowerwallGatewayService, GatewaySolarService):
+    """Solar production service reading the Powerwall gateway directly."""
@@ -3,14 +3,16 @@
 import logging
 from typing import Optional
 
+from homeassistant.const import UnitOfEnergy, UnitOfPower
 from homeassistant.core import HomeAssistant, State
 
 from .ev_charger_service import (
     EVChargerService,
     EVChargerState,
+    TokenBucket,
     convert_amps_to_kw,
-    convert_kw_to_amps,
 )
+from .discovery import EntityRole
 from .service import VEEntityStateChangeHandler
 
 WALLBOX_STATE_MAP = {
@@ -24,70 +26,71 @@ WALLBOX_STATE_MAP = {
     "waiting in queue by eco-smart": EVChargerState.CHARGER_QUEUED,
 }
 
+# The Wallbox cloud API rate-limits frequent current changes
+WALLBOX_WRITE_BURST = 2
+WALLBOX_WRITE_RATE_PER_MINUTE = 2.0
+
 _LOGGER = logging.getLogger(__name__)
 
+WALLBOX_PLATFORM = "wallbox"
+
 class WallboxEVChargerService(EVChargerService):
     """Interface with a Wallbox charger via HA entities."""
 
+    _discovery_platform = WALLBOX_PLATFORM
+    _entity_roles = {
+        "charging_power": EntityRole("sensor", ("charging_power",)),
+        "added_energy": EntityRole("sensor", ("added_energy",)),
+        "status_description": EntityRole("sensor", ("status_description",)),
+        "max_charging_current": EntityRole("number", ("maximum_charging_current",
+                                                      "max_charging_current")),
+    }
+
     def __init__(self, hass: HomeAssistant) -> None:
         self._location: Optional[str] = None
 
-        super().__init__(hass)
+        # Define handlers
+        handlers: dict[str, VEEntityStateChangeHandler] = {
+            "charging_power": self._handle_power_change,
+            "added_energy": self._handle_added_energy_change,
+            "status_description": self._handle_charger_state_change,
+        }
+        super().__init__(hass, handlers)
         self._max_charging_power_amps = 48
+        self._write_bucket = TokenBucket(WALLBOX_WRITE_BURST, WALLBOX_WRITE_RATE_PER_MINUTE)
 
     async def connect(self):
-        # Step 1: Find Wallbox sensor ending with _charging_power
-        for state in self._hass.states.async_all():
-            entity_id = state.entity_id
-            if entity_id.startswith("sensor.wallbox_") and entity_id.endswith("_charging_power"):
-                # entity_id = "sensor.wallbox_vicentecanyon1_charging_power"
-                # strip domain and "sensor.wallbox_"
-                entity_suffix = entity_id[len("sensor.wallbox_"):]
-                # "vicentecanyon1_charging_power" → ["vicentecanyon1", "charging", "power"]
-                parts = entity_suffix.split("_")
-                self._location = "_".join(parts[:-2])  # strip off trailing 'charging_power'
-                break
-
-        if not self._location:
-            raise RuntimeError("Wallbox location not found in entity namespace")
-
-        # Step 2: Construct full entity IDs
-        def full(name: str) -> str:
-            return f"sensor.wallbox_{self._location}_{name}"
-
-        # Step 3: Define handlers
-        handlers: dict[str, VEEntityStateChangeHandler] = {
-            full("charging_power"): self._handle_power_change,
-            full("status_description"): self._handle_charger_state_change,
-        }
+        await super().connect()
 
-        # Step 4: Set up tracking
-        await self.set_handler_map(handlers)
+        # The charger's entity IDs name its location, e.g.
+        # "sensor.wallbox_vicentecanyon1_charging_power" → "vicentecanyon1"
+        power_entity = self._entities.get("charging_power")
+        if power_entity is None:
+            await self.disconnect()
+            raise RuntimeError("Wallbox charger not found in the entity registry")
+        object_id = power_entity.split(".", 1)[1]
+        self._location = object_id.removeprefix("wallbox_").removesuffix("_charging_power")
 
     def get_location(self) -> Optional[str]:
         return self._location
 
-    async def set_charging_power_amps(self, power_amps: int) -> None:
+    async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+        """Set the charging current; errors reach the base class, which retries."""
         _LOGGER.debug("Setting charging power to %.2f kW (%.1f A)",
                       convert_amps_to_kw(power_amps, self._voltage), power_amps)
 
-        try:
-            await self._hass.services.async_call(
-                "number",
-                "set_value",
-                {
-                    "entity_id": f"number.wallbox_{self._location}_max_charging_current",
-                    "value": round(power_amps)
-                },
-                blocking = True
-            )
-            _LOGGER.debug("Wallbox charging power changed: %.2f kW", power_amps)
-        except ValueError:
-            _LOGGER.debug("Unable to change Wallbox charging power value: %.2f kW", power_amps)
-
-    async def set_charging_power_kw(self, power_kw: float) -> None:
-        await self.set_charging_power_amps(convert_kw_to_amps(power_kw, self._voltage))
-
+        await self._hass.services.async_call(
+            "number",
+            "set_value",
+            {
+                "entity_id": self._entities.get(
+                    "max_charging_current",
+                    f"number.wallbox_{self._location}_max_charging_current"),
+                "value": round(power_amps)
+            },
+            blocking = True
+        )
+        _LOGGER.debug("Wallbox charging power changed: %.2f kW", power_amps)
 
     def _handle_charger_state_change(self, entity_id: str,
                                      old_state: State, new_state: State) -> bool:
@@ -106,10 +109,9 @@ class WallboxEVChargerService(EVChargerService):
         return True
 
     def _handle_power_change(self, entity_id: str, old_state: State, new_state: State) -> bool:
-        try:
-            value = float(new_state.state)
-        except ValueError:
-            _LOGGER.debug("Ignoring bad charging power value: %s", new_state.state.lower())
+        value = self._parse_state(new_state, UnitOfPower.KILO_WATT)
+        self._record_power_sample(new_state, value)
+        if value is None:
             return False
 
         if self._charging_power_kw == value:
@@ -118,3 +120,11 @@ class WallboxEVChargerService(EVChargerService):
         self._charging_power_kw = value
         _LOGGER.debug("Charging power updated: %.2f kW", value)
         return True
+
+    def _handle_added_energy_change(self, entity_id: str,
+                                    old_state: State, new_state: State) -> bool:
+        # Only cross-checks the integrated energy; nothing subscribers read changes
+        value = self._parse_state(new_state, UnitOfEnergy.KILO_WATT_HOUR)
+        if value is not None:
+            self._energy.add_counter(value)
+        return False
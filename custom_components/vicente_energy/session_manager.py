@@ -1,10 +1,46 @@
 from datetime import datetime, timedelta
 
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN
+from .services import ServiceType
+from .services.ev_charger_service import EVChargerState
+
+# Fields pushed to the session sensors when they change
+SESSION_FIELDS = (
+    "session_start_time",
+    "session_duration",
+    "session_kwh_used",
+    "session_available_after",
+    "charge_state",
+)
+
+# Session transitions driven by the charger's reported state. Paused,
+# errored and unknown states leave the session as it is.
+CHARGER_SESSION_STATES = {
+    EVChargerState.CHARGER_CHARGING: "charging",
+    EVChargerState.CHARGER_WAITING: "plugged",
+    EVChargerState.CHARGER_QUEUED: "plugged",
+    EVChargerState.CHARGER_LOCKED: "plugged",
+    EVChargerState.CHARGER_FINISHED: "done",
+    EVChargerState.CHARGER_DISCONNECTED: "unplugged",
+}
+
+
+def signal_session_updated(entry_id):
+    """Return the dispatcher signal carrying an entry's session changes."""
+    return f"{DOMAIN}_session_updated_{entry_id}"
+
 
 class SessionManager:
-    def __init__(self, hass, state_manager):
+    def __init__(self, hass, state_manager, entry_id, service_manager=None):
         self.hass = hass
         self.state = state_manager
+        self.signal = signal_session_updated(entry_id)
+        self._service_manager = service_manager
+        # Charger energy meter reading when the session started
+        self._energy_start = None
+        self._charger_state = None
         self.session_start_time = None
         self.session_kwh_used = 0.0
         self.session_duration = timedelta()
@@ -13,6 +49,12 @@ class SessionManager:
         self.active = False
         self.budget_remaining = 0.0
         self.estimates = None
+        self._published = self._fields()
+
+        charger = self._charger()
+        if charger is not None:
+            # Carried over to a replacement charger service by the service manager
+            charger.register_callback(self._handle_charger_update)
 
     def is_active(self):
         return self.charge_state == "active_session"
@@ -24,6 +66,7 @@ class SessionManager:
                 self.charge_state = "active_session"
                 self.session_start_time = datetime.now()
                 self.session_kwh_used = 0.0
+                self._energy_start = self._charger_energy()
                 self.active = True
         elif wallbox_state == "plugged":
             self.charge_state = "plugged_no_session"
@@ -38,6 +81,7 @@ class SessionManager:
                 self.finalize_session()
             self.charge_state = "unplugged"
             self.active = False
+        self._publish()
 
     def set_power_level(self, power_kw):
         self.current_power_kw = power_kw
@@ -45,19 +89,60 @@ class SessionManager:
     def set_estimates(self, estimates):
         self.estimates = estimates
         self.session_available_after = estimates.available_after_kwh
+        self._publish()
 
     def set_budget(self, budget_kwh):
         self.budget_remaining = budget_kwh
 
-    def increment_energy(self, elapsed_minutes):
-        if self.active and hasattr(self, "current_power_kw"):
-            added_kwh = self.current_power_kw * (elapsed_minutes / 60)
-            self.session_kwh_used += added_kwh
-            self.budget_remaining -= added_kwh
-            self.session_duration = datetime.now() - self.session_start_time
+    def _charger(self):
+        """Return the configured EV charger service, if any."""
+        if self._service_manager is None:
+            return None
+        try:
+            return self._service_manager.get_service(ServiceType.EV_CHARGER_SERVICE)
+        except ValueError:
+            return None
+
+    def _charger_energy(self):
+        charger = self._charger()
+        return charger.integrated_energy_kwh if charger is not None else None
+
+    def _handle_charger_update(self, entity_id, old_state, new_state):
+        """Follow the charger's state and energy after any of its entities change."""
+        charger = self._charger()
+        if charger is not None and charger.charger_state != self._charger_state:
+            self._charger_state = charger.charger_state
+            session_state = CHARGER_SESSION_STATES.get(self._charger_state)
+            if session_state == "plugged" and self.active:
+                # The charger idles within a session, e.g. at a 0 A setpoint
+                session_state = None
+            if session_state is not None:
+                if self.active:
+                    self._update_session_energy()
+                self.update_charge_state(session_state)
+                return
+        if self.active:
+            self._update_session_energy()
+            self._publish()
+
+    def _update_session_energy(self):
+        """Take the session's energy from the charger's integrated energy meter."""
+        meter = self._charger_energy()
+        if meter is None:
+            return
+        if self._energy_start is None or meter - self._energy_start < self.session_kwh_used:
+            # No baseline yet, or the meter went backwards, which only
+            # happens when the charger service was replaced and its
+            # integrator restarted; continue from the energy counted so far
+            self._energy_start = meter - self.session_kwh_used
+        added_kwh = meter - self._energy_start - self.session_kwh_used
+        self.session_kwh_used += added_kwh
+        self.budget_remaining -= added_kwh
+        self.session_duration = datetime.now() - self.session_start_time
 
     def finalize_session(self):
         """Finalize the current session, updating learned bias and storing last session usage."""
+        self._update_session_energy()
         if self.session_start_time:
             self.session_duration = datetime.now() - self.session_start_time
         # Update session bias using actual vs estimated session kWh
@@ -66,3 +151,14 @@ class SessionManager:
         # Record the total session kWh
         self.state.save_last_session_kwh(self.session_kwh_used)
 
+    def _fields(self):
+        return {name: getattr(self, name) for name in SESSION_FIELDS}
+
+    def _publish(self):
+        """Send the session fields that changed since the last signal, if any."""
+        fields = self._fields()
+        delta = {name: value for name, value in fields.items() if self._published[name] != value}
+        if delta:
+            self._published = fields
+            async_dispatcher_send(self.hass, self.signal, delta)
+
@@ -1,55 +1,146 @@
 """Adapter that provides solar forecast data to the estimator."""
 
+from collections.abc import Sequence
 import logging
 
+import numpy as np
+
+from homeassistant.const import UnitOfEnergy
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_FORECAST_CACHE_TTL_SECONDS
+from .forecast_cache import ForecastCache
+from .services import ServiceType
+from .services.numeric import async_get_parser
+
 _LOGGER = logging.getLogger(__name__)
 
+SOURCE_SERVICE = "service"
+SOURCE_ENTITIES = "entities"
+SOURCE_QUANTILES = "quantiles"
+MAX_FORECAST_HOURS = 7 * 24
+
 class SolarForecastAdapter:
-    """Fetch and correct solar forecast data from sensors or services."""
+    """Fetch and correct solar forecast data from sensors or services.
 
-    def __init__(self, hass, forecast_entities, state_manager, service_manager=None):
+    Parsed forecasts are held in a ForecastCache shared by every consumer of
+    this adapter. Entries are keyed by the forecast's issue time: the
+    forecast service's last forecast update, or the forecast sensors'
+    last_updated stamps. Forecast service callbacks drop the cached entry as
+    soon as a new forecast is issued.
+    """
+
+    def __init__(self, hass, forecast_entities, state_manager, service_manager=None,
+                 cache_ttl: float = DEFAULT_FORECAST_CACHE_TTL_SECONDS):
         """Initialize with Home Assistant objects and configuration."""
         self.hass = hass
         self.state = state_manager
         self.service_manager = service_manager
         self._forecast_entities = list(forecast_entities) if forecast_entities is not None else []
+        self._cache = ForecastCache(hass, cache_ttl)
+        if service_manager is not None:
+            try:
+                service_manager.register_service_callback(
+                    ServiceType.FORECAST_SERVICE, self._handle_forecast_change)
+            except ValueError:
+                _LOGGER.debug("No forecast service configured; using forecast sensors only")
 
-    async def get_raw_forecast(self):
-        """Return a list of forecast values from configured sources."""
+    @property
+    def cache(self) -> ForecastCache:
+        """Return the shared forecast cache."""
+        return self._cache
+
+    def _has_forecast_service(self) -> bool:
+        return bool(self.service_manager and getattr(self.service_manager, "forecast_service", None))
+
+    def _service_issued(self):
+        """Return the forecast service's issue marker."""
+        return getattr(self.service_manager.forecast_service, "forecast_issued", None)
+
+    def _entities_issued(self):
+        """Return the forecast sensors' update stamps without parsing them."""
+        states = (self.hass.states.get(entity_id) for entity_id in self._forecast_entities)
+        return tuple(getattr(state, "last_updated", None) for state in states)
+
+    def _handle_forecast_change(self, entity_id, old_state, new_state) -> bool:
+        """Invalidate the service entry once the service reports a new forecast."""
+        if self._service_issued() != self._cache.issued(SOURCE_SERVICE):
+            self._cache.invalidate(SOURCE_SERVICE)
+            self._cache.invalidate(SOURCE_QUANTILES)
+        return False
+
+    async def _async_fetch_service(self) -> Sequence[float]:
+        """Fetch and parse the forecast service's hourly values."""
         raw_forecast = []
+        forecast_data = await self.service_manager.get_forecast()
+        if isinstance(forecast_data, np.ndarray):
+            # Already parsed by the service; share it as is
+            return forecast_data[:MAX_FORECAST_HOURS]
+        if isinstance(forecast_data, dict) and "values" in forecast_data:
+            try:
+                raw_list = forecast_data["values"]
+                raw_forecast = [float(x) for x in raw_list]
+            except Exception:
+                raw_forecast = []
+        elif isinstance(forecast_data, list):
+            try:
+                raw_forecast = [float(x) for x in forecast_data]
+            except Exception:
+                raw_forecast = []
+        # Limit to the longest horizon a forecast service provides
+        return raw_forecast[:MAX_FORECAST_HOURS]
+
+    async def _async_read_entities(self) -> list[float]:
+        """Parse the configured forecast sensors."""
+        parser = async_get_parser(self.hass)
+        raw_forecast = []
+        for entity_id in self._forecast_entities:
+            state = self.hass.states.get(entity_id)
+            if state is not None:
+                value = parser.parse(state, UnitOfEnergy.KILO_WATT_HOUR)
+                raw_forecast.append(0.0 if value is None else value)
+        return raw_forecast
+
+    async def get_forecast_array(self) -> np.ndarray:
+        """Return the shared, read-only parsed forecast array."""
         # If an external forecast service is configured, try that first
-        if self.service_manager and getattr(self.service_manager, "forecast_service", None):
-            forecast_data = await self.service_manager.get_forecast()
-            if isinstance(forecast_data, dict) and "values" in forecast_data:
-                try:
-                    raw_list = forecast_data["values"]
-                    raw_forecast = [float(x) for x in raw_list]
-                except Exception:
-                    raw_forecast = []
-            elif isinstance(forecast_data, list):
-                try:
-                    raw_forecast = [float(x) for x in forecast_data]
-                except Exception:
-                    raw_forecast = []
-            # Limit to 48 data points (24h) if more were returned
-            if len(raw_forecast) > 48:
-                raw_forecast = raw_forecast[:48]
+        if self._has_forecast_service():
+            values = await self._cache.async_get(
+                SOURCE_SERVICE, self._service_issued(), self._async_fetch_service)
+            if values.size:
+                return values
         # If no external data was obtained, fall back to sensor-provided forecast(s)
-        if not raw_forecast:
-            for entity_id in self._forecast_entities:
-                state = self.hass.states.get(entity_id)
-                if state and hasattr(state, "state"):
-                    try:
-                        raw_forecast.append(float(state.state))
-                    except ValueError:
-                        raw_forecast.append(0.0)
-        return raw_forecast
+        return await self._cache.async_get(
+            SOURCE_ENTITIES, self._entities_issued(), self._async_read_entities)
+
+    async def _async_fetch_quantiles(self) -> Sequence[Sequence[float]]:
+        quantiles = await self.service_manager.get_forecast_quantiles()
+        if quantiles is None:
+            return np.empty((0, 0))
+        return quantiles[:, :MAX_FORECAST_HOURS]
+
+    async def get_quantile_array(self) -> np.ndarray:
+        """Return shared P10/P50/P90 rows, or an empty array if unavailable."""
+        if not self._has_forecast_service():
+            return np.empty((0, 0))
+        return await self._cache.async_get(
+            SOURCE_QUANTILES, self._service_issued(), self._async_fetch_quantiles)
+
+    async def get_raw_forecast(self):
+        """Return a list of forecast values from configured sources."""
+        return (await self.get_forecast_array()).tolist()
+
+    def apply_correction(self, raw_forecast, month=None):
+        """Scale an hourly forecast starting at midnight by the learned corrections."""
+        matrix = self.state.get_bias_matrix("solar")
+        bias = self.state.get_solar_bias()
+        month = month or dt_util.now().month
+        return np.maximum(matrix.apply(raw_forecast, month=month) * (1 + bias), 0.0).tolist()
 
     async def get_corrected_forecast(self):
         """Return forecast adjusted by learned solar bias."""
-        raw_forecast = await self.get_raw_forecast()
-        bias = self.state.get_solar_bias()
-        corrected = [max(f * (1 + bias), 0.0) for f in raw_forecast]
+        raw_forecast = await self.get_forecast_array()
+        corrected = self.apply_correction(raw_forecast)
         _LOGGER.debug(f"Corrected solar forecast calculated: {corrected}")
         return corrected
 
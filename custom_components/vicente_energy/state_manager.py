@@ -1,38 +1,168 @@
 """Persist integration state such as learned biases and history."""
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.storage import Store
 
+from .bias_matrix import LOAD_BUCKET_EDGES, SOLAR_BUCKET_EDGES, BiasMatrix
+from .const import DEFAULT_HISTORY_CAPACITY, DEFAULT_SAVE_DELAY_SECONDS
+from .ring_buffer import RingBuffer
+
+HISTORY_ERROR_KEYS = ("solar_errors", "load_errors")
+BIAS_MATRIX_EDGES = {"solar": SOLAR_BUCKET_EDGES, "load": LOAD_BUCKET_EDGES}
+
+# Delta writes between full rewrites of the main document
+DELTA_COMPACT_EVERY = 20
+SEQUENCE_KEY = "_seq"
+BASE_SEQUENCE_KEY = "_base_seq"
+
 
 class StateManager:
-    """Wrapper around Home Assistant storage for persistent state."""
+    """Wrapper around Home Assistant storage for persistent state.
+
+    Mutations mark keys dirty and schedule a write-behind save; saves
+    requested within the same window are coalesced into one disk write, and
+    Home Assistant flushes any pending save on shutdown. With delta_log
+    enabled, coalesced saves write only the changed keys to a small side
+    document, and the main document is rewritten every DELTA_COMPACT_EVERY
+    deltas or on flush. async_persist() writes pending changes the same
+    way without waiting for the save delay.
+    """
+
+    def __init__(self, hass, entry_id, history_capacity: int = DEFAULT_HISTORY_CAPACITY,
+                 save_delay: float = DEFAULT_SAVE_DELAY_SECONDS, delta_log: bool = False,
+                 bias_by_month: bool = False):
+        """Initialize storage with given entry identifier.
 
-    def __init__(self, hass, entry_id):
-        """Initialize storage with given entry identifier."""
+        history_capacity bounds every history series (oldest samples are
+        dropped first). save_delay is the coalescing window in seconds.
+        bias_by_month adds a month axis to the forecast correction matrices.
+        """
         self.hass = hass
         self.entry_id = entry_id
+        self._history_capacity = history_capacity
+        self._save_delay = save_delay
+        self._bias_by_month = bias_by_month
         self._store = Store(hass, f"vicente_energy_{entry_id}", f"vicente_energy_{entry_id}.json")
+        self._delta_store = (
+            Store(hass, f"vicente_energy_{entry_id}_delta", f"vicente_energy_{entry_id}_delta.json")
+            if delta_log else None
+        )
+        self._sequence = 0
+        self._dirty_keys: set[str] = set()
+        self._delta_keys: set[str] = set()
+        self._delta_writes = 0
+        self._save_requests = 0
+        self._disk_writes = 0
         self.data = {
             "solar_bias": 0.0,
             "load_bias": 0.0,
             "last_raw_session_kwh": None,
             "session_bias": 0.0,
             "last_session_kwh": 0.0,
-            "forecast_error_history": {"solar_errors": [], "load_errors": []},
-            "session_bias_history": []
+            "forecast_error_history": self._new_error_history(),
+            "session_bias_history": RingBuffer(history_capacity),
+            "solar_bias_matrix": BiasMatrix(SOLAR_BUCKET_EDGES, bias_by_month),
+            "load_bias_matrix": BiasMatrix(LOAD_BUCKET_EDGES, bias_by_month),
+        }
+
+    def _new_error_history(self) -> dict[str, RingBuffer]:
+        """Return empty solar/load error ring buffers."""
+        return {key: RingBuffer(self._history_capacity) for key in HISTORY_ERROR_KEYS}
+
+    def _restore_histories(self) -> None:
+        """Convert loaded history series and correction matrices to their runtime types."""
+        capacity = self._history_capacity
+        stored_errors = self.data.get("forecast_error_history") or {}
+        self.data["forecast_error_history"] = {
+            key: RingBuffer.from_stored(stored_errors.get(key), capacity)
+            for key in HISTORY_ERROR_KEYS
+        }
+        self.data["session_bias_history"] = RingBuffer.from_stored(
+            self.data.get("session_bias_history"), capacity)
+        for kind, edges in BIAS_MATRIX_EDGES.items():
+            key = f"{kind}_bias_matrix"
+            self.data[key] = BiasMatrix.from_stored(
+                self.data.get(key), edges, self._bias_by_month)
+
+    def _as_storable(self) -> dict:
+        """Return state with ring buffers encoded for JSON storage."""
+        storable = dict(self.data)
+        storable["forecast_error_history"] = {
+            key: buffer.to_dict()
+            for key, buffer in self.data["forecast_error_history"].items()
         }
+        storable["session_bias_history"] = self.data["session_bias_history"].to_dict()
+        for kind in BIAS_MATRIX_EDGES:
+            key = f"{kind}_bias_matrix"
+            storable[key] = self.data[key].to_dict()
+        return storable
+
+    @property
+    def is_dirty(self) -> bool:
+        """Return True if state changed since the last disk write."""
+        return bool(self._dirty_keys)
+
+    @property
+    def persistence_stats(self) -> dict[str, int]:
+        """Return counts of requested saves versus actual disk writes."""
+        return {
+            "save_requests": self._save_requests,
+            "disk_writes": self._disk_writes,
+            "delta_writes": self._delta_writes,
+        }
+
+    @callback
+    def async_schedule_save(self, *keys: str) -> None:
+        """Mark keys changed and coalesce persistence into one delayed write."""
+        self._dirty_keys.update(keys or self.data.keys())
+        self._save_requests += 1
+        if self._delta_store is not None and self._delta_writes < DELTA_COMPACT_EVERY:
+            self._delta_store.async_delay_save(self._delta_data, self._save_delay)
+        else:
+            self._store.async_delay_save(self._full_data, self._save_delay)
+
+    @callback
+    def _full_data(self) -> dict[str, Any]:
+        """Return the whole document for a write and reset delta tracking."""
+        self._sequence += 1
+        self._dirty_keys.clear()
+        self._delta_keys.clear()
+        self._delta_writes = 0
+        self._disk_writes += 1
+        return {**self._as_storable(), SEQUENCE_KEY: self._sequence}
+
+    @callback
+    def _delta_data(self) -> dict[str, Any]:
+        """Return the keys changed since the last full write."""
+        self._delta_keys.update(self._dirty_keys)
+        self._dirty_keys.clear()
+        self._delta_writes += 1
+        self._disk_writes += 1
+        storable = self._as_storable()
+        delta = {key: storable[key] for key in self._delta_keys if key in storable}
+        delta[BASE_SEQUENCE_KEY] = self._sequence
+        return delta
 
     def update_solar_bias(self, bias: float):
         """Store new solar bias value."""
         self.data['solar_bias'] = bias
+        self.async_schedule_save('solar_bias')
 
     def update_load_bias(self, bias: float):
         """Store new load bias value."""
         self.data['load_bias'] = bias
+        self.async_schedule_save('load_bias')
 
     def get_load_bias(self) -> float:
         """Return the current load bias."""
         return self.data.get('load_bias', 0.0)
 
+    def get_bias_matrix(self, kind: str) -> BiasMatrix:
+        """Return the hour x magnitude correction matrix for 'solar' or 'load'."""
+        return self.data[f'{kind}_bias_matrix']
+
     def get_session_bias(self) -> float:
         """Return the learned session bias."""
         return self.data.get('session_bias', 0.0)
@@ -41,11 +171,37 @@ class StateManager:
         """Load state data from disk."""
         stored = await self._store.async_load()
         if stored:
+            self._sequence = stored.pop(SEQUENCE_KEY, 0)
             self.data.update(stored)
+        if self._delta_store is not None:
+            delta = await self._delta_store.async_load()
+            # A delta only applies to the main document it was written against
+            if delta and delta.pop(BASE_SEQUENCE_KEY, None) == self._sequence:
+                self.data.update(delta)
+                self._delta_keys.update(delta)
+        self._restore_histories()
 
     async def async_save(self):
-        """Persist current state to disk."""
-        await self._store.async_save(self.data)
+        """Persist current state to disk immediately."""
+        await self._store.async_save(self._full_data())
+
+    async def async_persist(self):
+        """Write the keys changed since the last write now, if any.
+
+        With delta_log these go to the delta document, until compaction is
+        due; otherwise the whole document is written.
+        """
+        if not self._dirty_keys:
+            return
+        if self._delta_store is not None and self._delta_writes < DELTA_COMPACT_EVERY:
+            await self._delta_store.async_save(self._delta_data())
+        else:
+            await self.async_save()
+
+    async def async_flush(self):
+        """Write pending changes into the main document; call on unload so nothing is lost."""
+        if self._dirty_keys or self._delta_keys:
+            await self.async_save()
 
     async def update_session_bias(self, alpha: float, actual_kwh: float):
         """Apply a learning update to the stored session bias."""
@@ -54,20 +210,22 @@ class StateManager:
         self.data['session_bias'] = new_bias
         self.data['last_raw_session_kwh'] = actual_kwh
         self.data['session_bias_history'].append(actual_kwh)
-        await self.async_save()
+        self.async_schedule_save('session_bias', 'last_raw_session_kwh', 'session_bias_history')
 
     async def set_session_bias(self, bias_value: float):
         """Set the session bias to an explicit value."""
         self.data['session_bias'] = bias_value
-        await self.async_save()
+        self.async_schedule_save('session_bias')
 
     def record_forecast_error(self, forecast_type: str, error_value: float):
         """Append a forecast error for solar or load bias tracking."""
-        history = self.data.setdefault('forecast_error_history', {'solar_errors': [], 'load_errors': []})
+        history = self.data['forecast_error_history']
         history[f"{forecast_type}_errors"].append(error_value)
+        self.async_schedule_save('forecast_error_history')
 
     # New methods:
-    async def learn_session_bias(self, actual_kwh: float, estimated_kwh: float):
+    @callback
+    def learn_session_bias(self, actual_kwh: float, estimated_kwh: float):
         """Update session bias using actual vs estimated usage."""
         error = actual_kwh - estimated_kwh
         alpha = self.data.get('session_learning_alpha', 0.1)
@@ -76,12 +234,13 @@ class StateManager:
         self.data['session_bias'] = new_bias
         self.data['last_raw_session_kwh'] = actual_kwh
         self.data['session_bias_history'].append(actual_kwh)
-        await self.async_save()
+        self.async_schedule_save('session_bias', 'last_raw_session_kwh', 'session_bias_history')
 
-    async def save_last_session_kwh(self, kwh: float):
+    @callback
+    def save_last_session_kwh(self, kwh: float):
         """Record the last completed session's kWh usage."""
         self.data['last_session_kwh'] = kwh
-        await self.async_save()
+        self.async_schedule_save('last_session_kwh')
 
     async def reset_history(self):
         """Reset all stored biases and history to defaults."""
@@ -90,9 +249,11 @@ class StateManager:
         self.data['session_bias'] = 0.0
         self.data['last_session_kwh'] = 0.0
         self.data['last_raw_session_kwh'] = None
-        self.data['forecast_error_history'] = {'solar_errors': [], 'load_errors': []}
-        self.data['session_bias_history'] = []
-        await self.async_save()
+        self.data['forecast_error_history'] = self._new_error_history()
+        self.data['session_bias_history'] = RingBuffer(self._history_capacity)
+        for kind, edges in BIAS_MATRIX_EDGES.items():
+            self.data[f'{kind}_bias_matrix'] = BiasMatrix(edges, self._bias_by_month)
+        self.async_schedule_save()
 
     def get_solar_bias(self) -> float:
         """Return the current solar bias."""
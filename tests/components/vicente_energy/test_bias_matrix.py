@@ -0,0 +1,47 @@
+from custom_components.vicente_energy.bias_matrix import BiasMatrix
+import numpy as np
+import pytest
+
+
+def test_new_matrix_is_neutral():
+    matrix = BiasMatrix((1.0, 2.0))
+    forecast = [0.5, 1.5, 3.0]
+    assert matrix.apply(forecast).tolist() == pytest.approx(forecast)
+
+
+def test_update_only_touches_hour_and_bucket_cell():
+    matrix = BiasMatrix((1.0, 2.0))
+    for _ in range(50):
+        matrix.update(12, 1.5, 3.0, alpha=0.2)
+
+    corrected = matrix.apply([1.5, 0.5, 1.5], hours=[12, 12, 13])
+    assert corrected[0] == pytest.approx(3.0, rel=1e-3)
+    assert corrected[1] == pytest.approx(0.5)
+    assert corrected[2] == pytest.approx(1.5)
+
+
+def test_month_axis_separates_seasons():
+    matrix = BiasMatrix((1.0,), by_month=True)
+    matrix.update(10, 2.0, 1.0, alpha=1.0, month=1)
+    assert matrix.apply([2.0], [10], month=1)[0] == pytest.approx(1.0)
+    assert matrix.apply([2.0], [10], month=7)[0] == pytest.approx(2.0)
+
+
+def test_accuracy_and_round_trip():
+    matrix = BiasMatrix((1.0,))
+    matrix.update(8, 2.0, 1.0, alpha=0.5)
+    matrix.update(8, 1.0, 1.0, alpha=0.5)
+
+    accuracy = matrix.accuracy
+    assert accuracy["mae_by_hour"][8] == pytest.approx(0.5)
+    assert accuracy["mape_by_hour"][8] == pytest.approx(50.0)
+    assert accuracy["mae_by_hour"][9] is None
+
+    restored = BiasMatrix.from_stored(matrix.to_dict(), (1.0,))
+    assert np.array_equal(restored.factors, matrix.factors)
+    assert restored.accuracy == accuracy
+
+    # A different bucket layout keeps statistics but starts factors fresh
+    relaid = BiasMatrix.from_stored(matrix.to_dict(), (0.5, 1.0))
+    assert np.all(relaid.factors == 1.0)
+    assert relaid.accuracy == accuracy
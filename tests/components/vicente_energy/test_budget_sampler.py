@@ -0,0 +1,45 @@
+import time
+
+from custom_components.vicente_energy.budget_sampler import BudgetSampler
+import numpy as np
+import pytest
+
+
+def test_quantiles_are_reproduced_for_a_single_hour():
+    sampler = BudgetSampler(scenarios=20000)
+    totals = sampler.sample_solar_totals([10.0], [6.0], [16.0])
+    assert np.quantile(totals, 0.1) == pytest.approx(6.0, abs=0.2)
+    assert np.quantile(totals, 0.5) == pytest.approx(10.0, abs=0.2)
+    assert np.quantile(totals, 0.9) == pytest.approx(16.0, abs=0.3)
+
+
+def test_degenerate_quantiles_match_deterministic_budget():
+    sampler = BudgetSampler()
+    dist = sampler.budget_distribution([2.0] * 24, [1.0] * 24,
+                                       battery_kwh=3.0, confidence=0.8)
+    assert dist.p10_kwh == dist.p50_kwh == dist.p90_kwh == dist.risk_adjusted_kwh
+    assert dist.p50_kwh == pytest.approx(27.0)
+
+
+def test_risk_adjusted_budget_tracks_confidence():
+    sampler = BudgetSampler()
+    p50 = [1.0] * 48
+    low = sampler.budget_distribution(p50, [0.5] * 48, battery_kwh=0.0, confidence=0.5,
+                                      p10=[0.4] * 48, p90=[1.5] * 48)
+    high = sampler.budget_distribution(p50, [0.5] * 48, battery_kwh=0.0, confidence=0.9,
+                                       p10=[0.4] * 48, p90=[1.5] * 48)
+    assert high.p10_kwh < high.p50_kwh < high.p90_kwh
+    assert high.risk_adjusted_kwh == pytest.approx(high.p10_kwh, rel=1e-3)
+    assert low.risk_adjusted_kwh == pytest.approx(low.p50_kwh, rel=1e-3)
+
+
+def test_sampling_is_fast_once_draws_are_cached():
+    sampler = BudgetSampler()
+    args = ([1.0] * 48, [0.5] * 48)
+    sampler.budget_distribution(*args, battery_kwh=0.0, confidence=0.8,
+                                p10=[0.5] * 48, p90=[2.0] * 48)
+    started = time.perf_counter()
+    for _ in range(10):
+        sampler.budget_distribution(*args, battery_kwh=0.0, confidence=0.8,
+                                    p10=[0.5] * 48, p90=[2.0] * 48)
+    assert (time.perf_counter() - started) / 10 < 0.05
@@ -86,3 +86,59 @@ def test_power_level_inverter_off(estimator):
     )
     power = estimator.compute_power_level(sig, budget_remaining=10)
     assert power == 0
+
+
+def test_planned_power_follows_plan(estimator):
+    fc = Forecasts(solar_24h_kwh=[0] * 8 + [4] * 8 + [0] * 8, load_24h_kwh=[0.5] * 24)
+    sig = Signals(
+        solar_power_w=0,
+        battery_soc_pct=20,
+        house_load_total_w=0,
+        wallbox_power_w=0,
+        agate_inverter_on=True,
+    )
+    estimator.estimate(fc, sig)
+    plan = estimator.compute_plan(fc, sig)
+    assert len(plan.charge_kw) == 48
+    assert estimator.get_planned_power(0) == 0.0
+    assert estimator.get_planned_power(8) == pytest.approx(3.5)
+    assert estimator.get_planned_power(99) == 0.0
+
+
+def test_estimate_uses_risk_adjusted_budget_with_quantiles(estimator):
+    sig = Signals(
+        solar_power_w=0,
+        battery_soc_pct=20,
+        house_load_total_w=0,
+        wallbox_power_w=0,
+        agate_inverter_on=True,
+    )
+    fc = Forecasts(
+        solar_24h_kwh=[1.0] * 24,
+        load_24h_kwh=[0.5] * 24,
+        solar_p10_kwh=[0.4] * 24,
+        solar_p90_kwh=[1.5] * 24,
+    )
+    budget = estimator.estimate(fc, sig)
+    dist = estimator.distribution
+    assert dist is not None
+    assert budget == dist.risk_adjusted_kwh
+    assert dist.p10_kwh <= budget <= dist.p50_kwh <= dist.p90_kwh
+
+
+def test_budget_ignores_solar_beyond_24h(estimator):
+    sig = Signals(
+        solar_power_w=0,
+        battery_soc_pct=20,
+        house_load_total_w=0,
+        wallbox_power_w=0,
+        agate_inverter_on=True,
+    )
+    day = Forecasts(solar_24h_kwh=[1.0] * 24, load_24h_kwh=[0.5] * 24)
+    two_days = Forecasts(solar_24h_kwh=[1.0] * 24, load_24h_kwh=[0.5] * 24,
+                         solar_horizon_kwh=[1.0] * 24 + [3.0] * 24)
+
+    assert estimator.estimate(two_days, sig) == estimator.estimate(day, sig) == pytest.approx(12.0)
+    # Only the planner sees tomorrow's production
+    plan = estimator.compute_plan(two_days, sig)
+    assert plan.surplus_kwh[30] == pytest.approx(2.5)
@@ -0,0 +1,126 @@
+from custom_components.vicente_energy.charge_optimizer import (
+    CYCLE_PENALTY_FRACTION,
+    SURPLUS_VALUE_FRACTION,
+    ChargeOptimizer,
+    hourly_to_slots,
+)
+import numpy as np
+import pytest
+
+HOURS = range(24)
+SOLAR = hourly_to_slots([max(0.0, 4.0 - abs(h - 12) * 0.8) for h in HOURS])
+LOAD = hourly_to_slots([0.8] * 24)
+PRICES = hourly_to_slots([0.45 if 16 <= h < 21 else 0.2 for h in HOURS], spread=False)
+PARAMS = {
+    "soc_pct": 40,
+    "capacity_kwh": 13.5,
+    "reserve_pct": 20,
+    "efficiency": 0.9,
+    "max_charger_kw": 7.2,
+    "battery_max_kw": 5.0,
+    "departure_slot": 80,
+}
+
+
+def test_meets_departure_target_within_limits():
+    schedule = ChargeOptimizer().solve(SOLAR, LOAD, PRICES, target_kwh=20, **PARAMS)
+    assert schedule.converged
+    assert len(schedule.charge_kw) == 96
+    assert sum(schedule.charge_kw[:80]) * 0.25 == pytest.approx(20, abs=0.05)
+    assert max(schedule.charge_kw) <= 7.2 + 0.01
+    assert min(schedule.battery_kwh) >= 13.5 * 0.2 - 0.05
+
+
+def test_avoids_peak_tariff():
+    schedule = ChargeOptimizer().solve(SOLAR, LOAD, PRICES, target_kwh=20, **PARAMS)
+    peak = sum(schedule.charge_kw[64:80]) * 0.25
+    assert peak < 0.25
+
+
+def test_time_budget_bounds_the_solve():
+    schedule = ChargeOptimizer().solve(SOLAR, LOAD, PRICES, target_kwh=20, time_budget_ms=0,
+                                       **PARAMS)
+    assert not schedule.converged
+    assert schedule.iterations == 1
+    assert len(schedule.charge_kw) == 96
+    assert all(0.0 <= kw <= 7.2 for kw in schedule.charge_kw)
+
+
+def test_unreachable_target_is_capped():
+    schedule = ChargeOptimizer().solve(SOLAR, LOAD, PRICES, target_kwh=500, **PARAMS)
+    assert schedule.converged
+    assert all(kw == pytest.approx(7.2, abs=0.05) for kw in schedule.charge_kw[:80])
+
+
+def _random_case(rng):
+    """Return a realistic day of solar, load and tariff with random parameters."""
+    hours = np.arange(24)
+    solar = rng.uniform(0, 8) * np.exp(-((hours - rng.uniform(11.5, 13.5)) / rng.uniform(2.5, 5)) ** 2)
+    solar = np.where((hours < 6) | (hours > 20), 0.0, solar * rng.uniform(0.6, 1.0, 24))
+    load = rng.uniform(0.3, 1.0) + rng.uniform(0, 1.5, 24) * (rng.random(24) < 0.4)
+    base = rng.uniform(0.1, 0.3)
+    prices = np.where((hours >= 16) & (hours < 21), base * rng.uniform(1.5, 3), base)
+    start = int(rng.integers(0, 24))
+    params = {
+        "soc_pct": rng.uniform(10, 100),
+        "capacity_kwh": rng.uniform(5, 20),
+        "reserve_pct": rng.uniform(0, 30),
+        "efficiency": rng.uniform(0.8, 0.95),
+        "max_charger_kw": float(rng.choice([3.6, 7.2, 11.0])),
+        "battery_max_kw": rng.uniform(3, 10),
+        "target_kwh": rng.uniform(0, 60),
+        "departure_slot": int(rng.integers(8, 97)),
+    }
+    return (hourly_to_slots(np.roll(solar, -start)), hourly_to_slots(np.roll(load, -start)),
+            hourly_to_slots(np.roll(prices, -start), spread=False), params)
+
+
+def test_random_inputs_solve_quickly_and_certified_optimal():
+    rng = np.random.default_rng(7)
+    optimizer = ChargeOptimizer()
+    for _ in range(20):
+        solar, load, prices, params = _random_case(rng)
+        schedule = optimizer.solve(solar, load, prices, **params)
+        assert schedule.converged
+        assert schedule.iterations <= 20
+        assert schedule.solve_ms < 100
+        assert schedule.optimality_gap < 1e-3
+
+
+def test_random_inputs_match_reference_lp():
+    linprog = pytest.importorskip("scipy.optimize").linprog
+    rng = np.random.default_rng(11)
+    for _ in range(10):
+        solar, load, prices, params = _random_case(rng)
+        schedule = ChargeOptimizer().solve(solar, load, prices, **params)
+
+        n = prices.size
+        eta = np.sqrt(params["efficiency"])
+        start = params["capacity_kwh"] * params["soc_pct"] / 100
+        floor = min(params["capacity_kwh"] * params["reserve_pct"] / 100, start)
+        ev_max = params["max_charger_kw"] * 0.25
+        batt_max = params["battery_max_kw"] * 0.25
+        departure = params["departure_slot"]
+        mean_price = np.mean(np.abs(prices))
+        cost = np.concatenate((np.full(n, -SURPLUS_VALUE_FRACTION * mean_price),
+                               np.full(2 * n, CYCLE_PENALTY_FRACTION * mean_price), prices))
+        eye, zeros, lower = np.eye(n), np.zeros((n, n)), np.tril(np.ones((n, n)))
+        soc = np.hstack((zeros, lower * eta, -lower / eta, zeros))
+        reference = linprog(
+            cost,
+            A_ub=np.vstack((np.hstack((eye, eye, -eye, -eye)), soc, -soc,
+                            np.concatenate((-(np.arange(n) < departure).astype(float),
+                                            np.zeros(3 * n)))[None])),
+            b_ub=np.concatenate((solar - load, np.full(n, params["capacity_kwh"] - start),
+                                 np.full(n, start - floor),
+                                 [-min(params["target_kwh"], ev_max * departure)])),
+            bounds=[(0, ev_max)] * n + [(0, batt_max)] * 2 * n + [(0, None)] * n,
+        )
+
+        ev = np.array(schedule.charge_kw) * 0.25
+        grid = np.array(schedule.grid_import_kwh)
+        # Charge and discharge are not reported separately; the cycle
+        # penalty is negligible, so compare the price and EV terms
+        objective = cost[:n] @ ev + prices @ grid
+        expected = cost[:n] @ reference.x[:n] + prices @ reference.x[3 * n:]
+        assert objective == pytest.approx(expected, abs=0.01)
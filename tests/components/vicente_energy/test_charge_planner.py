@@ -0,0 +1,50 @@
+from custom_components.vicente_energy.charge_planner import (
+    PLAN_HORIZON_HOURS,
+    plan_charging,
+)
+import pytest
+
+SOLAR_DAY = [0] * 8 + [1, 2, 3, 4, 4, 3, 2, 1] + [0] * 8
+LOAD_DAY = [0.5] * 24
+
+
+def make_plan(**overrides):
+    kwargs = {
+        "soc_pct": 50,
+        "capacity_kwh": 10,
+        "reserve_pct": 20,
+        "efficiency": 0.9,
+        "max_charger_kw": 3,
+        "budget_kwh": 6,
+    }
+    kwargs.update(overrides)
+    return plan_charging(SOLAR_DAY * 2, LOAD_DAY, **kwargs)
+
+
+def test_plan_covers_horizon_and_respects_limits():
+    plan = make_plan()
+    assert len(plan.charge_kw) == PLAN_HORIZON_HOURS
+    assert len(plan.battery_kwh) == PLAN_HORIZON_HOURS
+    assert max(plan.charge_kw) <= 3
+    assert plan.total_kwh == pytest.approx(6.0)
+
+
+def test_plan_charges_from_solar_first():
+    plan = make_plan()
+    # Budget fits in the first morning's surplus; nothing planned overnight
+    assert all(kw == 0.0 for kw in plan.charge_kw[:8])
+    assert plan.charge_kw[8] == pytest.approx(0.5)
+
+
+def test_battery_trajectory_stays_within_bounds():
+    plan = make_plan(budget_kwh=30)
+    assert min(plan.battery_kwh) >= 2.0 - 1e-9
+    assert max(plan.battery_kwh) <= 10.0 + 1e-9
+
+
+def test_short_load_profile_is_tiled():
+    plan = plan_charging([0.0] * 48, [1.0], soc_pct=100, capacity_kwh=10,
+                         reserve_pct=0, efficiency=1.0, max_charger_kw=0,
+                         budget_kwh=0)
+    assert plan.surplus_kwh == [-1.0] * PLAN_HORIZON_HOURS
+    assert plan.battery_kwh[9] == 0.0
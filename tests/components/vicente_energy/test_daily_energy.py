@@ -0,0 +1,41 @@
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.vicente_energy.services.daily_energy import DailyEnergyCounters
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+DAY = date(2025, 6, 1)
+
+
+@pytest.mark.asyncio
+async def test_baseline_is_restored_and_saved(hass: HomeAssistant):
+    counters = DailyEnergyCounters(hass, "test")
+    counters._store.async_load = AsyncMock(
+        return_value={"day": DAY.isoformat(), "start": {"solar": 100.0}})
+    counters._store.async_delay_save = MagicMock()
+    await counters.async_load()
+
+    assert counters.today("solar", 150.0, DAY) == 50.0
+    counters._store.async_delay_save.assert_not_called()
+
+    # A new counter takes its baseline from the first reading and stores it
+    assert counters.today("grid", 20.0, DAY) == 0.0
+    assert counters._store.async_delay_save.call_count == 1
+    assert counters._data() == {"day": DAY.isoformat(), "start": {"solar": 100.0, "grid": 20.0}}
+
+
+@pytest.mark.asyncio
+async def test_new_day_and_counter_reset_start_over(hass: HomeAssistant):
+    counters = DailyEnergyCounters(hass, "test")
+    counters._store.async_load = AsyncMock(
+        return_value={"day": "2025-05-31", "start": {"solar": 100.0}})
+    await counters.async_load()
+
+    # Yesterday's baseline is not reused
+    assert counters.today("solar", 180.0, DAY) == 0.0
+    assert counters.today("solar", 190.0, DAY) == 10.0
+    # The device counter went backwards
+    assert counters.today("solar", 5.0, DAY) == 0.0
+    assert counters.today("solar", 7.0, DAY) == 2.0
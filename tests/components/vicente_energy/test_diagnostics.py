@@ -0,0 +1,46 @@
+from custom_components.vicente_energy.const import DOMAIN
+from custom_components.vicente_energy.diagnostics import async_get_config_entry_diagnostics
+from custom_components.vicente_energy.sensor import Budget24hSensor, PowerLevelSensor
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+class FakeCoordinator:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+
+class FakeScheduler:
+    def __init__(self, coordinators):
+        self.coordinators = coordinators
+
+    def coordinator(self, name):
+        return self.coordinators[name]
+
+
+class FakeEntry:
+    entry_id = "entry1"
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_stay_out_of_sensor_attributes(hass: HomeAssistant):
+    budget = FakeCoordinator("budget", {
+        "budget_24h_kwh": 10.0, "charge_schedule_kw": [1.0, 0.0], "optimizer_solve_ms": 12.0})
+    power = FakeCoordinator("power", {"power_level_kw": 3.0, "reaction_latency_s": 0.2})
+    budget_sensor = Budget24hSensor(budget)
+    power_sensor = PowerLevelSensor(power)
+    hass.data[DOMAIN] = {"entry1": {
+        "scheduler": FakeScheduler({"budget": budget, "power_control": power}),
+        "deadband_sensors": [budget_sensor, power_sensor],
+    }}
+
+    assert budget_sensor.extra_state_attributes["charge_schedule_kw"] == [1.0, 0.0]
+    assert "optimizer_solve_ms" not in budget_sensor.extra_state_attributes
+    assert not power_sensor.extra_state_attributes
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, FakeEntry())
+    assert diagnostics["budget"] == {"optimizer_solve_ms": 12.0}
+    assert diagnostics["power_control"] == {"reaction_latency_s": 0.2}
+    assert diagnostics["state_writes"]["power_level_kw"] == {"writes": 0, "writes_avoided": 0}
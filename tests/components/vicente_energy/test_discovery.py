@@ -0,0 +1,54 @@
+from custom_components.vicente_energy.services.discovery import EntityRole, async_get_discovery
+from custom_components.vicente_energy.services.wallbox import WallboxEVChargerService
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+ROLES = {
+    "charging_power": EntityRole("sensor", ("charging_power",)),
+    "status_description": EntityRole("sensor", ("status_description",), "sensor.fallback"),
+}
+
+
+@pytest.mark.asyncio
+async def test_roles_resolve_from_registry_and_follow_renames(hass: HomeAssistant):
+    registry = er.async_get(hass)
+    registry.async_get_or_create("sensor", "other", "x_charging_power")
+    power = registry.async_get_or_create(
+        "sensor", "wallbox", "1234-charging_power",
+        suggested_object_id="wallbox_garage_charging_power")
+
+    discovery = async_get_discovery(hass)
+    assert discovery.async_resolve("wallbox", ROLES) == {
+        "charging_power": "sensor.wallbox_garage_charging_power",
+        "status_description": "sensor.fallback",
+    }
+    assert discovery.async_resolve("wallbox", ROLES)["charging_power"] == power.entity_id
+    assert discovery.diagnostics["index_builds"] == 1
+
+    registry.async_update_entity(power.entity_id, new_entity_id="sensor.carport_power")
+    await hass.async_block_till_done()
+
+    # Still found by its unique_id, without rebuilding the index
+    assert discovery.async_resolve("wallbox", ROLES)["charging_power"] == "sensor.carport_power"
+    assert discovery.diagnostics["index_builds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wallbox_connect_uses_discovered_entities(hass: HomeAssistant):
+    registry = er.async_get(hass)
+    for unique_id in ("charging_power", "status_description"):
+        registry.async_get_or_create(
+            "sensor", "wallbox", f"1234-{unique_id}",
+            suggested_object_id=f"wallbox_garage_{unique_id}")
+    hass.states.async_set("sensor.wallbox_garage_charging_power", "0")
+
+    service = WallboxEVChargerService(hass)
+    await service.connect()
+    assert service.get_location() == "garage"
+
+    hass.states.async_set("sensor.wallbox_garage_charging_power", "7.2")
+    await hass.async_block_till_done()
+    assert await service.get_charging_power_kw() == 7.2
+    await service.disconnect()
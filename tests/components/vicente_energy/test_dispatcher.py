@@ -0,0 +1,59 @@
+from custom_components.vicente_energy.services.dispatcher import async_get_dispatcher
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.asyncio
+async def test_changes_in_one_iteration_are_batched(hass: HomeAssistant):
+    hass.states.async_set("sensor.power", "1")
+    calls = []
+    dispatcher = async_get_dispatcher(hass)
+    unsub = dispatcher.async_register(
+        "sensor.power", lambda e, old, new: calls.append((old.state, new.state)))
+
+    hass.states.async_set("sensor.power", "2")
+    hass.states.async_set("sensor.power", "3")
+    await hass.async_block_till_done()
+
+    assert calls == [("1", "3")]
+    stats = dispatcher.diagnostics["sensor.power"]
+    assert stats["received"] == 2
+    assert stats["coalesced"] == 1
+    assert stats["dispatched"] == 1
+
+    unsub()
+    assert "sensor.power" not in dispatcher.entity_ids
+
+
+@pytest.mark.asyncio
+async def test_unchanged_states_are_dropped_unless_attributes_tracked(hass: HomeAssistant):
+    hass.states.async_set("sensor.plain", "1")
+    hass.states.async_set("sensor.forecast", "1")
+    plain, forecast = [], []
+    dispatcher = async_get_dispatcher(hass)
+    dispatcher.async_register("sensor.plain", lambda *args: plain.append(args))
+    dispatcher.async_register("sensor.forecast", lambda *args: forecast.append(args),
+                              attributes=True)
+
+    hass.states.async_set("sensor.plain", "1", {"unit": "W"})
+    hass.states.async_set("sensor.forecast", "1", {"detailedForecast": []})
+    await hass.async_block_till_done()
+
+    assert plain == []
+    assert len(forecast) == 1
+    assert dispatcher.diagnostics["sensor.plain"]["dropped_unchanged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_handlers_share_one_dispatcher(hass: HomeAssistant):
+    hass.states.async_set("sensor.shared", "a")
+    first, second = [], []
+    async_get_dispatcher(hass).async_register("sensor.shared", lambda *a: first.append(a))
+    async_get_dispatcher(hass).async_register("sensor.shared", lambda *a: second.append(a))
+
+    hass.states.async_set("sensor.shared", "b")
+    await hass.async_block_till_done()
+
+    assert len(first) == len(second) == 1
+    assert async_get_dispatcher(hass).diagnostics["sensor.shared"]["handlers"] == 2
@@ -0,0 +1,54 @@
+from custom_components.vicente_energy.services.ev_charger_service import EnergyIntegrator
+import pytest
+
+
+def test_trapezoid_between_close_samples():
+    integrator = EnergyIntegrator(max_gap=120, max_interpolation=300)
+    integrator.add_sample(0, 0.0)
+    integrator.add_sample(60, 6.0)
+    integrator.add_sample(120, 6.0)
+
+    # Ramp 0 → 6 kW over a minute, then 6 kW for a minute
+    assert integrator.energy_kwh() == pytest.approx(3.0 / 60 + 6.0 / 60)
+    # Power holds after the last sample
+    assert integrator.energy_kwh(120 + 1800) == pytest.approx(0.15 + 3.0)
+
+
+def test_quiet_interval_holds_previous_power():
+    integrator = EnergyIntegrator(max_gap=120, max_interpolation=300)
+    integrator.add_sample(0, 7.2)
+    integrator.add_sample(3600, 3.6)
+
+    # Unchanged states are not reported, so 7.2 kW held for the hour
+    assert integrator.energy_kwh() == pytest.approx(7.2)
+    assert integrator.gaps == 0
+
+
+def test_unavailability_is_interpolated_up_to_the_cap():
+    integrator = EnergyIntegrator(max_gap=120, max_interpolation=300)
+    integrator.add_sample(0, 6.0)
+    integrator.mark_unavailable(60)
+    integrator.add_sample(60 + 3600, 6.0)
+
+    assert integrator.energy_kwh() == pytest.approx(0.1 + 6.0 * 300 / 3600)
+    assert integrator.gaps == 1
+    assert integrator.uncovered_s == pytest.approx(3300)
+    # Nothing is held while the reading is unavailable
+    integrator.mark_unavailable(4000)
+    assert integrator.energy_kwh(5000) == integrator.energy_kwh()
+
+
+def test_counter_cross_check_handles_session_restart():
+    integrator = EnergyIntegrator()
+    integrator.add_sample(0, 6.0)
+    integrator.add_counter(10.0)
+    integrator.add_sample(60, 6.0)
+    integrator.add_counter(10.1)
+    integrator.add_counter(0.0)  # Counter restarted with a new session
+    integrator.add_sample(120, 6.0)
+    integrator.add_counter(0.05)
+
+    stats = integrator.diagnostics
+    assert stats["charger_energy_kwh"] == pytest.approx(0.2)
+    assert stats["charger_counter_divergence_kwh"] == pytest.approx(0.05)
+    assert stats["charger_power_samples"] == 3
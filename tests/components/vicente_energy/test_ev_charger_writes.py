@@ -0,0 +1,135 @@
+import asyncio
+
+from custom_components.vicente_energy.services.chargepoint import ChargepointEVChargerService
+from custom_components.vicente_energy.services.ev_charger_service import (
+    EVChargerService,
+    TokenBucket,
+)
+from custom_components.vicente_energy.services.numeric import async_get_parser
+import pytest
+
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+
+
+class RecordingCharger(EVChargerService):
+    def __init__(self, hass):
+        super().__init__(hass)
+        self.writes = []
+
+    async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+        self.writes.append(power_amps)
+
+
+@pytest.mark.asyncio
+async def test_repeated_setpoint_is_suppressed(hass: HomeAssistant):
+    charger = RecordingCharger(hass)
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+
+    assert charger.writes == [16]
+    assert charger.write_diagnostics["charger_writes_issued"] == 1
+    assert charger.write_diagnostics["charger_writes_suppressed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hysteresis_band_but_stop_always_written(hass: HomeAssistant):
+    charger = RecordingCharger(hass)
+    charger.write_hysteresis_amps = 3
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(17)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(0)
+    await hass.async_block_till_done()
+
+    assert charger.writes == [16, 0]
+
+
+@pytest.mark.asyncio
+async def test_default_hysteresis_drops_one_amp_change(hass: HomeAssistant):
+    charger = RecordingCharger(hass)
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(15)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(14)
+    await hass.async_block_till_done()
+
+    assert charger.writes == [16, 14]
+
+
+@pytest.mark.asyncio
+async def test_setpoint_compared_with_write_in_flight(hass: HomeAssistant):
+    class SlowCharger(RecordingCharger):
+        release = asyncio.Event()
+
+        async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+            if self.writes:
+                await self.release.wait()
+            self.writes.append(power_amps)
+
+    charger = SlowCharger(hass)
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+    await charger.set_charging_power_amps(24)
+    await asyncio.sleep(0)
+    # Back to the last written value while 24 A is still being written
+    await charger.set_charging_power_amps(16)
+    charger.release.set()
+    await hass.async_block_till_done()
+
+    assert charger.writes == [16, 24, 16]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_counted_and_retried(hass: HomeAssistant):
+    class FlakyCharger(RecordingCharger):
+        failures = 1
+
+        async def _async_write_charging_power_amps(self, power_amps: int) -> None:
+            if self.failures:
+                self.failures -= 1
+                raise HomeAssistantError("charger offline")
+            self.writes.append(power_amps)
+
+    charger = FlakyCharger(hass)
+    await charger.set_charging_power_amps(16)
+    await hass.async_block_till_done()
+
+    assert charger.writes == [16]
+    assert charger.write_diagnostics["charger_writes_failed"] == 1
+    assert charger.write_diagnostics["charger_last_written_amps"] == 16
+
+
+@pytest.mark.asyncio
+async def test_burst_collapses_to_latest(hass: HomeAssistant):
+    charger = RecordingCharger(hass)
+    for amps in (10, 12, 14, 20):
+        await charger.set_charging_power_amps(amps)
+    await hass.async_block_till_done()
+
+    assert charger.writes == [20]
+    assert charger.write_diagnostics["charger_writes_coalesced"] == 3
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(capacity=1, rate_per_minute=1.0)
+    assert bucket.time_until_available() == 0.0
+    bucket.consume()
+    assert bucket.time_until_available() > 0.0
+
+
+@pytest.mark.asyncio
+async def test_chargepoint_power_output_goes_through_the_parser(hass: HomeAssistant):
+    charger = ChargepointEVChargerService(hass)
+    entity_id = "select.cph25_power_output"
+
+    assert charger._handle_power_change(entity_id, None, State(entity_id, "16.0"))
+    assert await charger.get_charging_power_kw() == pytest.approx(3.84)
+    assert not charger._handle_power_change(entity_id, None, State(entity_id, "unavailable"))
+    assert not charger._handle_power_change(
+        entity_id, None, State(entity_id, "16", {"unit_of_measurement": "kW"}))
+    assert async_get_parser(hass).diagnostics[entity_id]["incompatible_unit"] == 1
@@ -27,3 +27,36 @@ def test_solar_bias_update(tracker, state_manager):
 def test_load_bias_update(tracker, state_manager):
     tracker.update_load(5, 2)
     assert pytest.approx(state_manager.get_load_bias(), rel=1e-3) == -0.12
+
+
+def test_bias_accumulates_across_updates(tracker, state_manager):
+    tracker.update_solar(10, 12)
+    tracker.update_solar(10, 12)
+    assert state_manager.get_solar_bias() == pytest.approx(0.04 + 0.2 * (0.2 - 0.04))
+
+
+def test_hourly_update_trains_matrix(tracker, state_manager):
+    for _ in range(40):
+        tracker.update_load(2.0, 3.0, hour=18)
+    matrix = state_manager.get_bias_matrix("load")
+    assert matrix.apply([2.0], [18])[0] == pytest.approx(3.0, rel=1e-2)
+    # The scalar bias only tracks what the matrix has not yet corrected
+    assert abs(state_manager.get_load_bias()) < 0.05
+    assert tracker.accuracy()["load_accuracy"]["mae_by_hour"][18] == pytest.approx(1.0)
+
+
+def test_hour_is_scored_against_measured_energy(tracker, state_manager):
+    tracker.expect_hour({"solar": 10.0, "load": 2.0}, hour=13, month=6)
+    tracker.score_hour({"solar": 12.0, "load": 2.0})
+    # Scored once; a second call has nothing held
+    tracker.score_hour({"solar": 0.0, "load": 0.0})
+
+    assert state_manager.get_bias_matrix("solar").accuracy["mae_by_hour"][13] == pytest.approx(2.0)
+    assert state_manager.get_bias_matrix("load").accuracy["mae_by_hour"][13] == pytest.approx(0.0)
+
+
+def test_unmeasured_hour_is_not_scored(tracker, state_manager):
+    tracker.expect_hour({"solar": 10.0}, hour=13, month=6)
+    tracker.score_hour(None)
+
+    assert state_manager.get_solar_bias() == 0.0
@@ -0,0 +1,77 @@
+from custom_components.vicente_energy.forecast_cache import ForecastCache
+from custom_components.vicente_energy.solar_adapter import SolarForecastAdapter
+from custom_components.vicente_energy.state_manager import StateManager
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+class CountingFetch:
+    def __init__(self, values):
+        self.values = values
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return list(self.values)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_shared(hass: HomeAssistant):
+    cache = ForecastCache(hass, ttl=3600)
+    fetch = CountingFetch([1.0, 2.0])
+
+    first = await cache.async_get("service", "t1", fetch)
+    second = await cache.async_get("service", "t1", fetch)
+
+    assert second is first
+    assert not first.flags.writeable
+    assert fetch.calls == 1
+    assert cache.stats["forecast_cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_issue_time_or_invalidation_refetches(hass: HomeAssistant):
+    cache = ForecastCache(hass, ttl=3600)
+    fetch = CountingFetch([1.0])
+
+    await cache.async_get("service", "t1", fetch)
+    await cache.async_get("service", "t2", fetch)
+    assert fetch.calls == 2
+
+    cache.invalidate("service")
+    await cache.async_get("service", "t2", fetch)
+    assert fetch.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_revalidating(hass: HomeAssistant):
+    cache = ForecastCache(hass, ttl=0)
+    fetch = CountingFetch([1.0])
+    first = await cache.async_get("service", "t1", fetch)
+
+    fetch.values = [5.0]
+    stale = await cache.async_get("service", "t1", fetch)
+    assert stale.tolist() == [1.0]
+    assert cache.stats["forecast_cache_stale_hits"] == 1
+
+    await hass.async_block_till_done()
+    assert fetch.calls == 2
+    refreshed = await cache.async_get("service", "t1", fetch)
+    assert refreshed is not first
+    assert refreshed.tolist() == [5.0]
+
+
+@pytest.mark.asyncio
+async def test_adapter_reparses_only_after_sensor_update(hass: HomeAssistant):
+    sm = StateManager(hass, entry_id="cache")
+    for i in range(3):
+        hass.states.async_set(f"sensor.fc_{i}", str(i))
+    adapter = SolarForecastAdapter(hass, [f"sensor.fc_{i}" for i in range(3)], sm)
+
+    first = await adapter.get_forecast_array()
+    assert await adapter.get_forecast_array() is first
+
+    hass.states.async_set("sensor.fc_1", "7")
+    assert (await adapter.get_raw_forecast()) == [0.0, 7.0, 2.0]
+    assert adapter.cache.stats["forecast_cache_misses"] == 2
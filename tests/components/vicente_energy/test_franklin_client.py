@@ -0,0 +1,64 @@
+import asyncio
+
+from custom_components.vicente_energy.services.franklin import (
+    FranklinApiBatteryService,
+    FranklinApiGridService,
+    FranklinApiSolarService,
+)
+from custom_components.vicente_energy.services.franklin_client import (
+    FranklinTransport,
+    async_setup_franklin_client,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+RUNTIME = {
+    "soc": 81.0, "p_fhp": -2.5, "p_grid": 0.4, "p_sun": 5.1, "p_load": 3.0,
+    "kwh_fhp_chg": 6.0, "kwh_fhp_di": 1.5, "kwh_grid_use": 2.25, "kwh_grid_out": 4.0,
+    "kwh_sun": 18.5,
+}
+
+
+class StubTransport(FranklinTransport):
+    """Return a fixed payload and count fetches."""
+
+    def __init__(self):
+        self.runtime = dict(RUNTIME)
+        self.fetches = 0
+
+    async def async_fetch_runtime(self):
+        self.fetches += 1
+        await asyncio.sleep(0)
+        return dict(self.runtime)
+
+
+@pytest.mark.asyncio
+async def test_one_fetch_feeds_every_role(hass: HomeAssistant):
+    transport = StubTransport()
+    client = async_setup_franklin_client(hass, transport, poll_interval=2)
+    battery = FranklinApiBatteryService(hass)
+    grid = FranklinApiGridService(hass)
+    solar = FranklinApiSolarService(hass)
+
+    await asyncio.gather(battery.connect(), grid.connect(), solar.connect())
+
+    assert transport.fetches == 1
+    assert await battery.get_battery_soc() == 81.0
+    assert await battery.get_storage_power_kw() == -2.5
+    assert await grid.get_now_home_load_kw() == 3.0
+    assert await grid.get_today_import_kwh() == 2.25
+    assert await solar.get_today_production_kwh() == 18.5
+
+    updates = []
+    grid.register_callback(lambda *args: updates.append(args))
+    transport.runtime["p_load"] = 3.6
+    await asyncio.gather(client.async_refresh(), client.async_refresh())
+
+    assert transport.fetches == 2
+    assert await grid.get_now_home_load_kw() == 3.6
+    assert await grid.get_today_import_kwh() == 2.25
+    assert len(updates) == 1
+
+    for service in (battery, grid, solar):
+        await service.disconnect()
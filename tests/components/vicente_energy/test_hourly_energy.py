@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from custom_components.vicente_energy.hourly_energy import HourlyEnergyMeter
+from custom_components.vicente_energy.models import Signals
+import pytest
+
+HOUR = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def _signals(solar_w, load_w):
+    return Signals(solar_power_w=solar_w, battery_soc_pct=50.0, house_load_total_w=load_w,
+                   wallbox_power_w=0.0, agate_inverter_on=False)
+
+
+def test_hour_energy_holds_each_reading():
+    meter = HourlyEnergyMeter(collector=None)
+    start = HOUR.timestamp()
+    meter.add_signals(start - 600, _signals(0.0, 1000.0))
+    assert meter.take_hour(HOUR) is None  # No period open yet
+
+    meter.add_signals(start + 1800, _signals(4000.0, 1000.0))
+    meter.add_signals(start + 2700, _signals(2000.0, 3000.0))
+    energy = meter.take_hour(HOUR.replace(hour=13))
+
+    # 4 kW for 15 min then 2 kW for 15 min; 1 kW for 45 min then 3 kW
+    assert energy["solar"] == pytest.approx(1.0 + 0.5)
+    assert energy["load"] == pytest.approx(0.75 + 0.75)
+
+
+def test_partial_hour_is_not_reported():
+    meter = HourlyEnergyMeter(collector=None)
+    meter.add_signals(HOUR.timestamp(), _signals(1000.0, 1000.0))
+    meter.take_hour(HOUR.replace(minute=23))
+
+    assert meter.take_hour(HOUR.replace(hour=13)) is None
+    assert meter.take_hour(HOUR.replace(hour=14))["load"] == pytest.approx(1.0)
@@ -70,3 +70,52 @@ async def test_input_collector_prefers_service_charger_data(hass: HomeAssistant)
     result = collector.get_signals()
 
     assert abs(result.wallbox_power_w - 8.0) < 0.01
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_states")
+async def test_push_mode_tracks_changes_without_polling(hass: HomeAssistant):
+    collector = InputCollector(
+        hass,
+        "sensor.solar",
+        "sensor.soc",
+        "sensor.load",
+        "sensor.wp",
+        "binary_sensor.inv",
+    )
+    collector.async_start()
+    assert collector.is_listening
+    assert collector.get_signals().solar_power_w == pytest.approx(100.5)
+
+    collector.mark_clean()
+    hass.states.async_set("sensor.load", "400")
+    await hass.async_block_till_done()
+
+    assert collector.has_changes
+    assert collector.get_signals().house_load_total_w == 400.0
+
+    collector.async_stop()
+    assert not collector.is_listening
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_states")
+async def test_push_mode_ignores_unchanged_values(hass: HomeAssistant):
+    collector = InputCollector(
+        hass,
+        "sensor.solar",
+        "sensor.soc",
+        "sensor.load",
+        "sensor.wp",
+        "binary_sensor.inv",
+    )
+    collector.async_start()
+    collector.mark_clean()
+    snapshot = collector.get_signals()
+
+    hass.states.async_set("sensor.soc", "75", {"friendly_name": "SOC"})
+    await hass.async_block_till_done()
+
+    assert not collector.has_changes
+    assert collector.get_signals() is snapshot
+    collector.async_stop()
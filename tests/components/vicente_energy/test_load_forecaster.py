@@ -1,8 +1,11 @@
+from datetime import datetime, timedelta
+
 from custom_components.vicente_energy.load_forecaster import LoadForecaster
 from custom_components.vicente_energy.state_manager import StateManager
 import pytest
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 
 @pytest.fixture
@@ -24,11 +27,28 @@ def test_load_forecast_padding(forecaster):
 
 
 def test_load_forecast_bias(forecaster, state_manager):
-    for v in [1.0, 2.0, 3.0]:
-        forecaster.update_history(v)
+    monday = datetime(2025, 6, 2, 21, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    for offset, v in enumerate([1.0, 2.0, 3.0]):
+        forecaster.update_history(v, monday + timedelta(hours=offset))
     state_manager.update_load_bias(0.5)
-    fc = forecaster.get_corrected_forecast()
-    assert pytest.approx(fc[-3:], rel=1e-3) == [1.5, 3.0, 4.5]
+    fc = forecaster.get_corrected_forecast(monday + timedelta(days=1))
+    assert pytest.approx(fc[:3], rel=1e-3) == [1.5, 3.0, 4.5]
+
+
+def test_profiles_split_weekday_weekend_with_decay(forecaster):
+    monday = datetime(2025, 6, 2, 8, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    saturday = monday + timedelta(days=5)
+    forecaster.update_history(1.0, monday)
+    forecaster.update_history(3.0, monday + timedelta(days=1))
+    forecaster.update_history(10.0, saturday)
+
+    weekday = (3.0 + 0.85 * 1.0) / (1.0 + 0.85)
+    assert forecaster.get_raw_forecast(monday + timedelta(days=7))[0] == pytest.approx(weekday)
+    assert forecaster.get_raw_forecast(saturday + timedelta(days=7))[0] == pytest.approx(10.0)
+
+    # The window starting Friday evening crosses into Saturday's profile
+    friday_evening = monday + timedelta(days=4, hours=12)
+    assert forecaster.get_raw_forecast(friday_evening)[12] == pytest.approx(10.0)
 
 
 def test_raw_forecast_length(forecaster):
@@ -0,0 +1,62 @@
+from custom_components.vicente_energy.input_collector import InputCollector
+from custom_components.vicente_energy.services.numeric import (
+    NumericStateParser,
+    compile_converter,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant, State
+
+
+def test_compile_converter_scales_and_rejects_other_quantities():
+    assert compile_converter("kW", "W")(1500.0) == pytest.approx(1.5)
+    assert compile_converter("W", "kW")(1.5) == pytest.approx(1500.0)
+    assert compile_converter("kWh", "Wh")(250.0) == pytest.approx(0.25)
+    assert compile_converter("kW", None)(2.0) == 2.0
+    assert compile_converter("kW", "kWh") is None
+    assert compile_converter("kW", None, "energy") is None
+    assert compile_converter("A", None)(16.0) == 16.0
+
+
+def test_compile_converter_rejects_unknown_units():
+    assert compile_converter("kW", "kVA") is None
+    assert compile_converter("kW", "A") is None
+    assert compile_converter("kWh", "MJ", "energy") is None
+
+
+def test_compile_converter_matches_unit_case():
+    assert compile_converter("W", "mW")(1500.0) == pytest.approx(1.5)
+    assert compile_converter("W", "MW")(1.5) == pytest.approx(1.5e6)
+    assert compile_converter("kWh", "mWh")(2000.0) == pytest.approx(0.002)
+    assert compile_converter("kWh", "MWh")(2.0) == pytest.approx(2000.0)
+    assert compile_converter("kW", " kW ")(2.0) == 2.0
+    assert compile_converter("kW", "KW") is None
+
+
+def test_parser_caches_converters_and_counts_failures():
+    parser = NumericStateParser()
+    watts = {"unit_of_measurement": "W", "device_class": "power"}
+
+    assert parser.parse(State("sensor.solar", "1200", watts), "kW") == pytest.approx(1.2)
+    assert parser.parse(State("sensor.solar", "unavailable", watts), "kW") is None
+    assert parser.parse(State("sensor.solar", "n/a", watts), "kW") is None
+    # A unit change recompiles the converter
+    assert parser.parse(State("sensor.solar", "3", {"unit_of_measurement": "kW"}), "kW") == 3.0
+    assert parser.parse(State("sensor.energy", "5", {"unit_of_measurement": "kWh"}), "kW") is None
+
+    stats = parser.diagnostics
+    assert stats["sensor.solar"] == {
+        "unit": "kW", "parsed": 2, "unavailable": 1, "invalid": 1, "incompatible_unit": 0,
+    }
+    assert stats["sensor.energy"]["incompatible_unit"] == 1
+
+
+def test_collector_normalizes_kilowatt_sensors(hass: HomeAssistant):
+    hass.states.async_set("sensor.solar", "1.5", {"unit_of_measurement": "kW"})
+    hass.states.async_set("sensor.soc", "unknown", {"unit_of_measurement": "%"})
+    collector = InputCollector(
+        hass, "sensor.solar", "sensor.soc", "sensor.load", "sensor.wp", "binary_sensor.inv"
+    )
+    signals = collector.get_signals()
+    assert signals.solar_power_w == pytest.approx(1500.0)
+    assert signals.battery_soc_pct == 0.0
@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.vicente_energy.const import (
+    CONF_CONTROL_DEBOUNCE_SECONDS,
+    CONF_CONTROL_MIN_DWELL_SECONDS,
+    CONF_CONTROL_SOLAR_DELTA_W,
+)
+from custom_components.vicente_energy.models import Signals
+from custom_components.vicente_energy.power_controller import PowerController
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+def make_signals(solar_w=0.0, load_w=0.0, soc=50.0):
+    return Signals(
+        solar_power_w=solar_w,
+        battery_soc_pct=soc,
+        house_load_total_w=load_w,
+        wallbox_power_w=0.0,
+        agate_inverter_on=True,
+    )
+
+
+class FakeCollector:
+    def __init__(self, signals):
+        self.signals = signals
+        self.listeners = []
+
+    def get_signals(self):
+        return self.signals
+
+    def mark_clean(self):
+        pass
+
+    def async_add_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+
+@pytest.fixture
+def charger():
+    charger = MagicMock()
+    charger.set_charging_power_kw = AsyncMock()
+    charger.write_diagnostics = {"charger_writes_issued": 0}
+    charger.energy_diagnostics = {"charger_energy_kwh": 0.0}
+    return charger
+
+
+@pytest.fixture
+def controller(hass: HomeAssistant, charger):
+    collector = FakeCollector(make_signals(solar_w=5000, load_w=1000))
+    estimator = MagicMock()
+    estimator.get_power_level = MagicMock(return_value=4.0)
+    manager = MagicMock()
+    manager.get_service = MagicMock(return_value=charger)
+    params = {
+        CONF_CONTROL_SOLAR_DELTA_W: 500,
+        CONF_CONTROL_DEBOUNCE_SECONDS: 60,
+        CONF_CONTROL_MIN_DWELL_SECONDS: 60,
+    }
+    ctl = PowerController(hass, collector, estimator, manager, params)
+    ctl.async_start()
+    yield ctl
+    ctl.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_run_writes_setpoint_and_records_latency(controller, charger):
+    controller._handle_signals(make_signals(solar_w=5000, load_w=1000))
+    data = await controller.async_run()
+    charger.set_charging_power_kw.assert_awaited_once_with(4.0)
+    assert data["power_level_kw"] == 4.0
+    assert data["setpoints_queued"] == 1
+    assert data["charger_writes_issued"] == 0
+    assert data["charger_energy_kwh"] == 0.0
+    assert data["reaction_latency_s"] is not None
+
+
+@pytest.mark.asyncio
+async def test_small_changes_do_not_schedule(controller):
+    await controller.async_run()
+    controller._handle_signals(make_signals(solar_w=5100, load_w=1000))
+    assert controller._cancel_timer is None
+
+    controller._handle_signals(make_signals(solar_w=6000, load_w=1000))
+    assert controller._cancel_timer is not None
@@ -0,0 +1,128 @@
+from collections import Counter
+import copy
+from unittest.mock import AsyncMock
+
+from aiohttp import ClientSession, CookieJar, web
+from aiohttp.test_utils import TestServer
+from custom_components.vicente_energy.services.powerwall_client import async_setup_powerwall_client
+from custom_components.vicente_energy.services.tesla import (
+    PowerwallLocalBatteryService,
+    PowerwallLocalGridService,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+AGGREGATES = {
+    "site": {"instant_power": 1200.0, "energy_imported": 5000.0, "energy_exported": 100.0},
+    "battery": {"instant_power": -3000.0, "energy_imported": 8000.0, "energy_exported": 2000.0},
+    "solar": {"instant_power": 4500.0, "energy_imported": 0.0, "energy_exported": 9000.0},
+    "load": {"instant_power": 2700.0, "energy_imported": 7000.0, "energy_exported": 0.0},
+}
+
+
+@pytest.fixture
+async def gateway():
+    """Stub gateway that requires the login cookie and counts requests."""
+    requests = Counter()
+    tokens = set()
+    readings = copy.deepcopy(AGGREGATES)
+
+    async def login(request):
+        requests["login"] += 1
+        body = await request.json()
+        if body["password"] != "secret":
+            return web.Response(status=401)
+        tokens.add("token")
+        response = web.json_response({"token": "token"})
+        response.set_cookie("AuthCookie", "token")
+        return response
+
+    def authorized(handler, name):
+        async def wrapped(request):
+            requests[name] += 1
+            if request.cookies.get("AuthCookie") not in tokens:
+                return web.Response(status=401)
+            return await handler(request)
+        return wrapped
+
+    async def aggregates(request):
+        return web.json_response(readings)
+
+    async def soe(request):
+        return web.json_response({"percentage": 64.5})
+
+    app = web.Application()
+    app.router.add_post("/api/login/Basic", login)
+    app.router.add_get("/api/meters/aggregates", authorized(aggregates, "aggregates"))
+    app.router.add_get("/api/system_status/soe", authorized(soe, "soe"))
+    server = TestServer(app)
+    await server.start_server()
+    session = ClientSession(cookie_jar=CookieJar(unsafe=True))
+    yield f"http://{server.host}:{server.port}", session, requests, tokens, readings
+    await session.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_one_poll_feeds_battery_and_grid_roles(hass: HomeAssistant, gateway):
+    url, session, requests, tokens, readings = gateway
+    client = async_setup_powerwall_client(hass, url, "secret", 60, session=session)
+    battery = PowerwallLocalBatteryService(hass)
+    grid = PowerwallLocalGridService(hass)
+
+    await battery.connect()
+    await grid.connect()
+
+    # The grid role reused the battery role's poll
+    assert requests == {"login": 1, "aggregates": 1, "soe": 1}
+    assert await battery.get_battery_soc() == 64.5
+    assert await battery.get_storage_power_kw() == -3.0
+    assert await grid.get_now_home_load_kw() == 2.7
+
+    readings["site"]["energy_imported"] += 1500.0
+    tokens.clear()  # Session expired on the gateway
+    await client.async_refresh()
+
+    assert requests["login"] == 2
+    assert await grid.get_today_import_kwh() == pytest.approx(1.5)
+    assert client.diagnostics["powerwall_polls"] == 2
+
+    await battery.disconnect()
+    await grid.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_today_energy_survives_restart(hass: HomeAssistant, gateway):
+    url, session, requests, tokens, readings = gateway
+    client = async_setup_powerwall_client(hass, url, "secret", 60, session=session)
+    # Baseline stored before the restart, 2 kWh into the day
+    client._daily._store.async_load = AsyncMock(return_value={
+        "day": dt_util.now().date().isoformat(),
+        "start": {"site_in": 3000.0, "solar_out": 7000.0},
+    })
+
+    snapshot = await client.async_refresh()
+
+    assert snapshot.grid_import_kwh == pytest.approx(2.0)
+    assert snapshot.solar_kwh == pytest.approx(2.0)
+    # Counters missing from the stored baseline start from this reading
+    assert snapshot.battery_charge_kwh == 0.0
+
+
+@pytest.mark.asyncio
+async def test_unexpected_firmware_response_is_a_failed_poll(hass: HomeAssistant, gateway):
+    url, session, requests, tokens, readings = gateway
+    client = async_setup_powerwall_client(hass, url, "secret", 60, session=session)
+    del readings["battery"]["energy_exported"]
+
+    with pytest.raises(ValueError):
+        await client.async_refresh()
+    readings["battery"]["energy_exported"] = 2000.0
+    readings["solar"] = None
+    # A scheduled poll logs the failure instead of raising
+    await client._async_scheduled_poll()
+
+    assert client.diagnostics["powerwall_poll_failures"] == 2
+    assert client.snapshot is None
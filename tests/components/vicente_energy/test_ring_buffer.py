@@ -0,0 +1,38 @@
+from custom_components.vicente_energy.ring_buffer import RingBuffer
+import pytest
+
+
+def test_append_wraps_and_keeps_newest():
+    buffer = RingBuffer(3)
+    for i in range(5):
+        buffer.append(float(i), timestamp=1000 + i)
+    assert len(buffer) == 3
+    assert buffer.values().tolist() == [2.0, 3.0, 4.0]
+    assert buffer.timestamps().tolist() == [1002, 1003, 1004]
+
+
+def test_round_trip_serialization():
+    buffer = RingBuffer(4)
+    buffer.extend([0.5, -1.25, 3.0], timestamp=1700000000)
+    restored = RingBuffer.from_dict(buffer.to_dict())
+    assert restored == buffer
+    assert restored.capacity == 4
+    assert restored.timestamps().tolist() == [1700000000] * 3
+
+
+def test_from_stored_migrates_legacy_list():
+    buffer = RingBuffer.from_stored([1.0, 2.0, 3.0, 4.0], capacity=2)
+    assert buffer == [3.0, 4.0]
+    assert all(ts > 0 for ts in buffer.timestamps())
+
+
+def test_from_stored_resizes_encoded_buffer():
+    buffer = RingBuffer(5)
+    buffer.extend([1.0, 2.0, 3.0])
+    smaller = RingBuffer.from_stored(buffer.to_dict(), capacity=2)
+    assert smaller == [2.0, 3.0]
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
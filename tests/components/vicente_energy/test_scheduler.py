@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from custom_components.vicente_energy.models import Forecasts, Signals
+from custom_components.vicente_energy.scheduler import Scheduler
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+@pytest.mark.asyncio
+async def test_jobs_share_one_snapshot_per_tick(hass: HomeAssistant):
+    reads = []
+
+    def get_signals():
+        reads.append(1)
+        return Signals(1000.0, 50.0, 800.0, 0.0, True)
+
+    seen = []
+    power = {"kw": 1.0}
+
+    async def refresh_forecasts(snapshot):
+        seen.append(("forecast", snapshot))
+        return Forecasts([1.0] * 24, [0.5] * 24)
+
+    async def budget(snapshot):
+        seen.append(("budget", snapshot))
+        return {"budget_24h_kwh": sum(snapshot.forecasts.solar_24h_kwh)}
+
+    async def control(snapshot):
+        seen.append(("control", snapshot))
+        return {"power_level_kw": power["kw"]}
+
+    scheduler = Scheduler(hass, "test", get_signals)
+    scheduler.add_job("forecast_refresh", timedelta(hours=1), refresh_forecasts,
+                      provides="forecasts")
+    budget_coordinator = scheduler.add_job("budget", timedelta(hours=1), budget)
+    control_coordinator = scheduler.add_job("power_control", timedelta(minutes=1), control)
+    notified = []
+    control_coordinator.async_add_listener(lambda: notified.append("control"))
+
+    midnight = dt_util.start_of_local_day()
+    assert await scheduler.async_run_due(midnight + timedelta(hours=10)) == []
+    # One signal read; the budget saw the forecasts refreshed on the same tick
+    assert len(reads) == 1
+    assert [name for name, _ in seen] == ["forecast", "budget", "control"]
+    assert seen[0][1].signals is seen[2][1].signals
+    assert seen[1][1].forecasts is not None
+    assert budget_coordinator.data == {"budget_24h_kwh": 24.0}
+
+    seen.clear()
+    await scheduler.async_run_due(midnight + timedelta(hours=10, minutes=1))
+    assert [name for name, _ in seen] == ["control"]
+    # Forecasts carry over to ticks that do not refresh them
+    assert seen[0][1].forecasts is not None
+    assert notified == ["control"]  # Unchanged output notifies nobody
+
+    power["kw"] = 2.0
+    await scheduler.async_run_due(midnight + timedelta(hours=10, minutes=2))
+    assert notified == ["control", "control"]
+    assert control_coordinator.data == {"power_level_kw": 2.0}
+
+    stats = scheduler.diagnostics
+    assert stats["power_control"]["runs"] == 3
+    assert stats["power_control"]["changes"] == 2
+    assert stats["budget"]["runs"] == 1
+    assert stats["forecast_refresh"]["interval_s"] == 3600
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_do_not_notify(hass: HomeAssistant):
+    runs = {"count": 0}
+
+    async def budget(snapshot):
+        runs["count"] += 1
+        return {"budget_24h_kwh": 10.0, "solve_ms": runs["count"]}
+
+    scheduler = Scheduler(hass, "test", lambda: Signals(0.0, 50.0, 0.0, 0.0, False))
+    coordinator = scheduler.add_job("budget", timedelta(hours=1), budget,
+                                    compare_keys=("budget_24h_kwh",))
+    notified = []
+    coordinator.async_add_listener(lambda: notified.append(coordinator.data))
+
+    midnight = dt_util.start_of_local_day()
+    await scheduler.async_run_due(midnight + timedelta(hours=1))
+    await scheduler.async_run_due(midnight + timedelta(hours=2))
+
+    assert len(notified) == 1
+    # The latest diagnostics are still available to the next state write
+    assert coordinator.data == {"budget_24h_kwh": 10.0, "solve_ms": 2}
+    assert scheduler.diagnostics["budget"]["changes"] == 1
@@ -1,15 +1,23 @@
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
 from custom_components.vicente_energy.sensor import (
     AvailableAfterSensor,
     Budget24hSensor,
     ChargeStateSensor,
+    Deadband,
+    PowerLevelSensor,
     SessionDurationSensor,
     SessionEnergyUsedSensor,
     SessionStartTimeSensor,
 )
+from custom_components.vicente_energy.services.ev_charger_service import EVChargerState
+from custom_components.vicente_energy.session_manager import SessionManager
+from custom_components.vicente_energy.state_manager import StateManager
 import pytest
 
+from homeassistant.core import HomeAssistant
+
 
 class FakeCoordinator:
     def __init__(self, name, data):
@@ -17,6 +25,43 @@ class FakeCoordinator:
         self.data = data
 
 
+class FakeCharger:
+    def __init__(self):
+        self.charger_state = EVChargerState.CHARGER_DISCONNECTED
+        self.integrated_energy_kwh = 0.0
+        self.callbacks = []
+
+    def register_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def report(self, state=None, energy_kwh=None):
+        if state is not None:
+            self.charger_state = state
+        if energy_kwh is not None:
+            self.integrated_energy_kwh = energy_kwh
+        for callback in self.callbacks:
+            callback("sensor.charger", None, None)
+
+
+class FakeServiceManager:
+    def __init__(self, charger):
+        self.charger = charger
+
+    def get_service(self, service_type):
+        return self.charger
+
+
+class FakeStateManager:
+    def __init__(self):
+        self.last_session_kwh = None
+
+    def learn_session_bias(self, actual_kwh, estimated_kwh):
+        pass
+
+    def save_last_session_kwh(self, kwh):
+        self.last_session_kwh = kwh
+
+
 class FakeSessionManager:
     def __init__(self):
         self.session_start_time = None
@@ -51,3 +96,142 @@ def test_session_time_states():
     assert s4.state == pytest.approx(4.321, rel=1e-3)
     s5 = ChargeStateSensor(sm)
     assert s5.state == "plugged_no_session"
+
+
+def test_power_level_writes_only_past_deadband():
+    coord = FakeCoordinator("test", {"power_level_kw": 3.0})
+    sensor = PowerLevelSensor(coord)
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.state)
+
+    for value in (3.0, 3.02, 3.05, 3.2, 3.2):
+        coord.data = {"power_level_kw": value}
+        sensor._handle_coordinator_update()
+
+    # The band is max(0.05 kW, 2 % of the last written value)
+    assert written == [3.0, 3.2]
+    assert sensor.deadband_stats == {"writes": 2, "writes_avoided": 3}
+
+
+def test_max_silence_forces_a_write():
+    coord = FakeCoordinator("test", {"budget_24h_kwh": 10.0})
+    sensor = Budget24hSensor(coord)
+    sensor.deadband = Deadband(absolute=1.0, max_silence=timedelta(0))
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.state)
+
+    sensor.async_write_if_changed()
+    sensor.async_write_if_changed()
+    assert written == [10.0, 10.0]
+
+
+def test_non_numeric_states_write_on_change():
+    sm = FakeSessionManager()
+    sm.charge_state = "unplugged"
+    sensor = ChargeStateSensor(sm)
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.state)
+
+    for state in ("unplugged", "unplugged", "active_session"):
+        sm.charge_state = state
+        sensor.async_write_if_changed()
+    assert written == ["unplugged", "active_session"]
+    assert Deadband.from_config({"absolute": 0.5}).crossed(1.0, 1.6)
+
+
+@pytest.mark.asyncio
+async def test_session_sensors_push_on_signal(hass: HomeAssistant):
+    session = SessionManager(hass, None, "entry1")
+    charge_state = ChargeStateSensor(session)
+    energy = SessionEnergyUsedSensor(session)
+    written = []
+    for sensor in (charge_state, energy):
+        sensor.hass = hass
+        sensor.async_write_ha_state = lambda sensor=sensor: written.append(sensor.state)
+        await sensor.async_added_to_hass()
+
+    session.update_charge_state("charging")
+    await hass.async_block_till_done()
+    # Only the sensor whose field is in the delta is written
+    assert written == ["active_session"]
+
+    session.update_charge_state("charging")
+    await hass.async_block_till_done()
+    assert written == ["active_session"]  # No change, no signal
+
+
+@pytest.mark.asyncio
+async def test_session_follows_charger_state_and_energy(hass: HomeAssistant):
+    charger = FakeCharger()
+    state = FakeStateManager()
+    session = SessionManager(hass, state, "entry1", FakeServiceManager(charger))
+
+    charger.report(EVChargerState.CHARGER_CHARGING, 10.0)
+    assert session.charge_state == "active_session"
+    charger.report(energy_kwh=11.5)
+    assert session.session_kwh_used == pytest.approx(1.5)
+
+    # Idling at a 0 A setpoint keeps the session open
+    charger.report(EVChargerState.CHARGER_WAITING)
+    assert session.charge_state == "active_session"
+
+    # A replaced charger service restarts its meter; the session carries on
+    charger.report(energy_kwh=0.0)
+    charger.report(energy_kwh=0.5)
+    assert session.session_kwh_used == pytest.approx(2.0)
+
+    charger.report(EVChargerState.CHARGER_FINISHED)
+    assert session.charge_state == "plugged_post_session"
+    assert state.last_session_kwh == pytest.approx(2.0)
+
+
+
+@pytest.mark.asyncio
+async def test_unplugging_learns_from_the_session(hass: HomeAssistant):
+    charger = FakeCharger()
+    state = StateManager(hass, "entry1")
+    state._store.async_delay_save = MagicMock()
+    session = SessionManager(hass, state, "entry1", FakeServiceManager(charger))
+
+    charger.report(EVChargerState.CHARGER_CHARGING, 10.0)
+    charger.report(energy_kwh=14.0)
+    charger.report(EVChargerState.CHARGER_DISCONNECTED)
+    await hass.async_block_till_done()
+
+    assert state.data["last_session_kwh"] == pytest.approx(4.0)
+    assert state.data["last_raw_session_kwh"] == pytest.approx(4.0)
+    assert state.data["session_bias"] != 0.0
+    assert state.is_dirty
+
+def test_budget_writes_on_schedule_change_not_diagnostics():
+    coord = FakeCoordinator("test", {"budget_24h_kwh": 10.0, "charge_schedule_kw": [1.0, 0.0]})
+    sensor = Budget24hSensor(coord)
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(coord.data)
+
+    sensor.async_write_if_changed()
+    coord.data = {**coord.data, "optimizer_solve_ms": 12.0}
+    sensor.async_write_if_changed()
+    coord.data = {**coord.data, "charge_schedule_kw": [0.0, 1.0]}
+    sensor.async_write_if_changed()
+
+    assert [data["charge_schedule_kw"] for data in written] == [[1.0, 0.0], [0.0, 1.0]]
+
+
+def test_max_silence_timer_rewrites_state(hass: HomeAssistant, monkeypatch):
+    timers = []
+    monkeypatch.setattr("custom_components.vicente_energy.sensor.async_call_later",
+                        lambda hass, delay, action: timers.append((delay, action)) or (lambda: None))
+    coord = FakeCoordinator("test", {"budget_24h_kwh": 10.0})
+    sensor = Budget24hSensor(coord)
+    sensor.hass = hass
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.state)
+
+    sensor.async_write_if_changed()
+    assert timers[-1][0] == sensor.deadband.max_silence
+
+    # Nothing changed, but the silence elapsed
+    timers[-1][1](None)
+    assert written == [10.0, 10.0]
+    assert len(timers) == 2
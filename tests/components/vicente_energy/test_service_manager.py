@@ -0,0 +1,91 @@
+import asyncio
+
+from custom_components.vicente_energy.services import ServiceType
+from custom_components.vicente_energy.services.service_manager import ServiceManager
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+class FlakyService:
+    """Fails its first connects, then succeeds."""
+
+    def __init__(self, failures: int, hang: bool = False):
+        self.failures = failures
+        self.hang = hang
+        self.connects = 0
+        self.disconnects = 0
+
+    async def connect(self):
+        self.connects += 1
+        if self.connects <= self.failures:
+            if self.hang:
+                await asyncio.sleep(10)
+            raise RuntimeError("entities not loaded yet")
+
+    async def disconnect(self):
+        self.disconnects += 1
+
+
+@pytest.mark.asyncio
+async def test_failed_connects_are_retried_until_ready(hass: HomeAssistant):
+    sm = ServiceManager(hass, {}, connect_timeout=0.05, retry_base=0.01, retry_max=0.02)
+    charger = FlakyService(failures=2)
+    battery = FlakyService(failures=1, hang=True)
+    sm._services = {ServiceType.EV_CHARGER_SERVICE: charger, ServiceType.BATTERY_SERVICE: battery}
+
+    sm.async_start()
+    assert await sm.async_wait_ready(ServiceType.EV_CHARGER_SERVICE, timeout=1)
+    assert await sm.async_wait_ready(timeout=1)
+    assert sm.is_ready()
+
+    stats = sm.diagnostics
+    assert stats[ServiceType.EV_CHARGER_SERVICE]["attempts"] == 3
+    assert stats[ServiceType.EV_CHARGER_SERVICE]["retries"] == 2
+    assert stats[ServiceType.BATTERY_SERVICE]["last_error"] == "timed out"
+    assert stats[ServiceType.BATTERY_SERVICE]["state"] == "connected"
+    assert stats[ServiceType.BATTERY_SERVICE]["connect_ms"] is not None
+
+    await sm.async_stop()
+    assert charger.disconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_ready_times_out_while_retrying(hass: HomeAssistant):
+    sm = ServiceManager(hass, {}, connect_timeout=0.05, retry_base=5, retry_max=5)
+    sm._services = {ServiceType.GRID_SERVICE: FlakyService(failures=1)}
+
+    sm.async_start()
+    assert not await sm.async_wait_ready(timeout=0.05)
+    assert sm.diagnostics[ServiceType.GRID_SERVICE]["state"] == "retrying"
+    await sm.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_update_services_replaces_only_changed_bindings(hass: HomeAssistant):
+    sm = ServiceManager(hass, {
+        ServiceType.EV_CHARGER_SERVICE: "default",
+        ServiceType.BATTERY_SERVICE: "default",
+    })
+    await sm.connect_services()
+    battery = sm.get_service(ServiceType.BATTERY_SERVICE)
+    charger = sm.get_service(ServiceType.EV_CHARGER_SERVICE)
+    calls = []
+    sm.register_service_callback(ServiceType.EV_CHARGER_SERVICE, lambda *args: calls.append(args))
+
+    replaced = await sm.async_update_services({
+        ServiceType.EV_CHARGER_SERVICE: "chargepoint",
+        ServiceType.BATTERY_SERVICE: "default",
+    })
+
+    assert replaced == [ServiceType.EV_CHARGER_SERVICE]
+    assert sm.get_service(ServiceType.BATTERY_SERVICE) is battery
+    new_charger = sm.get_service(ServiceType.EV_CHARGER_SERVICE)
+    assert new_charger is not charger
+    assert new_charger._callbacks == charger._callbacks
+    assert await sm.async_wait_ready(ServiceType.EV_CHARGER_SERVICE, timeout=1)
+
+    with pytest.raises(ValueError):
+        await sm.async_update_services({ServiceType.EV_CHARGER_SERVICE: "nope"})
+    assert sm.get_service(ServiceType.EV_CHARGER_SERVICE) is new_charger
+    await sm.async_stop()
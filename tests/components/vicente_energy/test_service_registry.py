@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from custom_components.vicente_energy.services import (
+    SERVICE_CLASS_MAP,
+    SERVICE_CLASS_PATHS,
+    ServiceType,
+    async_import_service_classes,
+)
+from custom_components.vicente_energy.services.franklin import FranklinApiSolarService
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+ROOT = Path(__file__).resolve().parents[3]
+PACKAGE = "custom_components.vicente_energy.services"
+VENDORS = ("chargepoint", "default", "forecast_solar", "franklin", "solaredge", "solcast",
+           "tesla", "wallbox")
+
+# Cold import in a fresh interpreter, then one lookup; reports what was loaded
+COLD_IMPORT = f"""
+import json, sys
+import {PACKAGE} as services
+before = sorted(m for m in {VENDORS!r} if "{PACKAGE}." + m in sys.modules)
+services.SERVICE_CLASS_MAP[services.ServiceType.SOLAR_SERVICE]["franklin_api"]
+after = sorted(m for m in {VENDORS!r} if "{PACKAGE}." + m in sys.modules)
+print(json.dumps({{"before": before, "after": after}}))
+"""
+
+# What the integration cannot avoid importing at load time: Home Assistant's
+# entry, coordinator, event and storage helpers, and numpy
+BASELINE_MODULES = ("homeassistant.config_entries", "homeassistant.helpers.update_coordinator",
+                    "homeassistant.helpers.event", "homeassistant.helpers.storage",
+                    "homeassistant.util.dt", "numpy")
+LOADED_MODULES = """
+import json, sys
+{imports}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _loaded_modules(*modules: str) -> set[str]:
+    """Return every module loaded by a cold import of modules."""
+    script = LOADED_MODULES.format(imports="\n".join(f"import {module}" for module in modules))
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+def test_cold_import_loads_only_the_looked_up_vendor():
+    result = subprocess.run([sys.executable, "-c", COLD_IMPORT], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout)
+
+    assert report["before"] == []
+    assert report["after"] == ["franklin"]
+
+
+def test_cold_import_loads_nothing_beyond_its_dependencies():
+    added = (_loaded_modules("custom_components.vicente_energy")
+             - _loaded_modules(*BASELINE_MODULES))
+    # Device clients, and aiohttp with them, load only once a device is configured
+    assert not {m for m in added if m.split(".")[0] == "aiohttp"}
+    assert not {m for m in added
+                if m.startswith("custom_components.") and m.endswith(("_client", "_modbus"))}
+
+
+def test_lazy_map_resolves_every_registered_class():
+    solar = SERVICE_CLASS_MAP[ServiceType.SOLAR_SERVICE]
+    assert solar["franklin_api"] is FranklinApiSolarService
+    assert list(solar) == list(SERVICE_CLASS_PATHS[ServiceType.SOLAR_SERVICE])
+    assert solar.get("unknown") is None
+    for service_type, classes in SERVICE_CLASS_MAP.items():
+        for name, service_class in classes.items():
+            assert service_class.__name__ == SERVICE_CLASS_PATHS[service_type][name].split(":")[1]
+
+
+@pytest.mark.asyncio
+async def test_selected_services_import_before_setup(hass: HomeAssistant):
+    await async_import_service_classes(
+        hass, {ServiceType.EV_CHARGER_SERVICE: "wallbox", ServiceType.GRID_SERVICE: "nope"})
+    assert "wallbox" in SERVICE_CLASS_MAP[ServiceType.EV_CHARGER_SERVICE]._classes
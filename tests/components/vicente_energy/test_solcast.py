@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from custom_components.vicente_energy.services.solcast import (
+    P10,
+    P50,
+    P90,
+    SolcastService,
+    parse_detailed_forecast,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def _periods(start: datetime, count: int, kw: float = 2.0):
+    return [
+        {"period_start": start + timedelta(minutes=30 * i), "pv_estimate": kw}
+        for i in range(count)
+    ]
+
+
+def test_half_hours_are_converted_to_kwh_by_local_hour():
+    tz = dt_util.get_time_zone("Europe/Berlin")
+    start = datetime(2025, 6, 2, 0, tzinfo=tz)
+    entries = _periods(start, 48)
+    entries[0]["period_start"] = entries[0]["period_start"].isoformat()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(dt_util, "DEFAULT_TIME_ZONE", tz)
+        days = parse_detailed_forecast(entries)
+
+    assert list(days) == [start.date()]
+    # Two half-hours at 2 kW make 2 kWh, not 4
+    assert days[start.date()][P50].tolist() == pytest.approx([2.0] * 24)
+    # Without pv_estimate10/90 the quantile rows fall back to the estimate
+    assert days[start.date()][P10].tolist() == pytest.approx([2.0] * 24)
+
+
+def test_dst_days_stay_aligned_to_local_hours():
+    tz = dt_util.get_time_zone("Europe/Berlin")
+    utc = dt_util.UTC
+    # 2025-10-26 has 25 local hours in Berlin (02:00 occurs twice)
+    fall_back = _periods(datetime(2025, 10, 25, 22, tzinfo=utc), 50)
+    # 2025-03-30 has 23 local hours (02:00 is skipped)
+    spring_forward = _periods(datetime(2025, 3, 29, 23, tzinfo=utc), 46)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(dt_util, "DEFAULT_TIME_ZONE", tz)
+        autumn = parse_detailed_forecast(fall_back)[datetime(2025, 10, 26).date()][P50]
+        spring = parse_detailed_forecast(spring_forward)[datetime(2025, 3, 30).date()][P50]
+
+    assert autumn[2] == pytest.approx(4.0)
+    assert autumn.sum() == pytest.approx(50.0)
+    assert spring[2] == 0.0
+    assert spring[3] == pytest.approx(2.0)
+    assert spring.sum() == pytest.approx(46.0)
+
+
+@pytest.mark.asyncio
+async def test_multi_day_array_is_shared(hass: HomeAssistant):
+    midnight = dt_util.start_of_local_day()
+    for offset, entity_id in enumerate((
+        "sensor.solcast_pv_forecast_forecast_today",
+        "sensor.solcast_pv_forecast_forecast_tomorrow",
+        "sensor.solcast_pv_forecast_forecast_day_3",
+    )):
+        day = midnight + timedelta(days=offset)
+        hass.states.async_set(entity_id, "10", {
+            "detailedForecast": _periods(day, 48, kw=float(offset + 1)),
+        })
+
+    service = SolcastService(hass)
+    await service.connect()
+
+    forecast = await service.get_hourly_forecast_array()
+    assert forecast.size == 72
+    assert forecast[0] == pytest.approx(1.0)
+    assert forecast[24] == pytest.approx(2.0)
+    assert forecast[48] == pytest.approx(3.0)
+    assert not forecast.flags.writeable
+    assert await service.get_hourly_forecast_array() is forecast
+    assert await service.get_tomorrow_production_kwh() == pytest.approx(48.0)
+    await service.disconnect()
+
+
+def test_quantile_estimates_are_parsed():
+    start = dt_util.start_of_local_day()
+    entries = [{
+        "period_start": start,
+        "pv_estimate": 2.0,
+        "pv_estimate10": 1.0,
+        "pv_estimate90": 4.0,
+    }]
+    rows = parse_detailed_forecast(entries)[start.date()]
+    assert rows[:, 0].tolist() == pytest.approx([0.5, 1.0, 2.0])
+    assert rows[P90, 1] == 0.0
@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock, MagicMock
+
 from custom_components.vicente_energy.state_manager import StateManager
 import pytest
 
@@ -54,3 +56,90 @@ async def test_reset_history(state_manager):
     }
     assert state_manager.data["session_bias_history"] == []
     assert state_manager.data["last_raw_session_kwh"] is None
+
+
+@pytest.mark.asyncio
+async def test_load_migrates_legacy_history_lists(hass: HomeAssistant):
+    sm = StateManager(hass, entry_id="legacy", history_capacity=2)
+    sm._store.async_load = AsyncMock(return_value={
+        "session_bias": 0.3,
+        "forecast_error_history": {"solar_errors": [0.1, 0.2, 0.3], "load_errors": []},
+        "session_bias_history": [5.0],
+    })
+    await sm.async_load()
+
+    history = sm.data["forecast_error_history"]
+    assert list(history["solar_errors"]) == pytest.approx([0.2, 0.3])
+    assert history["load_errors"] == []
+    assert sm.data["session_bias_history"] == [5.0]
+
+    stored = sm._as_storable()
+    assert isinstance(stored["session_bias_history"]["values"], str)
+
+
+@pytest.mark.asyncio
+async def test_saves_are_coalesced_until_flush(hass: HomeAssistant):
+    sm = StateManager(hass, entry_id="coalesce", save_delay=30)
+    sm._store.async_delay_save = MagicMock()
+    sm._store.async_save = AsyncMock()
+
+    await sm.set_session_bias(0.4)
+    sm.save_last_session_kwh(12.0)
+    sm.update_solar_bias(0.1)
+
+    assert sm.is_dirty
+    assert sm._store.async_delay_save.call_count == 3
+    sm._store.async_save.assert_not_called()
+
+    await sm.async_flush()
+    sm._store.async_save.assert_awaited_once()
+    assert sm._store.async_save.await_args.args[0]["session_bias"] == 0.4
+    assert not sm.is_dirty
+
+    await sm.async_flush()
+    sm._store.async_save.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delta_log_writes_changed_keys_only(hass: HomeAssistant):
+    sm = StateManager(hass, entry_id="delta", delta_log=True)
+    sm._delta_store.async_delay_save = MagicMock()
+
+    await sm.set_session_bias(0.7)
+    data_func = sm._delta_store.async_delay_save.call_args.args[0]
+    delta = data_func()
+    assert delta == {"session_bias": 0.7, "_base_seq": 0}
+
+    restored = StateManager(hass, entry_id="delta", delta_log=True)
+    restored._store.async_load = AsyncMock(return_value={"session_bias": 0.1, "_seq": 0})
+    restored._delta_store.async_load = AsyncMock(return_value=dict(delta))
+    await restored.async_load()
+    assert restored.get_session_bias() == 0.7
+
+    stale = StateManager(hass, entry_id="delta", delta_log=True)
+    stale._store.async_load = AsyncMock(return_value={"session_bias": 0.1, "_seq": 1})
+    stale._delta_store.async_load = AsyncMock(return_value=dict(delta))
+    await stale.async_load()
+    assert stale.get_session_bias() == 0.1
+
+
+@pytest.mark.asyncio
+async def test_persist_writes_pending_keys_as_delta(hass: HomeAssistant):
+    sm = StateManager(hass, entry_id="persist", delta_log=True)
+    sm._store.async_save = AsyncMock()
+    sm._delta_store.async_delay_save = MagicMock()
+    sm._delta_store.async_save = AsyncMock()
+
+    await sm.async_persist()
+    sm._delta_store.async_save.assert_not_called()
+
+    await sm.set_session_bias(0.7)
+    await sm.async_persist()
+    sm._delta_store.async_save.assert_awaited_once_with({"session_bias": 0.7, "_base_seq": 0})
+    sm._store.async_save.assert_not_called()
+
+    # Nothing new since the delta; unload still compacts into the main document
+    await sm.async_persist()
+    sm._delta_store.async_save.assert_awaited_once()
+    await sm.async_flush()
+    sm._store.async_save.assert_awaited_once()
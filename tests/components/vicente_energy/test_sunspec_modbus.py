@@ -0,0 +1,138 @@
+import asyncio
+import struct
+from unittest.mock import AsyncMock
+
+from custom_components.vicente_energy.services.solaredge import SolarEdgeModbusSolarService
+from custom_components.vicente_energy.services.sunspec_modbus import (
+    INVERTER_BLOCK_START,
+    ModbusError,
+    SunSpecModbusClient,
+    async_setup_sunspec_client,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+class ModbusSimulator:
+    """Minimal Modbus TCP server answering read holding registers."""
+
+    def __init__(self):
+        self.registers: dict[int, int] = {}
+        self.requests: list[tuple[int, int]] = []
+        self.drop_next = False
+        self.server = None
+
+    def set_inverter(self, power_w: int, power_sf: int, energy_wh: int, energy_sf: int,
+                     model: int = 103) -> None:
+        values = {0: model, 1: 50, 14: power_w & 0xFFFF, 15: power_sf & 0xFFFF,
+                  24: energy_wh >> 16, 25: energy_wh & 0xFFFF, 26: energy_sf & 0xFFFF, 38: 4}
+        for offset, value in values.items():
+            self.registers[INVERTER_BLOCK_START + offset] = value
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                transaction_id, _, _, unit = struct.unpack(">HHHB", await reader.readexactly(7))
+                function, address, count = struct.unpack(">BHH", await reader.readexactly(5))
+                self.requests.append((address, count))
+                if self.drop_next:
+                    # Hang up after half a response header
+                    self.drop_next = False
+                    writer.write(struct.pack(">HH", transaction_id, 0))
+                    await writer.drain()
+                    writer.close()
+                    return
+                data = b"".join(struct.pack(">H", self.registers.get(address + i, 0))
+                                for i in range(count))
+                pdu = struct.pack(">BB", function, len(data)) + data
+                writer.write(struct.pack(">HHHB", transaction_id, 0, len(pdu) + 1, unit) + pdu)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+
+@pytest.fixture
+async def simulator():
+    sim = ModbusSimulator()
+    port = await sim.start()
+    yield sim, port
+    sim.server.close()
+    await sim.server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_inverter_block_is_read_in_one_request(hass: HomeAssistant, simulator):
+    sim, port = simulator
+    sim.set_inverter(power_w=31415, power_sf=-1, energy_wh=1_234_567, energy_sf=0)
+    client = SunSpecModbusClient(hass, "127.0.0.1", port)
+
+    first = await client.async_refresh()
+    assert first.ac_power_kw == pytest.approx(3.1415)
+    assert first.lifetime_kwh == pytest.approx(1234.567)
+    assert first.today_kwh == 0.0
+
+    sim.set_inverter(power_w=-5, power_sf=2, energy_wh=1_236_067, energy_sf=0)
+    second = await client.async_refresh()
+    assert second.ac_power_kw == pytest.approx(-0.5)
+    assert second.today_kwh == pytest.approx(1.5)
+    # One block request per poll over the same connection
+    assert sim.requests == [(INVERTER_BLOCK_START, 40)] * 2
+
+    sim.set_inverter(power_w=0, power_sf=0, energy_wh=0, energy_sf=0, model=1)
+    with pytest.raises(ModbusError):
+        await client.async_refresh()
+    assert client.diagnostics["sunspec_poll_failures"] == 1
+    client.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_service_tracks_inverter_readings(hass: HomeAssistant, simulator):
+    sim, port = simulator
+    sim.set_inverter(power_w=4200, power_sf=0, energy_wh=10_000, energy_sf=1)
+    async_setup_sunspec_client(hass, "127.0.0.1", port, poll_interval=1)
+    service = SolarEdgeModbusSolarService(hass)
+
+    await service.connect()
+    assert await service.get_now_production_kw() == pytest.approx(4.2)
+    assert await service.get_today_production_kwh() == 0.0
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_is_reopened(hass: HomeAssistant, simulator):
+    sim, port = simulator
+    sim.set_inverter(power_w=1000, power_sf=0, energy_wh=5_000, energy_sf=0)
+    client = SunSpecModbusClient(hass, "127.0.0.1", port)
+    await client.async_refresh()
+
+    sim.drop_next = True
+    with pytest.raises(asyncio.IncompleteReadError):
+        await client.async_refresh()
+    # A scheduled poll logs the same failure instead of raising
+    sim.drop_next = True
+    await client._async_scheduled_poll()
+
+    reading = await client.async_refresh()
+    assert reading.ac_power_kw == pytest.approx(1.0)
+    assert client.diagnostics["sunspec_poll_failures"] == 2
+    client.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_today_energy_survives_restart(hass: HomeAssistant, simulator):
+    sim, port = simulator
+    sim.set_inverter(power_w=0, power_sf=0, energy_wh=12_500, energy_sf=0)
+    client = SunSpecModbusClient(hass, "127.0.0.1", port)
+    client._daily._store.async_load = AsyncMock(return_value={
+        "day": dt_util.now().date().isoformat(), "start": {"ac_energy": 10_000.0}})
+
+    reading = await client.async_refresh()
+
+    assert reading.today_kwh == pytest.approx(2.5)
+    client.async_stop()